@@ -0,0 +1,86 @@
+"""
+Benchmark of compression codecs used for saving EOPatches
+
+For each available codec and compression level an EOPatch is saved and loaded a few times. The script reports the
+best saving and loading times, the size of the saved EOPatch and the compression ratio compared to uncompressed
+npy files.
+
+Example:
+
+    python benchmarks/codec_benchmark.py --levels 1 6 9 --repeat 5
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+from eolearn.core import EOPatch, FeatureType, FileFormat
+from eolearn.core.compression import get_available_codecs, get_codec
+
+DEFAULT_EOPATCH_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'example_data',
+                                    'TestEOPatch')
+
+
+def get_folder_size(path):
+    """ Returns a total size of all files in a folder in bytes
+    """
+    return sum(os.path.getsize(os.path.join(folder, filename))
+               for folder, _, filenames in os.walk(path) for filename in filenames)
+
+
+def benchmark(eopatch, file_format, codec, compress_level, repeat):
+    """ Saves and loads EOPatch multiple times and returns the best saving and loading times and the size of the saved
+    EOPatch
+    """
+    save_times, load_times = [], []
+    size = 0
+
+    with tempfile.TemporaryDirectory() as tmp_dir_name:
+        path = os.path.join(tmp_dir_name, 'eopatch')
+
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            eopatch.save(path, file_format=file_format, codec=codec, compress_level=compress_level)
+            save_times.append(time.perf_counter() - start_time)
+
+            start_time = time.perf_counter()
+            EOPatch.load(path)
+            load_times.append(time.perf_counter() - start_time)
+
+            size = get_folder_size(path)
+            shutil.rmtree(path)
+
+    return min(save_times), min(load_times), size
+
+
+def main():
+    """ Runs the benchmark and prints the results
+    """
+    parser = argparse.ArgumentParser(description='Benchmark of compression codecs for saving EOPatches')
+    parser.add_argument('--eopatch', default=DEFAULT_EOPATCH_PATH, help='Path to an EOPatch used in the benchmark')
+    parser.add_argument('--codecs', nargs='+', default=get_available_codecs(), help='Names of benchmarked codecs')
+    parser.add_argument('--levels', nargs='+', type=int, default=[1, 6], help='Benchmarked compression levels')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of repetitions of each measurement')
+    args = parser.parse_args()
+
+    eopatch = EOPatch.load(args.eopatch, features=[feature_type for feature_type in FeatureType
+                                                   if not feature_type.is_vector()])
+
+    _, _, uncompressed_size = benchmark(eopatch, FileFormat.NPY, None, 0, 1)
+
+    print('{:<8} {:<8} {:>6} {:>10} {:>10} {:>12} {:>7}'.format(
+        'format', 'codec', 'level', 'save [s]', 'load [s]', 'size [B]', 'ratio'))
+    for codec_name in args.codecs:
+        file_format = FileFormat.NPY if get_codec(codec_name).file_format else FileFormat.CHUNKED
+
+        for compress_level in args.levels:
+            save_time, load_time, size = benchmark(eopatch, file_format, codec_name, compress_level, args.repeat)
+
+            print('{:<8} {:<8} {:>6} {:>10.4f} {:>10.4f} {:>12} {:>7.2f}'.format(
+                file_format.value, codec_name, compress_level, save_time, load_time, size, uncompressed_size / size))
+
+
+if __name__ == '__main__':
+    main()
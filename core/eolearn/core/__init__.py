@@ -4,8 +4,14 @@ The following objects and functions are the core of eo-learn package
 
 from sentinelhub import BBox, CRS
 
-from .constants import FeatureType, FeatureTypeSet, FileFormat, OverwritePermission
-from .eodata import EOPatch
+from .constants import FeatureType, FeatureTypeSet, FileFormat, OverwritePermission, MemoryStorage
+from .eodata import EOPatch, EOPatchDescription, FeatureDescription
+from .array_storage import Quantization, PackedMask
+from .time_index import TimeIndex
+from .dtype_policy import DtypePolicy
+from .blob_store import BlobStore
+from .catalog import EOPatchCatalog
+from .frame_predicates import FramePredicate, TimeIntervalPredicate, MaxFractionPredicate, ScalarThresholdPredicate
 from .eotask import EOTask, CompositeTask
 from .eoworkflow import EOWorkflow, LinearWorkflow, Dependency, WorkflowResults
 from .eoexecution import EOExecutor
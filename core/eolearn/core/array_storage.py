@@ -0,0 +1,988 @@
+"""
+The array_storage module implements reading and writing of numpy arrays in formats used for saving EOPatch features.
+
+Besides plain npy files the module implements a chunked storage format. An array stored in chunked format is a folder
+containing a small JSON header and a number of chunk files. The array is split into a regular grid of chunks and each
+chunk is stored (and optionally compressed) on its own. That way only the chunks covering a requested part of the
+array have to be read and decompressed, and chunks can be compressed in parallel.
+
+Floating point arrays can be stored in chunked format in a quantized form, i.e. as integers together with a scale,
+an offset and a nodata value written in the header. Chunks are dequantized when they are read.
+
+Binary masks can be stored in packed bits format, where each value occupies a single bit. A file in this format starts
+with a npy header of the original array, followed by time frames (i.e. indices of the first axis) packed with
+`numpy.packbits`. Each time frame is padded to whole bytes so that it can be read on its own. The same packed
+representation is kept in memory by `PackedMask`.
+
+Parts of arrays are selected with windows. A window is a tuple with one element for each of the first few axes of an
+array. Each element can be a slice, an integer or a list of integer indices. Integers select a single index but keep
+the dimension of the array.
+"""
+
+import os
+import json
+import logging
+import itertools
+
+import numpy as np
+
+from .compression import get_codec
+from .utilities import map_concurrently
+
+LOGGER = logging.getLogger(__name__)
+
+CHUNK_HEADER_FILENAME = 'header.json'
+CHUNK_FILE_EXTENSION = '.chunk'
+CHUNKED_FORMAT_VERSION = 1
+DEFAULT_TILE_SIZE = 256
+
+
+class Quantization:
+    """ A linear quantization of floating point arrays into integers, used for saving arrays in chunked format
+
+    A value is stored as an integer `round((value - offset) / scale)`, clipped to the range of the integer dtype, and
+    loaded back as `stored_value * scale + offset`. NaN values are stored as a `nodata` integer, which is loaded back as
+    NaN. If `scale` and `offset` are not given they are calculated so that `value_range` (by default the range of
+    values of the saved array) covers all integers of the dtype except `nodata`.
+
+    Example: `Quantization(np.uint16, value_range=(0, 1))` stores reflectances from `[0, 1]` with a precision of
+    about `1.5e-5`.
+    """
+    def __init__(self, dtype=np.uint16, scale=None, offset=None, value_range=None, nodata=None):
+        """
+        :param dtype: An integer dtype in which values are stored
+        :type dtype: numpy.dtype or str or type
+        :param scale: A difference between values represented by two consecutive integers
+        :type scale: float or None
+        :param offset: A value represented by integer 0
+        :type offset: float or None
+        :param value_range: A pair `(min_value, max_value)` of values which have to be represented. Ignored if `scale`
+            and `offset` are given.
+        :type value_range: (float, float) or None
+        :param nodata: An integer representing NaN values. By default it is the maximal value of an unsigned dtype
+            or the minimal value of a signed dtype.
+        :type nodata: int or None
+        :raises: ValueError
+        """
+        self.dtype = np.dtype(dtype)
+        if not np.issubdtype(self.dtype, np.integer):
+            raise ValueError('Quantization dtype should be an integer dtype, got {}'.format(self.dtype))
+
+        if (scale is None) != (offset is None):
+            raise ValueError('Parameters scale and offset should either be both given or both unspecified')
+        if scale is not None and not scale > 0:
+            raise ValueError('Parameter scale should be positive, got {}'.format(scale))
+
+        dtype_info = np.iinfo(self.dtype)
+        if nodata is None:
+            nodata = dtype_info.min if np.issubdtype(self.dtype, np.signedinteger) else dtype_info.max
+        if not dtype_info.min <= nodata <= dtype_info.max:
+            raise ValueError('Nodata value {} is out of range of dtype {}'.format(nodata, self.dtype))
+
+        self.scale = scale
+        self.offset = offset
+        self.value_range = value_range
+        self.nodata = int(nodata)
+
+    def __repr__(self):
+        return '{}(dtype={}, scale={}, offset={}, value_range={}, nodata={})'.format(
+            self.__class__.__name__, self.dtype, self.scale, self.offset, self.value_range, self.nodata)
+
+    def get_parameters(self, array):
+        """ Calculates parameters of quantization of an array, which are written into the header of chunked format
+
+        :param array: A floating point array which will be quantized
+        :type array: numpy.ndarray
+        :return: A dictionary with the integer dtype, scale, offset and nodata value
+        :rtype: dict
+        :raises: ValueError
+        """
+        if not np.issubdtype(array.dtype, np.floating):
+            raise ValueError('Only floating point arrays can be quantized, got dtype {}'.format(array.dtype))
+
+        scale, offset = self.scale, self.offset
+        if scale is None:
+            min_value, max_value = self.value_range if self.value_range is not None else _get_finite_range(array)
+            min_stored, max_stored = self._get_valid_range()
+
+            scale = (max_value - min_value) / (max_stored - min_stored) if max_value > min_value else 1.0
+            offset = min_value - min_stored * scale
+
+        return {
+            'dtype': self.dtype.str,
+            'scale': float(scale),
+            'offset': float(offset),
+            'nodata': self.nodata
+        }
+
+    def _get_valid_range(self):
+        """ Returns the range of integers of the dtype without the nodata value
+        """
+        dtype_info = np.iinfo(self.dtype)
+        min_stored, max_stored = int(dtype_info.min), int(dtype_info.max)
+        if self.nodata == min_stored:
+            return min_stored + 1, max_stored
+        if self.nodata == max_stored:
+            return min_stored, max_stored - 1
+        return min_stored, max_stored
+
+
+def quantize_array(array, parameters):
+    """ Quantizes a floating point array into integers
+
+    :param array: A floating point array
+    :type array: numpy.ndarray
+    :param parameters: Parameters of quantization, as returned by `Quantization.get_parameters`
+    :type parameters: dict
+    :return: An integer array
+    :rtype: numpy.ndarray
+    """
+    nodata = parameters['nodata']
+    min_stored, max_stored = _get_stored_range(parameters)
+
+    nan_mask = np.isnan(array)
+    stored_values = _get_stored_values(array, parameters)
+    stored_values[nan_mask] = min_stored
+    np.clip(stored_values, min_stored, max_stored, out=stored_values)
+
+    quantized_array = stored_values.astype(parameters['dtype'])
+    quantized_array[nan_mask] = nodata
+    return quantized_array
+
+
+def check_quantization_range(array, parameters):
+    """ Checks that values of a floating point array can be quantized with given parameters without being clipped
+
+    :param array: A floating point array
+    :type array: numpy.ndarray
+    :param parameters: Parameters of quantization, as returned by `Quantization.get_parameters`
+    :type parameters: dict
+    :raises: ValueError
+    """
+    min_stored, max_stored = _get_stored_range(parameters)
+    stored_values = _get_stored_values(array[~np.isnan(array)], parameters)
+
+    if stored_values.size and (stored_values.min() < min_stored or stored_values.max() > max_stored):
+        min_value = min_stored * parameters['scale'] + parameters['offset']
+        max_value = max_stored * parameters['scale'] + parameters['offset']
+        raise ValueError('Array contains values outside of the range [{}, {}] which can be stored with quantization '
+                         'parameters {}'.format(min_value, max_value, parameters))
+
+
+def _get_stored_values(array, parameters):
+    """ Transforms values of a floating point array into rounded quantized values, which are not yet clipped
+    """
+    stored_values = np.subtract(array, parameters['offset'], dtype=np.float64)
+    stored_values /= parameters['scale']
+    return np.rint(stored_values, out=stored_values)
+
+
+def _get_stored_range(parameters):
+    """ Returns the range of integers of a quantized dtype without the nodata value
+    """
+    dtype_info = np.iinfo(np.dtype(parameters['dtype']))
+    nodata = parameters['nodata']
+
+    min_stored = dtype_info.min + 1 if nodata == dtype_info.min else dtype_info.min
+    max_stored = dtype_info.max - 1 if nodata == dtype_info.max else dtype_info.max
+    return int(min_stored), int(max_stored)
+
+
+def dequantize_array(array, dtype, parameters):
+    """ Transforms a quantized integer array back into a floating point array
+
+    :param array: An array of quantized integers
+    :type array: numpy.ndarray
+    :param dtype: A floating point dtype of the result
+    :type dtype: numpy.dtype
+    :param parameters: Parameters of quantization, as returned by `Quantization.get_parameters`
+    :type parameters: dict
+    :return: A floating point array
+    :rtype: numpy.ndarray
+    """
+    dtype = np.dtype(dtype)
+    result = array.astype(dtype)
+    result *= dtype.type(parameters['scale'])
+    result += dtype.type(parameters['offset'])
+    result[array == parameters['nodata']] = np.nan
+    return result
+
+
+def save_chunked_array(path, array, chunk_shape=None, compress_level=0, codec=None, quantization=None, workers=1):
+    """ Saves a numpy array into a folder in chunked format
+
+    :param path: Location of the folder where array will be saved. The folder will be created if it doesn't exist.
+    :type path: str
+    :param array: A numpy array with a non-object dtype
+    :type array: numpy.ndarray
+    :param chunk_shape: Shape of a single chunk. Chunks at the end of each axis can be smaller. By default the entire
+        array is a single chunk.
+    :type chunk_shape: tuple(int) or None
+    :param compress_level: A level of compression of each chunk. If it is 0 and no codec is given, chunks are not
+        compressed. If it is 0 and a codec is given, the default level of the codec is used.
+    :type compress_level: int
+    :param codec: A codec used to compress chunks, see `eolearn.core.compression` module. By default `zlib` is used
+        if `compress_level` is set.
+    :type codec: str or Codec or None
+    :param quantization: If given, a floating point array is stored quantized into integers. The array is loaded
+        back with the original dtype.
+    :type quantization: Quantization or None
+    :param workers: Number of threads used to compress and write chunks concurrently
+    :type workers: int or None
+    :raises: ValueError
+    """
+    if array.dtype.hasobject:
+        raise ValueError('Arrays with dtype {} cannot be saved in chunked format'.format(array.dtype))
+
+    chunk_shape = _parse_chunk_shape(array.shape, chunk_shape)
+
+    if codec is None and compress_level:
+        codec = 'zlib'
+    codec = None if codec is None else get_codec(codec)
+
+    quantization_parameters = None if quantization is None else quantization.get_parameters(array)
+
+    os.makedirs(path, exist_ok=True)
+
+    def save_chunk(chunk_index):
+        chunk = array[_get_chunk_slices(chunk_index, chunk_shape, array.shape)]
+        _write_chunk(path, chunk, chunk_index, codec, compress_level, quantization_parameters)
+
+    chunk_indices = list(_iterate_chunk_indices(array.shape, chunk_shape))
+    map_concurrently(save_chunk, chunk_indices, workers)
+
+    header = {
+        'version': CHUNKED_FORMAT_VERSION,
+        'shape': list(array.shape),
+        'dtype': array.dtype.str,
+        'chunk_shape': list(chunk_shape),
+        'compression': None if codec is None else codec.name,
+        'quantization': quantization_parameters
+    }
+    with open(os.path.join(path, CHUNK_HEADER_FILENAME), 'w') as outfile:
+        json.dump(header, outfile)
+
+
+def append_chunked_array(path, array, compress_level=0, workers=1, commit=True):
+    """ Appends an array along the first axis to an array saved in chunked format
+
+    Only chunks of the appended array are written, with the codec and quantization parameters of the saved array.
+    Values of a quantized array have to lie within the range which can be stored with its quantization parameters.
+    The header is replaced only once all chunks are written, therefore readers never see a partially appended array.
+
+    :param path: Location of the folder where array is saved
+    :type path: str
+    :param array: An array with the same shape as the saved array, except for the first axis
+    :type array: numpy.ndarray
+    :param compress_level: A level of compression of each chunk. If it is 0, the default level of the codec is used.
+    :type compress_level: int
+    :param workers: Number of threads used to compress and write chunks concurrently
+    :type workers: int or None
+    :param commit: If `False` the new header is only written into a temporary file and the saved array doesn't change
+        until `commit_chunked_append` is called. The append can be undone with `discard_chunked_append` instead.
+    :type commit: bool
+    :raises: ValueError
+    """
+    header = load_chunked_header(path)
+    shape, dtype, chunk_shape = tuple(header['shape']), np.dtype(header['dtype']), tuple(header['chunk_shape'])
+
+    if array.ndim != len(shape) or array.shape[1:] != shape[1:]:
+        raise ValueError('Array of shape {} cannot be appended to a saved array of shape {}'.format(array.shape, shape))
+    if not np.can_cast(array.dtype, dtype, casting='same_kind'):
+        raise ValueError('Array of dtype {} cannot be appended to a saved array of dtype {}'.format(array.dtype, dtype))
+    if shape[0] % chunk_shape[0]:
+        raise ValueError('Array can only be appended to a saved array of which the last chunk along the first axis is '
+                         'complete, saved array has shape {} and chunk shape {}'.format(shape, chunk_shape))
+
+    codec = get_codec(header['compression']) if header['compression'] else None
+    quantization_parameters = header.get('quantization')
+    array = array.astype(dtype, copy=False)
+    first_chunk_offset = shape[0] // chunk_shape[0]
+
+    if quantization_parameters is not None:
+        check_quantization_range(array, quantization_parameters)
+
+    def save_chunk(chunk_index):
+        chunk = array[_get_chunk_slices(chunk_index, chunk_shape, array.shape)]
+        saved_chunk_index = (chunk_index[0] + first_chunk_offset,) + tuple(chunk_index[1:])
+        _write_chunk(path, chunk, saved_chunk_index, codec, compress_level, quantization_parameters)
+
+    try:
+        chunk_indices = list(_iterate_chunk_indices(array.shape, chunk_shape))
+        map_concurrently(save_chunk, chunk_indices, workers)
+
+        header['shape'] = [shape[0] + array.shape[0]] + list(shape[1:])
+        with open(_get_tmp_header_path(path), 'w') as outfile:
+            json.dump(header, outfile)
+    except BaseException:
+        discard_chunked_append(path)
+        raise
+
+    if commit:
+        commit_chunked_append(path)
+
+
+def commit_chunked_append(path):
+    """ Completes an append of an array in chunked format started by `append_chunked_array` with `commit=False`
+
+    :param path: Location of the folder where array is saved
+    :type path: str
+    """
+    os.replace(_get_tmp_header_path(path), os.path.join(path, CHUNK_HEADER_FILENAME))
+
+
+def discard_chunked_append(path):
+    """ Undoes an append of an array in chunked format which hasn't been committed, by removing the temporary header
+    and all chunks beyond the saved array
+
+    :param path: Location of the folder where array is saved
+    :type path: str
+    """
+    tmp_header_path = _get_tmp_header_path(path)
+    if os.path.exists(tmp_header_path):
+        os.remove(tmp_header_path)
+
+    header = load_chunked_header(path)
+    saved_chunk_count = -(-header['shape'][0] // header['chunk_shape'][0])
+    for filename in os.listdir(path):
+        if filename.endswith(CHUNK_FILE_EXTENSION) and int(filename.split('_')[0]) >= saved_chunk_count:
+            os.remove(os.path.join(path, filename))
+
+
+def load_chunked_array(path, window=None, workers=1):
+    """ Loads a numpy array, or only a part of it, from a folder in chunked format
+
+    :param path: Location of the folder where array is saved
+    :type path: str
+    :param window: A window selecting a part of the array. Only chunks containing at least one selected value are read
+        from disk. By default the entire array is loaded.
+    :type window: tuple(slice or int or list(int)) or None
+    :param workers: Number of threads used to read and decompress chunks concurrently
+    :type workers: int or None
+    :return: Loaded array
+    :rtype: numpy.ndarray
+    """
+    header = load_chunked_header(path)
+    shape, dtype, chunk_shape = tuple(header['shape']), np.dtype(header['dtype']), tuple(header['chunk_shape'])
+
+    window = normalize_window(window, shape)
+    selected_indices = get_window_indices(window, shape)
+    result = np.empty(tuple(indices.size for indices in selected_indices), dtype=dtype)
+
+    def load_chunk(chunk_index):
+        chunk_slices = _get_chunk_slices(chunk_index, chunk_shape, shape)
+        chunk = read_chunk(path, header, chunk_index)
+
+        source_indices, target_slices = [], []
+        for chunk_slice, indices in zip(chunk_slices, selected_indices):
+            first, last = np.searchsorted(indices, [chunk_slice.start, chunk_slice.stop])
+            source_indices.append(indices[first: last] - chunk_slice.start)
+            target_slices.append(slice(first, last))
+
+        result[tuple(target_slices)] = _take_indices(chunk, source_indices)
+
+    chunk_indices = list(_iterate_selected_chunk_indices(selected_indices, chunk_shape))
+    map_concurrently(load_chunk, chunk_indices, workers)
+
+    return _apply_window_to_selected(result, window, selected_indices, shape)
+
+
+def load_npy_array(path, window=None, mmap=False, offset=0):
+    """ Loads a numpy array, or only a part of it, from an uncompressed npy file
+
+    The file is memory-mapped and only the selected part of the array is copied into memory, therefore only the bytes
+    of the selected part are read from disk.
+
+    :param path: Location of the npy file
+    :type path: str
+    :param window: A window selecting a part of the array. By default the entire array is loaded.
+    :type window: tuple(slice or int or list(int)) or None
+    :param mmap: If `True` the loaded array will be a memory map. This holds only if no lists of indices are used in
+        the window.
+    :type mmap: bool
+    :param offset: Position of npy content in the file, e.g. if the file is a container of multiple files
+    :type offset: int
+    :return: Loaded array
+    :rtype: numpy.ndarray
+    """
+    try:
+        array = memmap_npy_array(path, offset=offset) if offset else np.load(path, mmap_mode='r')
+    except ValueError:  # Arrays of Python objects cannot be memory-mapped
+        with open(path, 'rb') as infile:
+            infile.seek(offset)
+            return apply_window(np.lib.format.read_array(infile), window)
+
+    array = apply_window(array, window)
+    return array if mmap else np.array(array)
+
+
+def memmap_npy_array(path, offset=0):
+    """ Memory-maps an array of npy content which starts at the given position of a file
+
+    :param path: Location of the file
+    :type path: str
+    :param offset: Position of npy content in the file
+    :type offset: int
+    :return: A read-only memory map of the array
+    :rtype: numpy.memmap
+    :raises: ValueError if the array contains Python objects or is empty
+    """
+    with open(path, 'rb') as infile:
+        infile.seek(offset)
+        shape, fortran_order, dtype = read_npy_header(infile)
+        data_offset = infile.tell()
+
+    if dtype.hasobject or not int(np.prod(shape)):
+        raise ValueError('Array in {} at offset {} cannot be memory-mapped'.format(path, offset))
+
+    return np.memmap(path, dtype=dtype, mode='r', offset=data_offset, shape=shape,
+                     order='F' if fortran_order else 'C')
+
+
+def load_compressed_npy_array(path, codec, window=None):
+    """ Loads a numpy array, or only a part of it, from a compressed npy file
+
+    The file is decompressed in a streaming way. Only time frames (i.e. indices of the first axis) up to the last
+    selected one are decompressed, and only the selected values of the selected ones are copied into memory.
+
+    :param path: Location of the compressed npy file
+    :type path: str
+    :param codec: A codec with which the file was compressed, see `eolearn.core.compression` module
+    :type codec: str or Codec
+    :param window: A window selecting a part of the array. By default the entire array is loaded.
+    :type window: tuple(slice or int or list(int)) or None
+    :return: Loaded array
+    :rtype: numpy.ndarray
+    """
+    codec = get_codec(codec)
+    return read_compressed_npy_array(lambda: codec.open(path, 'rb'), window=window)
+
+
+def read_compressed_npy_array(open_stream, window=None):
+    """ Reads a numpy array, or only a part of it, from a stream of decompressed npy content
+
+    Only time frames up to the last selected one are decompressed. The stream is read one time frame at a time and
+    only the selected values of the selected time frames are copied into the loaded array.
+
+    :param open_stream: A function which opens a new stream of decompressed npy content. It is called a second time
+        if the array has to be read in full, i.e. in case of Fortran-ordered arrays and arrays of Python objects.
+    :type open_stream: callable
+    :param window: A window selecting a part of the array. By default the entire array is loaded.
+    :type window: tuple(slice or int or list(int)) or None
+    :return: Loaded array
+    :rtype: numpy.ndarray
+    """
+    with open_stream() as infile:
+        if window is None:
+            return np.lib.format.read_array(infile)
+
+        shape, fortran_order, dtype = read_npy_header(infile)
+
+        if not (fortran_order or dtype.hasobject or not shape):
+            window = normalize_window(window, shape)
+            selected_indices = get_window_indices(window, shape)
+            frames = np.empty(tuple(indices.size for indices in selected_indices), dtype=dtype)
+
+            frame_size = int(np.prod(shape[1:])) * dtype.itemsize
+            for position, frame_bytes in enumerate(_read_frames(infile, selected_indices[0], frame_size)):
+                frame = np.frombuffer(frame_bytes, dtype=dtype).reshape(shape[1:])
+                frames[position] = _take_indices(frame, selected_indices[1:])
+
+            return np.array(_apply_window_to_selected(frames, window, selected_indices, shape))
+
+    with open_stream() as infile:
+        return apply_window(np.lib.format.read_array(infile), window)
+
+
+class PackedMask:
+    """ A binary mask kept in memory packed into bits, 8 values per byte
+
+    Only time frames (i.e. indices of the first axis) which are indexed are unpacked, except for keys which don't
+    index the first axis on its own, e.g. keys starting with a new axis, which unpack the entire mask. The mask can be
+    assigned to `FeatureType.MASK` and `FeatureType.MASK_TIMELESS` features of EOPatch, in which case it is saved in
+    packed bits format without being unpacked. Any numpy function can be applied to the mask, which then unpacks it
+    entirely.
+    """
+    def __init__(self, packed_frames, shape, dtype=bool):
+        """
+        :param packed_frames: An array of shape `(n_frames, frame_bytes)` with bits of each time frame packed by
+            `numpy.packbits`
+        :type packed_frames: numpy.ndarray
+        :param shape: Shape of the unpacked mask
+        :type shape: tuple(int)
+        :param dtype: Dtype of the unpacked mask
+        :type dtype: numpy.dtype or type
+        """
+        self.packed_frames = packed_frames
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+
+    @staticmethod
+    def from_array(array):
+        """ Packs a binary numpy array
+
+        :param array: An array of booleans or integers 0 and 1 with at least one dimension
+        :type array: numpy.ndarray
+        :return: A packed mask
+        :rtype: PackedMask
+        :raises: ValueError
+        """
+        return PackedMask(pack_bits(array), array.shape, array.dtype)
+
+    @property
+    def ndim(self):
+        """ Number of dimensions of the mask
+        """
+        return len(self.shape)
+
+    @property
+    def nbytes(self):
+        """ Number of bytes occupied by packed values
+        """
+        return self.packed_frames.nbytes
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        key = self._expand_ellipsis(key if isinstance(key, tuple) else (key,))
+        time_key = key[0] if key else slice(None)
+
+        if _count_ellipsis(key) or time_key is None or np.ndim(time_key) > 1 or \
+                (_is_boolean_key(time_key) and np.ndim(time_key) != 1):
+            return self.unpack()[key]
+
+        frame_indices = np.arange(self.shape[0])[list(time_key) if isinstance(time_key, tuple) else time_key]
+        if np.ndim(frame_indices) == 0:
+            frames = unpack_bits(self.packed_frames[[frame_indices]], (1,) + self.shape[1:], self.dtype)
+            return frames[(0,) + key[1:]]
+
+        frames = unpack_bits(self.packed_frames[frame_indices], (len(frame_indices),) + self.shape[1:], self.dtype)
+        frames_key = slice(None) if isinstance(time_key, slice) else np.arange(len(frame_indices))
+        return frames[(frames_key,) + key[1:]]
+
+    def __array__(self, dtype=None):
+        array = self.unpack()
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def __eq__(self, other):
+        return isinstance(other, PackedMask) and self.shape == other.shape and self.dtype == other.dtype and \
+            np.array_equal(self.packed_frames, other.packed_frames)
+
+    def __repr__(self):
+        return '{}(shape={}, dtype={})'.format(self.__class__.__name__, self.shape, self.dtype)
+
+    def unpack(self):
+        """ Unpacks the entire mask
+
+        :return: The unpacked mask
+        :rtype: numpy.ndarray
+        """
+        return unpack_bits(self.packed_frames, self.shape, self.dtype)
+
+    def _expand_ellipsis(self, key):
+        """ Replaces a single `Ellipsis` in an index key with slices over the axes it stands for, so that the first
+        item of the key always indexes time frames
+        """
+        if _count_ellipsis(key) != 1:
+            return key
+
+        position = next(index for index, item in enumerate(key) if item is Ellipsis)
+        indexed_dims = sum(np.ndim(item) if _is_boolean_key(item) else 1 for item in key
+                           if item is not None and item is not Ellipsis)
+        return key[:position] + (slice(None),) * max(self.ndim - indexed_dims, 0) + key[position + 1:]
+
+
+def _count_ellipsis(key):
+    """ Counts occurrences of `Ellipsis` in an index key
+    """
+    return sum(item is Ellipsis for item in key)
+
+
+def _is_boolean_key(key):
+    """ Checks if an index key is a boolean scalar or a boolean array, which indexes as many axes as it has dimensions
+    """
+    return isinstance(key, (bool, np.bool_, list, np.ndarray)) and np.asarray(key).dtype == np.bool_
+
+
+def is_binary_array(array):
+    """ Checks if an array is a boolean array or an integer array containing only values 0 and 1
+
+    :param array: A numpy array
+    :type array: numpy.ndarray
+    :rtype: bool
+    """
+    if array.dtype == np.bool_:
+        return True
+    if not np.issubdtype(array.dtype, np.integer):
+        return False
+    return not array.size or (array.min() >= 0 and array.max() <= 1)
+
+
+def pack_bits(array):
+    """ Packs each time frame (i.e. index of the first axis) of a binary array into bits
+
+    :param array: An array of booleans or integers 0 and 1 with at least one dimension
+    :type array: numpy.ndarray
+    :return: An array of bytes of shape `(n_frames, frame_bytes)`
+    :rtype: numpy.ndarray
+    :raises: ValueError
+    """
+    if not array.ndim or not is_binary_array(array):
+        raise ValueError('Only boolean arrays or arrays of integers 0 and 1 with at least one dimension can be packed '
+                         'into bits')
+
+    frame_size = int(np.prod(array.shape[1:]))
+    return np.packbits(array.reshape(array.shape[0], frame_size).astype(bool, copy=False), axis=1)
+
+
+def unpack_bits(packed_frames, shape, dtype):
+    """ Unpacks time frames which were packed by `pack_bits`
+
+    :param packed_frames: An array of bytes of shape `(n_frames, frame_bytes)`
+    :type packed_frames: numpy.ndarray
+    :param shape: Shape of the unpacked array
+    :type shape: tuple(int)
+    :param dtype: Dtype of the unpacked array
+    :type dtype: numpy.dtype
+    :return: Unpacked array
+    :rtype: numpy.ndarray
+    """
+    frame_size = int(np.prod(shape[1:]))
+    frames = np.unpackbits(packed_frames, axis=1)
+    return frames[:, :frame_size].reshape(shape).astype(dtype, copy=False)  # pylint: disable=invalid-sequence-index
+
+
+def save_packed_bits_array(outfile, array):
+    """ Writes a binary array into a file object in packed bits format
+
+    :param outfile: A file object opened for writing in binary mode
+    :type outfile: file object
+    :param array: An array of booleans or integers 0 and 1 with at least one dimension, or a packed mask
+    :type array: numpy.ndarray or PackedMask
+    :raises: ValueError
+    """
+    packed_frames = array.packed_frames if isinstance(array, PackedMask) else pack_bits(array)
+
+    header = {
+        'descr': np.lib.format.dtype_to_descr(array.dtype),
+        'fortran_order': False,
+        'shape': tuple(array.shape)
+    }
+    np.lib.format.write_array_header_1_0(outfile, header)
+    outfile.write(np.ascontiguousarray(packed_frames).tobytes())
+
+
+def load_packed_bits_array(infile, window=None):
+    """ Reads a binary array, or only a part of it, from a file object in packed bits format
+
+    Only time frames up to the last selected one are read, and only the selected ones are unpacked.
+
+    :param infile: A file object opened for reading in binary mode, it can also be a stream of a compressed file
+    :type infile: file object
+    :param window: A window selecting a part of the array. By default the entire array is loaded.
+    :type window: tuple(slice or int or list(int)) or None
+    :return: Loaded array
+    :rtype: numpy.ndarray
+    """
+    shape, _, dtype = read_npy_header(infile)
+
+    window = normalize_window(window, shape)
+    selected_indices = get_window_indices(window, shape)
+
+    frame_bytes = (int(np.prod(shape[1:])) + 7) // 8
+    packed_frames = np.empty((selected_indices[0].size, frame_bytes), dtype=np.uint8)
+    for position, packed_frame in enumerate(_read_frames(infile, selected_indices[0], frame_bytes)):
+        packed_frames[position] = np.frombuffer(packed_frame, dtype=np.uint8)
+
+    frames = unpack_bits(packed_frames, (selected_indices[0].size,) + tuple(shape[1:]), dtype)
+    frames = _take_indices(frames, [np.arange(frames.shape[0])] + selected_indices[1:])
+    return np.array(_apply_window_to_selected(frames, window, selected_indices, shape))
+
+
+def read_npy_header(infile):
+    """ Reads a header of a npy file from an open file object, which is then positioned at the start of array data
+
+    :param infile: A file object opened in binary mode, positioned at the beginning of npy content
+    :type infile: file object
+    :return: Shape, a flag whether array is in Fortran order, and dtype of the saved array
+    :rtype: (tuple(int), bool, numpy.dtype)
+    """
+    version = np.lib.format.read_magic(infile)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(infile)
+    if version == (2, 0):
+        return np.lib.format.read_array_header_2_0(infile)
+    raise ValueError('Unsupported version {} of npy format'.format(version))
+
+
+def load_chunked_header(path):
+    """ Loads a header of an array saved in chunked format
+
+    :param path: Location of the folder where array is saved
+    :type path: str
+    :return: A dictionary with information about the saved array
+    :rtype: dict
+    """
+    with open(os.path.join(path, CHUNK_HEADER_FILENAME), 'r') as infile:
+        header = json.load(infile)
+
+    if header.get('version', 0) > CHUNKED_FORMAT_VERSION:
+        raise ValueError('Array in {} was saved with a newer version of chunked format, which is not '
+                         'supported'.format(path))
+    return header
+
+
+def read_chunk(path, header, chunk_index):
+    """ Reads and decompresses a single chunk of an array in chunked format
+
+    :param path: Location of the folder where array is saved
+    :type path: str
+    :param header: A header of the saved array
+    :type header: dict
+    :param chunk_index: A position of the chunk in the grid of chunks
+    :type chunk_index: tuple(int)
+    :return: A chunk of the array
+    :rtype: numpy.ndarray
+    """
+    shape, chunk_shape = tuple(header['shape']), tuple(header['chunk_shape'])
+    chunk_slices = _get_chunk_slices(chunk_index, chunk_shape, shape)
+
+    with open(os.path.join(path, get_chunk_filename(chunk_index)), 'rb') as infile:
+        chunk_bytes = infile.read()
+
+    if header['compression']:
+        chunk_bytes = get_codec(header['compression']).decompress(chunk_bytes)
+
+    quantization_parameters = header.get('quantization')
+    stored_dtype = np.dtype(header['dtype'] if quantization_parameters is None else quantization_parameters['dtype'])
+
+    chunk = np.frombuffer(chunk_bytes, dtype=stored_dtype).reshape(
+        tuple(chunk_slice.stop - chunk_slice.start for chunk_slice in chunk_slices))
+
+    if quantization_parameters is not None:
+        return dequantize_array(chunk, header['dtype'], quantization_parameters)
+    return chunk
+
+
+def _get_tmp_header_path(path):
+    """ Returns a path of the temporary header which is written while an array is being appended
+    """
+    return os.path.join(path, '{}_tmp'.format(CHUNK_HEADER_FILENAME))
+
+
+def get_chunk_filename(chunk_index):
+    """ Returns a name of the file in which a chunk with a given index is stored
+    """
+    return '_'.join(str(idx) for idx in chunk_index) + CHUNK_FILE_EXTENSION
+
+
+def apply_window(array, window):
+    """ Selects a part of an array defined by a window
+
+    :param array: A numpy array
+    :type array: numpy.ndarray
+    :param window: A window selecting a part of the array
+    :type window: tuple(slice or int or list(int)) or None
+    :return: A part of the array. If the window contains only slices and integers this is a view of the array.
+    :rtype: numpy.ndarray
+    """
+    if window is None:
+        return array
+
+    window = normalize_window(window, array.shape)
+    bounds = get_window_bounds(window, array.shape)
+    cropped_array = array[tuple(slice(*axis_bounds) for axis_bounds in bounds)]
+    return _apply_window_to_cropped(cropped_array, window, bounds)
+
+
+def normalize_window(window, shape):
+    """ Parses a window into a tuple with one element per array axis. Each element is either a slice or an array of
+    non-negative indices.
+
+    :param window: A slice, an integer, a list of integers or a tuple of those, one for each of the first few axes of
+        the array
+    :type window: slice or int or list(int) or tuple(slice or int or list(int)) or None
+    :param shape: Shape of the array
+    :type shape: tuple(int)
+    :return: A tuple of slices and arrays of indices, one for each axis
+    :rtype: tuple(slice or numpy.ndarray)
+    :raises: ValueError, IndexError
+    """
+    if window is None:
+        window = ()
+    if not isinstance(window, tuple):
+        window = (window,)
+    if len(window) > len(shape):
+        raise ValueError('Window {} has more dimensions than an array of shape {}'.format(window, shape))
+
+    normalized_window = []
+    for axis_window, axis_size in zip(window, shape):
+        if isinstance(axis_window, (int, np.integer)):
+            index = range(axis_size)[axis_window]
+            axis_window = slice(index, index + 1)
+        elif isinstance(axis_window, (list, np.ndarray)):
+            indices = np.asarray(axis_window, dtype=np.int64)
+            if indices.ndim != 1 or (indices.size and (indices.min() < -axis_size or indices.max() >= axis_size)):
+                raise IndexError('Indices {} are not valid for an axis of size {}'.format(axis_window, axis_size))
+            axis_window = indices % axis_size if axis_size else indices
+        elif not isinstance(axis_window, slice):
+            raise ValueError('Window can only contain slices, integers or lists of integers, got '
+                             '{}'.format(axis_window))
+        normalized_window.append(axis_window)
+
+    return tuple(normalized_window) + (slice(None),) * (len(shape) - len(window))
+
+
+def get_window_bounds(window, shape):
+    """ For each axis returns the smallest interval [start, stop) containing all indices selected by a normalized window
+
+    :param window: A window, as returned by `normalize_window` function
+    :type window: tuple(slice or numpy.ndarray)
+    :param shape: Shape of the array
+    :type shape: tuple(int)
+    :return: A list of intervals, one for each axis
+    :rtype: list((int, int))
+    """
+    bounds = []
+    for axis_window, axis_size in zip(window, shape):
+        indices = range(axis_size)[axis_window] if isinstance(axis_window, slice) else axis_window
+
+        if isinstance(indices, range) and indices:
+            bounds.append((min(indices[0], indices[-1]), max(indices[0], indices[-1]) + 1))
+        elif isinstance(indices, np.ndarray) and indices.size:
+            bounds.append((int(indices.min()), int(indices.max()) + 1))
+        else:
+            bounds.append((0, 0))
+    return bounds
+
+
+def get_window_indices(window, shape):
+    """ For each axis returns a sorted array of distinct indices selected by a normalized window
+
+    :param window: A window, as returned by `normalize_window` function
+    :type window: tuple(slice or numpy.ndarray)
+    :param shape: Shape of the array
+    :type shape: tuple(int)
+    :return: A list of arrays of indices, one for each axis
+    :rtype: list(numpy.ndarray)
+    """
+    return [np.unique(np.arange(axis_size)[axis_window]) for axis_window, axis_size in zip(window, shape)]
+
+
+def _apply_window_to_selected(array, window, selected_indices, shape):
+    """ Applies order and repetitions of indices of a normalized window on an array which contains only the values at
+    selected indices, as returned by `get_window_indices`
+    """
+    for axis, (axis_window, indices, axis_size) in enumerate(zip(window, selected_indices, shape)):
+        if isinstance(axis_window, slice) and axis_window.step in (None, 1):
+            continue
+        window_indices = np.arange(axis_size)[axis_window] if isinstance(axis_window, slice) else axis_window
+        if not np.array_equal(window_indices, indices):
+            array = np.take(array, np.searchsorted(indices, window_indices), axis=axis)
+    return array
+
+
+def _take_indices(array, indices_per_axis):
+    """ Selects given sorted indices along each of the first few axes of an array. Contiguous ranges of indices are
+    selected with slices, therefore without copying
+    """
+    for axis, indices in enumerate(indices_per_axis):
+        if indices.size and indices[-1] - indices[0] + 1 == indices.size:
+            array = array[(slice(None),) * axis + (slice(indices[0], indices[-1] + 1),)]
+        else:
+            array = np.take(array, indices, axis=axis)
+    return array
+
+
+def _apply_window_to_cropped(array, window, bounds):
+    """ Applies steps of slices and lists of indices of a normalized window on an array which has already been cropped
+    to window bounds
+    """
+    for axis, (axis_window, (start, _)) in enumerate(zip(window, bounds)):
+        if isinstance(axis_window, slice):
+            if axis_window.step not in (None, 1):
+                array = array[(slice(None),) * axis + (slice(None, None, axis_window.step),)]
+        else:
+            array = np.take(array, axis_window - start, axis=axis)
+    return array
+
+
+def _get_finite_range(array):
+    """ Returns minimal and maximal finite value of an array or `(0, 1)` if there are no finite values
+    """
+    finite_mask = np.isfinite(array)
+    if not finite_mask.any():
+        return 0.0, 1.0
+    min_value = np.min(array, where=finite_mask, initial=np.inf)
+    max_value = np.max(array, where=finite_mask, initial=-np.inf)
+    return float(min_value), float(max_value)
+
+
+def _read_frames(infile, frame_indices, frame_size):
+    """ Reads time frames with given sorted indices from a file object positioned at the start of the first time frame.
+    Time frames in between are skipped and the file object is never read beyond the last selected time frame
+    """
+    position = 0
+    for frame_index in frame_indices:
+        _skip_bytes(infile, (frame_index - position) * frame_size)
+        yield infile.read(frame_size)
+        position = frame_index + 1
+
+
+def _skip_bytes(infile, size, block_size=2 ** 24):
+    """ Skips a number of bytes of a file object by reading them, which works also for streams which cannot seek
+    """
+    while size > 0:
+        skipped = len(infile.read(min(size, block_size)))
+        if not skipped:
+            break
+        size -= skipped
+
+
+def _write_chunk(path, chunk, chunk_index, codec, compress_level, quantization_parameters):
+    """ Optionally quantizes and compresses a chunk and writes it into a file
+    """
+    chunk = np.ascontiguousarray(chunk)
+    if quantization_parameters is not None:
+        chunk = quantize_array(chunk, quantization_parameters)
+    chunk_bytes = chunk.tobytes()
+    if codec is not None:
+        chunk_bytes = codec.compress(chunk_bytes, compress_level or None)
+
+    with open(os.path.join(path, get_chunk_filename(chunk_index)), 'wb') as outfile:
+        outfile.write(chunk_bytes)
+
+
+def _parse_chunk_shape(shape, chunk_shape):
+    """ Makes sure chunk shape is valid for the given array shape
+    """
+    if chunk_shape is None:
+        chunk_shape = shape
+
+    if len(chunk_shape) != len(shape):
+        raise ValueError('Chunk shape {} does not match array shape {}'.format(chunk_shape, shape))
+
+    return tuple(max(1, min(chunk_size, axis_size)) for chunk_size, axis_size in zip(chunk_shape, shape))
+
+
+def _iterate_chunk_indices(shape, chunk_shape):
+    """ Iterates over indices of all chunks
+    """
+    index_ranges = [range(-(-axis_size // chunk_size)) for axis_size, chunk_size in zip(shape, chunk_shape)]
+    return itertools.product(*index_ranges)
+
+
+def _iterate_selected_chunk_indices(selected_indices, chunk_shape):
+    """ Iterates over indices of chunks which contain at least one value at selected indices of each axis
+    """
+    index_ranges = [sorted(set((indices // chunk_size).tolist())) for indices, chunk_size in
+                    zip(selected_indices, chunk_shape)]
+    return itertools.product(*index_ranges)
+
+
+def _get_chunk_slices(chunk_index, chunk_shape, shape):
+    """ Returns a tuple of slices defining where in the array the chunk is
+    """
+    return tuple(slice(idx * chunk_size, min((idx + 1) * chunk_size, axis_size))
+                 for idx, chunk_size, axis_size in zip(chunk_index, chunk_shape, shape))
@@ -0,0 +1,157 @@
+"""
+The blob_store module implements a content-addressed store of files of saved EOPatches.
+
+EOPatches of one dataset often contain byte-identical features, e.g. timestamps, meta info or timeless masks shared
+by all patches of an AOI split. If EOPatches are saved with a `BlobStore`, every saved file is replaced with a hard link
+to a blob, which is named by a digest of file content. Identical files are therefore stored on disk only once and
+share a single inode, while EOPatch folders keep their usual structure and can be loaded without the store.
+
+Files of saved EOPatches are never modified in place, they are only replaced or removed, therefore a change of a
+feature in one EOPatch never affects other EOPatches which share its blob.
+"""
+
+import os
+import errno
+import hashlib
+import logging
+import warnings
+import datetime
+
+LOGGER = logging.getLogger(__name__)
+
+BLOB_STORE_FOLDER = '.blobs'
+
+
+class BlobStore:
+    """ A content-addressed store of files, which deduplicates identical files by hard-linking them to blobs
+
+    A blob is a file in the store folder named by a digest of its content. A blob which is not linked from any EOPatch
+    anymore has a single link and can be removed with `remove_unreferenced`.
+    """
+    def __init__(self, path, block_size=2 ** 20):
+        """
+        :param path: Location of the store folder, e.g. a folder `BLOB_STORE_FOLDER` in the root of a dataset. It has
+            to be on the same filesystem as saved EOPatches, because hard links cannot cross filesystems.
+        :type path: str
+        :param block_size: Number of bytes read at once when files are hashed
+        :type block_size: int
+        """
+        self.path = path
+        self.block_size = block_size
+        self._is_linking_supported = True
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, self.path)
+
+    @staticmethod
+    def for_dataset(dataset_path):
+        """ Creates a blob store in the default folder of the given dataset root
+
+        :param dataset_path: Location of a folder which contains saved EOPatches
+        :type dataset_path: str
+        :rtype: BlobStore
+        """
+        return BlobStore(os.path.join(dataset_path, BLOB_STORE_FOLDER))
+
+    def get_blob_path(self, digest):
+        """ Returns a location of a blob with the given digest
+
+        :param digest: A digest of blob content
+        :type digest: str
+        :rtype: str
+        """
+        return os.path.join(self.path, digest[:2], digest)
+
+    def hash_file(self, file_path):
+        """ Computes a digest of file content
+
+        :param file_path: Location of a file
+        :type file_path: str
+        :return: A hexadecimal digest
+        :rtype: str
+        """
+        hasher = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as infile:
+            for block in iter(lambda: infile.read(self.block_size), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    def add(self, path):
+        """ Adds a file or all files of a folder (e.g. a feature saved in chunked format) to the store. Each file is
+        hashed and either becomes a new blob or is replaced with a hard link to an existing blob with the same content.
+
+        If hard links are not supported, e.g. because the store is on another filesystem, files are left as they are
+        and a warning is raised once.
+
+        :param path: Location of a file or a folder
+        :type path: str
+        :return: A digest of the file, or `None` in case of a folder or if the file wasn't added to the store
+        :rtype: str or None
+        """
+        if not os.path.isdir(path):
+            return self._add_file(path)
+
+        for folder, _, filenames in os.walk(path):
+            for filename in filenames:
+                self._add_file(os.path.join(folder, filename))
+        return None
+
+    def _add_file(self, file_path):
+        """ Adds a single file to the store
+
+        :return: A digest of the file or `None` if the file wasn't added
+        :rtype: str or None
+        """
+        if not self._is_linking_supported:
+            return None
+
+        digest = self.hash_file(file_path)
+        blob_path = self.get_blob_path(digest)
+
+        try:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            if os.path.exists(blob_path):
+                LOGGER.debug('Replacing %s with a link to existing blob %s', file_path, digest)
+                self._replace_with_link(blob_path, file_path)
+            else:
+                self._replace_with_link(file_path, blob_path)
+        except OSError as exception:
+            if exception.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EACCES):
+                raise
+            self._is_linking_supported = False
+            warnings.warn('Files cannot be hard-linked into blob store {} ({}), they will not be '
+                          'deduplicated'.format(self.path, exception))
+            return None
+
+        return digest
+
+    @staticmethod
+    def _replace_with_link(source_path, target_path):
+        """ Atomically replaces the target path with a hard link to the source file. A link is first created under a
+        temporary name, so that concurrent writers of the same blob never see a partially written file.
+        """
+        tmp_path = '{}_tmp_{}_{}'.format(target_path, os.getpid(), datetime.datetime.now().timestamp())
+        os.link(source_path, tmp_path)
+        try:
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def remove_unreferenced(self):
+        """ Removes blobs which are not linked from any saved EOPatch anymore
+
+        :return: Number of removed blobs
+        :rtype: int
+        """
+        removed_count = 0
+        if not os.path.isdir(self.path):
+            return removed_count
+
+        for folder, _, filenames in os.walk(self.path):
+            for filename in filenames:
+                blob_path = os.path.join(folder, filename)
+                if os.stat(blob_path).st_nlink == 1:
+                    os.remove(blob_path)
+                    removed_count += 1
+        return removed_count
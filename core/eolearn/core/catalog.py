@@ -0,0 +1,338 @@
+"""
+The catalog module implements an index of EOPatches saved in a common folder.
+
+An `EOPatchCatalog` keeps a small SQLite database with a record of each saved EOPatch: its bounding box, indexed with an
+R-tree, all its timestamps, indexed by time, and the list of its features together with their shapes and dtypes. The
+catalog is built by crawling the folder once and can later be updated incrementally, only with EOPatches which were
+added, changed or removed since. Queries by location, time interval and features are answered from the database
+without reading any EOPatch, and their results can be passed directly to `EOExecutor` as execution arguments.
+"""
+
+import os
+import json
+import logging
+import sqlite3
+import warnings
+
+import numpy as np
+import shapely.geometry
+from sentinelhub import CRS
+
+from .constants import FeatureType
+from .container import is_container
+from .eodata import EOPatch, MANIFEST_FILENAME
+from .time_index import to_datetime64
+from .utilities import FeatureParser, map_concurrently
+
+LOGGER = logging.getLogger(__name__)
+
+CATALOG_FILENAME = '.eopatch_catalog.sqlite'
+CATALOG_VERSION = 1
+
+_CATALOG_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS patches (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, modified REAL, '
+    'crs INTEGER, min_x REAL, min_y REAL, max_x REAL, max_y REAL, start_time INTEGER, end_time INTEGER, '
+    'timestamp_count INTEGER)',
+    'CREATE TABLE IF NOT EXISTS timestamps (patch_id INTEGER NOT NULL, time INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS timestamps_by_time ON timestamps (time, patch_id)',
+    'CREATE INDEX IF NOT EXISTS timestamps_by_patch ON timestamps (patch_id)',
+    'CREATE TABLE IF NOT EXISTS features (patch_id INTEGER NOT NULL, feature_type TEXT NOT NULL, feature_name TEXT, '
+    'shape TEXT, dtype TEXT)',
+    'CREATE INDEX IF NOT EXISTS features_by_name ON features (feature_type, feature_name, patch_id)',
+    'CREATE INDEX IF NOT EXISTS features_by_patch ON features (patch_id)'
+]
+_RTREE_SCHEMA = 'CREATE VIRTUAL TABLE IF NOT EXISTS patch_bboxes USING rtree(id, min_x, max_x, min_y, max_y)'
+_FALLBACK_BBOX_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS patch_bboxes (id INTEGER PRIMARY KEY, min_x REAL, max_x REAL, min_y REAL, max_y REAL)',
+    'CREATE INDEX IF NOT EXISTS patch_bboxes_by_x ON patch_bboxes (min_x, max_x)'
+]
+
+
+class EOPatchCatalog:
+    """ A catalog of EOPatches saved in a common folder, stored in a SQLite database
+
+    The catalog has to be updated with `crawl` or `ingest` after EOPatches are saved. EOPatches are identified by names
+    of their folders (or container files), which are the same as values of parameter `eopatch_folder` of `LoadFromDisk`
+    and `SaveToDisk` tasks.
+
+    Example:
+
+    .. code-block:: python
+
+        catalog = EOPatchCatalog('path/to/eopatches')
+        catalog.crawl(workers=8)
+        execution_args = catalog.get_execution_args([load_task], geometry=aoi_bbox,
+                                                    time_interval=('2018-06-01', '2018-06-30'),
+                                                    features=[(FeatureType.MASK, 'CLP')])
+    """
+    def __init__(self, folder, catalog_path=None):
+        """
+        :param folder: A folder which contains saved EOPatches
+        :type folder: str
+        :param catalog_path: Location of the SQLite database file. By default it is a file `CATALOG_FILENAME` in the
+            given folder. If the file exists the catalog is opened, otherwise a new empty catalog is created.
+        :type catalog_path: str or None
+        """
+        if not os.path.isdir(folder):
+            raise ValueError('Folder {} does not exist'.format(folder))
+
+        self.folder = folder
+        self.catalog_path = catalog_path or os.path.join(folder, CATALOG_FILENAME)
+
+        self.connection = sqlite3.connect(self.catalog_path)
+        self._create_schema()
+
+    def __repr__(self):
+        return '{}({}, catalog_path={})'.format(self.__class__.__name__, self.folder, self.catalog_path)
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM patches').fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        """ Closes the connection to the database
+        """
+        self.connection.close()
+
+    def _create_schema(self):
+        """ Creates tables and indices of an empty catalog and checks the version of an existing catalog
+
+        :raises: ValueError
+        """
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, CATALOG_VERSION):
+            raise ValueError('Catalog {} has an unsupported version {}'.format(self.catalog_path, version))
+
+        with self.connection:
+            for statement in _CATALOG_SCHEMA:
+                self.connection.execute(statement)
+            try:
+                self.connection.execute(_RTREE_SCHEMA)
+            except sqlite3.OperationalError:
+                LOGGER.debug('SQLite is compiled without R-tree module, bounding boxes will be indexed with a B-tree')
+                for statement in _FALLBACK_BBOX_SCHEMA:
+                    self.connection.execute(statement)
+            self.connection.execute('PRAGMA user_version = {}'.format(CATALOG_VERSION))
+
+    def crawl(self, workers=1):
+        """ Updates the catalog with the content of the folder. New and changed EOPatches are ingested and records
+        of EOPatches which don't exist anymore are removed. EOPatches are described concurrently, only their bounding
+        boxes, timestamps and manifests (or file headers) are read.
+
+        :param workers: Number of threads used to describe EOPatches
+        :type workers: int or None
+        :return: Number of ingested EOPatches
+        :rtype: int
+        """
+        eopatch_folders = [name for name in os.listdir(self.folder) if not name.startswith('.') and
+                           (os.path.isdir(os.path.join(self.folder, name)) or
+                            is_container(os.path.join(self.folder, name)))]
+
+        self.remove(set(self.get_eopatch_folders()) - set(eopatch_folders))
+        return self.ingest(eopatch_folders, workers=workers)
+
+    def ingest(self, eopatch_folders, workers=1, only_changed=True):
+        """ Adds records of the given EOPatches to the catalog or updates existing records. EOPatches which cannot be
+        described are skipped with a warning.
+
+        :param eopatch_folders: Names of EOPatch folders (or container files) in the catalog folder
+        :type eopatch_folders: list(str)
+        :param workers: Number of threads used to describe EOPatches
+        :type workers: int or None
+        :param only_changed: If `True` EOPatches which haven't been modified since they were ingested are skipped
+        :type only_changed: bool
+        :return: Number of ingested EOPatches
+        :rtype: int
+        """
+        if only_changed:
+            modified_times = dict(self.connection.execute('SELECT name, modified FROM patches'))
+            eopatch_folders = [name for name in eopatch_folders if modified_times.get(name) !=
+                               _get_modification_time(os.path.join(self.folder, name))]
+
+        records = map_concurrently(self._describe_eopatch, list(eopatch_folders), workers)
+        records = [record for record in records if record is not None]
+
+        with self.connection:
+            for record in records:
+                self._insert_record(*record)
+
+        LOGGER.debug('Ingested %d EOPatches into catalog %s', len(records), self.catalog_path)
+        return len(records)
+
+    def remove(self, eopatch_folders):
+        """ Removes records of the given EOPatches from the catalog
+
+        :param eopatch_folders: Names of EOPatch folders (or container files)
+        :type eopatch_folders: iterable(str)
+        """
+        with self.connection:
+            for name in eopatch_folders:
+                self._delete_record(name)
+
+    def get_eopatch_folders(self):
+        """ Returns names of all EOPatches in the catalog
+
+        :return: A sorted list of names
+        :rtype: list(str)
+        """
+        return [name for name, in self.connection.execute('SELECT name FROM patches ORDER BY name')]
+
+    def query(self, geometry=None, time_interval=None, features=None):
+        """ Finds EOPatches which satisfy all the given conditions
+
+        :param geometry: A geometry which has to intersect the bounding box of an EOPatch. It is transformed into the
+            CRS of each EOPatch. EOPatches without a bounding box never match.
+        :type geometry: sentinelhub.BBox or sentinelhub.Geometry or None
+        :param time_interval: A pair of start and end time. An EOPatch has to contain at least one timestamp within
+            the interval, bounds are included. Any of the bounds can be `None`.
+        :type time_interval: (datetime.datetime or str or None, datetime.datetime or str or None) or None
+        :param features: A collection of features which an EOPatch has to contain. If a feature name is not given
+            any feature of the feature type is sufficient.
+        :type features: object supported by eolearn.core.utilities.FeatureParser class
+        :return: A sorted list of names of EOPatch folders
+        :rtype: list(str)
+        """
+        conditions, parameters = [], []
+
+        if time_interval is not None:
+            time_conditions = []
+            for bound, operator in zip(time_interval, ['>=', '<=']):
+                if bound is not None:
+                    time_conditions.append('time {} ?'.format(operator))
+                    parameters.append(_to_microseconds([bound])[0])
+            if time_conditions:
+                conditions.append('id IN (SELECT patch_id FROM timestamps WHERE {})'.format(
+                    ' AND '.join(time_conditions)))
+
+        if features is not None:
+            for feature_type, feature_name in FeatureParser(features)():
+                if feature_name is ... or feature_name is None:
+                    conditions.append('id IN (SELECT patch_id FROM features WHERE feature_type = ?)')
+                    parameters.append(feature_type.value)
+                else:
+                    conditions.append('id IN (SELECT patch_id FROM features WHERE feature_type = ? AND '
+                                      'feature_name = ?)')
+                    parameters.extend([feature_type.value, feature_name])
+
+        if geometry is not None:
+            patch_ids = self._query_geometry(geometry)
+            conditions.append('id IN ({})'.format(', '.join(str(patch_id) for patch_id in patch_ids)))
+
+        sql = 'SELECT name FROM patches'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        return [name for name, in self.connection.execute(sql + ' ORDER BY name', parameters)]
+
+    def get_execution_args(self, tasks, **query_params):
+        """ Finds EOPatches which satisfy the given conditions and returns execution arguments of a workflow, which
+        will process each of them
+
+        :param tasks: Tasks which have a parameter `eopatch_folder`, e.g. `LoadFromDisk` and `SaveToDisk`
+        :type tasks: list(EOTask)
+        :param query_params: Conditions which are passed to `query` method
+        :return: A list of execution arguments, one for each found EOPatch, which can be given to `EOExecutor`
+        :rtype: list(dict(EOTask: dict(str: str)))
+        """
+        return [{task: {'eopatch_folder': name} for task in tasks} for name in self.query(**query_params)]
+
+    def _query_geometry(self, geometry):
+        """ Finds IDs of EOPatches whose bounding boxes intersect the given geometry. Candidates are found with the
+        index of bounding boxes of each CRS and then checked exactly.
+        """
+        patch_ids = []
+        for crs, in self.connection.execute('SELECT DISTINCT crs FROM patches WHERE crs IS NOT NULL').fetchall():
+            crs = CRS(crs)
+            shape = (geometry if geometry.crs is crs else geometry.transform(crs)).geometry
+            min_x, min_y, max_x, max_y = shape.bounds
+
+            candidates = self.connection.execute(
+                'SELECT patches.id, patches.min_x, patches.min_y, patches.max_x, patches.max_y FROM patch_bboxes '
+                'JOIN patches ON patches.id = patch_bboxes.id WHERE patches.crs = ? AND patch_bboxes.max_x >= ? AND '
+                'patch_bboxes.min_x <= ? AND patch_bboxes.max_y >= ? AND patch_bboxes.min_y <= ?',
+                (int(crs.value), min_x, max_x, min_y, max_y)
+            )
+            patch_ids.extend(patch_id for patch_id, *bounds in candidates
+                             if shapely.geometry.box(*bounds).intersects(shape))
+        return patch_ids
+
+    def _describe_eopatch(self, eopatch_folder):
+        """ Reads everything which the catalog stores about an EOPatch
+
+        :return: A tuple of EOPatch name, modification time, a description and timestamps in microseconds, or `None`
+            if the EOPatch cannot be described
+        """
+        path = os.path.join(self.folder, eopatch_folder)
+        try:
+            modified = _get_modification_time(path)
+            description = EOPatch.describe(path)
+            timestamps = []
+            if description.timestamp_count:
+                timestamps = _to_microseconds(EOPatch.load(path, features=FeatureType.TIMESTAMP).timestamp)
+        except (OSError, ValueError) as exception:
+            warnings.warn('EOPatch {} could not be described and will not be ingested into catalog: '
+                          '{}'.format(path, exception))
+            return None
+
+        return eopatch_folder, modified, description, timestamps
+
+    def _insert_record(self, name, modified, description, timestamps):
+        """ Inserts a record of an EOPatch, replacing an existing record with the same name
+        """
+        self._delete_record(name)
+
+        bbox = description.bbox
+        crs, bounds = (None, (None,) * 4) if bbox is None else (int(bbox.crs.value), tuple(bbox))
+        patch_id = self.connection.execute(
+            'INSERT INTO patches (name, modified, crs, min_x, min_y, max_x, max_y, start_time, end_time, '
+            'timestamp_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (name, modified, crs) + bounds + (min(timestamps, default=None), max(timestamps, default=None),
+                                              len(timestamps))
+        ).lastrowid
+
+        if bbox is not None:
+            min_x, min_y, max_x, max_y = bounds
+            self.connection.execute('INSERT INTO patch_bboxes (id, min_x, max_x, min_y, max_y) VALUES (?, ?, ?, ?, ?)',
+                                    (patch_id, min_x, max_x, min_y, max_y))
+
+        self.connection.executemany('INSERT INTO timestamps (patch_id, time) VALUES (?, ?)',
+                                    [(patch_id, time) for time in sorted(set(timestamps))])
+        self.connection.executemany(
+            'INSERT INTO features (patch_id, feature_type, feature_name, shape, dtype) VALUES (?, ?, ?, ?, ?)',
+            [(patch_id, feature.feature_type.value, feature.feature_name,
+              None if feature.shape is None else json.dumps(feature.shape),
+              None if feature.dtype is None else feature.dtype.str) for feature in description.features]
+        )
+
+    def _delete_record(self, name):
+        """ Deletes a record of an EOPatch if it exists
+        """
+        row = self.connection.execute('SELECT id FROM patches WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            return
+
+        for table, column in [('patches', 'id'), ('patch_bboxes', 'id'), ('timestamps', 'patch_id'),
+                              ('features', 'patch_id')]:
+            self.connection.execute('DELETE FROM {} WHERE {} = ?'.format(table, column), row)
+
+
+def _get_modification_time(path):
+    """ Returns the modification time of a saved EOPatch. The manifest of an EOPatch folder is rewritten each time the
+    EOPatch is saved, therefore its modification time is used when it exists. Returns `None` if the EOPatch doesn't
+    exist.
+    """
+    if not os.path.exists(path):
+        return None
+
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    return os.path.getmtime(manifest_path if os.path.isfile(manifest_path) else path)
+
+
+def _to_microseconds(timestamps):
+    """ Converts timestamps into integer numbers of microseconds since the Unix epoch
+    """
+    return to_datetime64(timestamps).astype(np.int64).tolist()
@@ -0,0 +1,303 @@
+"""
+The compression module contains a registry of compression codecs which can be used for saving EOPatch features.
+
+A codec compresses entire files, in which case the file gets an extension of the codec, and chunks of arrays saved
+in chunked format, in which case the name of the codec is written into the header of the array. Codecs from the
+standard library (`gzip`, `bz2`, `lzma` and `zlib`) are always available. Codecs `zstd` and `lz4` are available if
+packages `zstandard` and `lz4` are installed. Additional codecs can be registered with `register_codec`.
+"""
+
+import gzip
+import bz2
+import lzma
+import zlib
+import logging
+
+from .constants import FileFormat
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None  # pylint: disable=invalid-name
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Codec:
+    """ Base class for compression codecs
+
+    :ivar name: A name under which the codec is registered
+    :ivar file_format: A file format which defines the extension of compressed files. If it is `None` the codec can
+        only be used to compress chunks of arrays in chunked format.
+    :ivar magic: Bytes at the beginning of every compressed file, used to detect the codec of a file
+    :ivar default_level: A compression level used if the level is not specified
+    """
+    name = None
+    file_format = None
+    magic = None
+    default_level = None
+
+    def open(self, filename, mode='rb', level=None):
+        """ Opens a compressed file
+
+        :param filename: Path to the file or, in case of reading, a binary file object
+        :type filename: str or file object
+        :param mode: Either `'rb'` or `'wb'`
+        :type mode: str
+        :param level: Compression level, used only when writing
+        :type level: int or None
+        :return: A file object which compresses written data or decompresses read data
+        """
+        raise NotImplementedError
+
+    def compress(self, data, level=None):
+        """ Compresses bytes
+
+        :param data: Bytes to compress
+        :type data: bytes
+        :param level: Compression level
+        :type level: int or None
+        :return: Compressed bytes
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def decompress(self, data):
+        """ Decompresses bytes
+
+        :param data: Compressed bytes
+        :type data: bytes
+        :return: Decompressed bytes
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def _get_level(self, level):
+        """ Returns the given compression level or the default one
+        """
+        return self.default_level if level is None else level
+
+    def __repr__(self):
+        return '{}()'.format(self.__class__.__name__)
+
+
+class GzipCodec(Codec):
+    """ Codec of the gzip file format, compatible with files saved by older versions of eo-learn
+    """
+    name = 'gzip'
+    file_format = FileFormat.GZIP
+    magic = b'\x1f\x8b'
+    default_level = 6
+
+    def open(self, filename, mode='rb', level=None):
+        if 'w' in mode:
+            return gzip.GzipFile(filename, mode, self._get_level(level), mtime=0)
+        return gzip.open(filename, mode)
+
+    def compress(self, data, level=None):
+        return gzip.compress(data, self._get_level(level))
+
+    def decompress(self, data):
+        return gzip.decompress(data)
+
+
+class Bz2Codec(Codec):
+    """ Codec of the bzip2 file format
+    """
+    name = 'bz2'
+    file_format = FileFormat.BZ2
+    magic = b'BZh'
+    default_level = 9
+
+    def open(self, filename, mode='rb', level=None):
+        if 'w' in mode:
+            return bz2.open(filename, mode, compresslevel=self._get_level(level))
+        return bz2.open(filename, mode)
+
+    def compress(self, data, level=None):
+        return bz2.compress(data, self._get_level(level))
+
+    def decompress(self, data):
+        return bz2.decompress(data)
+
+
+class LzmaCodec(Codec):
+    """ Codec of the xz file format. Compression levels are presets of the `lzma` module.
+    """
+    name = 'lzma'
+    file_format = FileFormat.LZMA
+    magic = b'\xfd7zXZ\x00'
+    default_level = 6
+
+    def open(self, filename, mode='rb', level=None):
+        if 'w' in mode:
+            return lzma.open(filename, mode, preset=self._get_level(level))
+        return lzma.open(filename, mode)
+
+    def compress(self, data, level=None):
+        return lzma.compress(data, preset=self._get_level(level))
+
+    def decompress(self, data):
+        return lzma.decompress(data)
+
+
+class ZlibCodec(Codec):
+    """ Codec of raw zlib streams. It has no file format and can only be used to compress chunks of arrays.
+    """
+    name = 'zlib'
+    default_level = 6
+
+    def open(self, filename, mode='rb', level=None):
+        raise ValueError('Codec {} can only be used to compress arrays in chunked format'.format(self.name))
+
+    def compress(self, data, level=None):
+        return zlib.compress(data, self._get_level(level))
+
+    def decompress(self, data):
+        return zlib.decompress(data)
+
+
+class ZstdCodec(Codec):
+    """ Codec of the Zstandard file format, requires package `zstandard`
+    """
+    name = 'zstd'
+    file_format = FileFormat.ZSTD
+    magic = b'\x28\xb5\x2f\xfd'
+    default_level = 3
+
+    def open(self, filename, mode='rb', level=None):
+        if 'w' in mode:
+            return zstandard.open(filename, mode, cctx=zstandard.ZstdCompressor(level=self._get_level(level)))
+        return zstandard.open(filename, mode)
+
+    def compress(self, data, level=None):
+        return zstandard.ZstdCompressor(level=self._get_level(level)).compress(data)
+
+    def decompress(self, data):
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+class Lz4Codec(Codec):
+    """ Codec of the LZ4 frame format, requires package `lz4`
+    """
+    name = 'lz4'
+    file_format = FileFormat.LZ4
+    magic = b'\x04\x22\x4d\x18'
+    default_level = 0
+
+    def open(self, filename, mode='rb', level=None):
+        if 'w' in mode:
+            return lz4.frame.open(filename, mode, compression_level=self._get_level(level))
+        return lz4.frame.open(filename, mode)
+
+    def compress(self, data, level=None):
+        return lz4.frame.compress(data, compression_level=self._get_level(level))
+
+    def decompress(self, data):
+        return lz4.frame.decompress(data)
+
+
+_CODECS = {}
+
+
+def register_codec(codec):
+    """ Registers a codec under its name. A previously registered codec with the same name is replaced. If multiple
+    codecs have the same file format, the one registered last is used to load files of that format.
+
+    :param codec: A codec instance
+    :type codec: Codec
+    """
+    if not isinstance(codec, Codec) or not codec.name:
+        raise ValueError('Codec should be an instance of {} with a name, got {}'.format(Codec.__name__, codec))
+    if codec.file_format is not None and not codec.file_format.is_compression():
+        raise ValueError('File format {} is not a compression file format'.format(codec.file_format))
+
+    _CODECS.pop(codec.name, None)
+    _CODECS[codec.name] = codec
+
+
+def get_available_codecs():
+    """ Returns names of all registered codecs
+
+    :return: A list of codec names
+    :rtype: list(str)
+    """
+    return list(_CODECS)
+
+
+def get_codec(codec):
+    """ Returns a registered codec
+
+    :param codec: A name of a registered codec or a codec instance, which is returned as it is
+    :type codec: str or Codec
+    :return: A codec
+    :rtype: Codec
+    :raises: ValueError
+    """
+    if isinstance(codec, Codec):
+        return codec
+    if codec not in _CODECS:
+        raise ValueError('Codec {} is not available, available codecs are {}'.format(codec, get_available_codecs()))
+    return _CODECS[codec]
+
+
+def get_codec_by_file_format(file_format):
+    """ Returns a codec which is used to load files of a given file format
+
+    :param file_format: A compression file format
+    :type file_format: FileFormat
+    :return: A codec
+    :rtype: Codec
+    :raises: ValueError
+    """
+    for codec in reversed(list(_CODECS.values())):
+        if codec.file_format is file_format:
+            return codec
+    raise ValueError('There is no available codec for file format {}'.format(file_format))
+
+
+def detect_codec(filename):
+    """ Detects a codec of a file from its first bytes
+
+    :param filename: Path to the file
+    :type filename: str
+    :return: A codec or `None` if the file is not compressed with any of the registered codecs
+    :rtype: Codec or None
+    """
+    with open(filename, 'rb') as infile:
+        return detect_stream_codec(infile)
+
+
+def detect_stream_codec(infile):
+    """ Detects a codec of content of a file object from its first bytes
+
+    :param infile: A binary file object positioned at the beginning of content
+    :type infile: file object
+    :return: A codec or `None` if the content is not compressed with any of the registered codecs
+    :rtype: Codec or None
+    """
+    magic_codecs = [codec for codec in reversed(list(_CODECS.values())) if codec.magic]
+    if not magic_codecs:
+        return None
+
+    file_start = infile.read(max(len(codec.magic) for codec in magic_codecs))
+
+    for codec in magic_codecs:
+        if file_start.startswith(codec.magic):
+            return codec
+    return None
+
+
+for _codec in [GzipCodec(), Bz2Codec(), LzmaCodec(), ZlibCodec()]:
+    register_codec(_codec)
+
+if zstandard is not None:
+    register_codec(ZstdCodec())
+
+if lz4 is not None:
+    register_codec(Lz4Codec())
@@ -137,16 +137,43 @@ class FeatureTypeSet:
 
 class FileFormat(Enum):
     """ Enum class for file formats used for saving and loading EOPatches
+
+    - `PICKLE` - a pickled object
+    - `NPY` - a numpy array in a single npy file
+    - `PACKED_BITS` - a binary mask packed into bits, see `eolearn.core.array_storage` module
+    - `GZIP` - a gzipped file, only used in combination with other file formats
+    - `BZ2`, `LZMA`, `ZSTD`, `LZ4` - files compressed with other codecs, only used in combination with other file
+      formats, see `eolearn.core.compression` module
+    - `CHUNKED` - a numpy array stored in a folder of separately compressed chunks together with a JSON header, see
+      `eolearn.core.array_storage` module
+    - `JSON` - a JSON document, used for bounding boxes and meta info
+    - `COLUMNAR` - a vector feature stored in columnar format without pickle, see `eolearn.core.vector_storage` module
     """
     PICKLE = 'pkl'
     NPY = 'npy'
+    PACKED_BITS = 'bits'
     GZIP = 'gz'
+    BZ2 = 'bz2'
+    LZMA = 'xz'
+    ZSTD = 'zst'
+    LZ4 = 'lz4'
+    CHUNKED = 'chunked'
+    JSON = 'json'
+    COLUMNAR = 'columnar'
 
     def extension(self):
         """ Returns file extension of file format
         """
         return '.{}'.format(self.value)
 
+    def is_compression(self):
+        """ Checks if file format is a compression of another file format
+
+        :return: `True` if file format is a compression format and `False` otherwise
+        :rtype: bool
+        """
+        return self in (FileFormat.GZIP, FileFormat.BZ2, FileFormat.LZMA, FileFormat.ZSTD, FileFormat.LZ4)
+
     @staticmethod
     def split_by_extensions(filename):
         """ Splits the filename string by the extension of the file
@@ -182,3 +209,20 @@ class OverwritePermission(Enum):
     ADD_ONLY = 0
     OVERWRITE_FEATURES = 1
     OVERWRITE_PATCH = 2
+
+
+class MemoryStorage(Enum):
+    """ Enum class which specifies how a feature of EOPatch is kept in memory, as reported by
+    `EOPatch.memory_report`.
+
+    - `RESIDENT` - A numpy array which owns its memory or a vector feature.
+    - `VIEW` - A view of another numpy array, which shares memory with it.
+    - `MEMMAP` - A memory-mapped numpy array.
+    - `PACKED` - A binary mask packed into bits.
+    - `NOT_LOADED` - A feature which hasn't been loaded yet by lazy loading.
+    """
+    RESIDENT = 'resident'
+    VIEW = 'view'
+    MEMMAP = 'memmap'
+    PACKED = 'packed'
+    NOT_LOADED = 'not loaded'
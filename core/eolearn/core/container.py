@@ -0,0 +1,144 @@
+"""
+The container module implements a single-file format of saved EOPatches.
+
+A container is an uncompressed zip file which contains the same files as an EOPatch folder, including the manifest.
+The central directory of the zip file serves as an index of the files. Data of each file starts at an offset aligned to
+`CONTAINER_ALIGNMENT` bytes, so that arrays of uncompressed npy files can be memory-mapped directly from the container.
+Features can still be compressed with codecs, in which case their files are stored in the container as they are.
+"""
+
+import os
+import struct
+import shutil
+import zipfile
+import datetime
+import contextlib
+
+CONTAINER_ALIGNMENT = 64
+
+_LOCAL_HEADER_SIZE = 30
+_LOCAL_HEADER_FORMAT = '<4s5H3L2H'
+_PADDING_EXTRA_ID = 0xD935
+_ZIP64_EXTRA_SIZE = 20
+
+
+def is_container(path):
+    """ Checks if the given location is a container file of a saved EOPatch
+
+    :param path: A location on disk
+    :type path: str
+    :rtype: bool
+    """
+    return os.path.isfile(path) and zipfile.is_zipfile(path)
+
+
+def write_container(path, members):
+    """ Writes a container file. The container is first written under a temporary name and then moved in place, so
+    that readers never see a partially written container.
+
+    :param path: Location of the container file
+    :type path: str
+    :param members: An iterable of pairs of member names and functions, which open a binary file object with content of
+        a member, together with the size of the content
+    :type members: iterable((str, (callable, int)))
+    """
+    tmp_path = '{}_tmp_container_{}'.format(path, datetime.datetime.now().timestamp())
+
+    try:
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as container:
+            for name, (open_content, size) in members:
+                with open_content() as infile:
+                    _write_aligned_member(container, name, infile, size)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_aligned_member(container, name, infile, size):
+    """ Writes a member into a container. The local header of the member is padded with an extra field, so that
+    member data starts at an aligned offset.
+    """
+    zip_info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    zip_info.compress_type = zipfile.ZIP_STORED
+    zip_info.file_size = size
+
+    header_size = _LOCAL_HEADER_SIZE + len(name.encode('utf-8')) + 4
+    if size * 1.05 > zipfile.ZIP64_LIMIT:
+        header_size += _ZIP64_EXTRA_SIZE
+    padding = -(container.fp.tell() + header_size) % CONTAINER_ALIGNMENT
+    zip_info.extra = struct.pack('<HH', _PADDING_EXTRA_ID, padding) + b'\0' * padding
+
+    with container.open(zip_info, 'w') as outfile:
+        shutil.copyfileobj(infile, outfile)
+
+
+def read_container_index(path):
+    """ Reads names of container members together with offsets and sizes of their data
+
+    :param path: Location of the container file
+    :type path: str
+    :return: A dictionary mapping member names into pairs of data offset and data size
+    :rtype: dict(str: (int, int))
+    """
+    with zipfile.ZipFile(path) as container, open(path, 'rb') as container_file:
+        return {zip_info.filename: _get_member_location(container_file, zip_info)
+                for zip_info in container.infolist()}
+
+
+def get_member_location(path, name):
+    """ Reads the offset and the size of data of a single container member
+
+    :param path: Location of the container file
+    :type path: str
+    :param name: Name of the member
+    :type name: str
+    :return: A pair of data offset and data size
+    :rtype: (int, int)
+    :raises: FileNotFoundError
+    """
+    with zipfile.ZipFile(path) as container, open(path, 'rb') as container_file:
+        try:
+            zip_info = container.getinfo(name)
+        except KeyError as error:
+            raise FileNotFoundError('Member {} does not exist in container {}'.format(name, path)) from error
+        return _get_member_location(container_file, zip_info)
+
+
+def _get_member_location(container_file, zip_info):
+    """ Calculates the offset of member data from the local header of the member, whose extra field can differ from
+    the one in the central directory
+
+    :raises: ValueError
+    """
+    if zip_info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError('Member {} of container is compressed, only stored members are '
+                         'supported'.format(zip_info.filename))
+
+    container_file.seek(zip_info.header_offset)
+    local_header = struct.unpack(_LOCAL_HEADER_FORMAT, container_file.read(_LOCAL_HEADER_SIZE))
+    name_length, extra_length = local_header[-2:]
+
+    return zip_info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length, zip_info.file_size
+
+
+@contextlib.contextmanager
+def open_container_member(path, name):
+    """ Opens a member of a container for reading
+
+    :param path: Location of the container file
+    :type path: str
+    :param name: Name of the member
+    :type name: str
+    :return: A context manager of a binary file object
+    :raises: FileNotFoundError
+    """
+    with zipfile.ZipFile(path) as container:
+        try:
+            member = container.open(name)
+        except KeyError as error:
+            raise FileNotFoundError('Member {} does not exist in container {}'.format(name, path)) from error
+
+    with member:
+        yield member
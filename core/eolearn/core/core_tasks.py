@@ -4,6 +4,8 @@ A collection of most basic EOTasks
 
 import os.path
 
+import numpy as np
+
 from .eodata import EOPatch
 from .eotask import EOTask
 
@@ -48,6 +50,25 @@ class SaveToDisk(EOTask):
     :param compress_level: A level of data compression and can be specified with an integer from 0 (no compression)
         to 9 (highest compression).
     :type compress_level: int
+    :param codec: A name of a compression codec or a dictionary mapping feature types into codec names. By default
+        `gzip` is used if `compress_level` is set.
+    :type codec: str or dict(FeatureType: str or None) or None
+    :param quantization: A dictionary mapping feature types or features into `Quantization` objects, which specify how
+        floating point features are stored as integers. Works only with `FileFormat.CHUNKED`.
+    :type quantization: dict(FeatureType or (FeatureType, str): Quantization) or None
+    :param workers: Number of threads used to write features concurrently. Default is a single thread.
+    :type workers: int or None
+    :param only_changed: If `True`, only features assigned since the EOPatch was loaded from the same location are
+        saved.
+    :type only_changed: bool
+    :param container: If `True` the EOPatch is saved into a single container file `folder/eopatch_folder` instead of
+        a folder.
+    :type container: bool
+    :param summaries: If `True` summaries of numeric array features (count, NaN count, min, max, mean and fraction of
+        non-zero values of masks, also for each time frame) are written into the manifest.
+    :type summaries: bool
+    :param digests: If `True` digests of content of numpy array features are written into the manifest.
+    :type digests: bool
     """
     def __init__(self, folder, *args, **kwargs):
         self.folder = folder
@@ -79,11 +100,33 @@ class LoadFromDisk(EOTask):
     :type lazy_loading: bool
     :param mmap: If `True`, then memory-map the file. Works only on uncompressed npy files
     :type mmap: bool
+    :param workers: Number of threads used to read features concurrently. Default is a single thread.
+    :type workers: int or None
+    :param time_slice: Selection of time frames which will be loaded
+    :type time_slice: slice or int or list(int) or None
+    :param pixel_window: A pair of slices `(row_slice, col_slice)` selecting a spatial window which will be loaded
+    :type pixel_window: (slice, slice) or None
+    :param bands: Selection of bands of `FeatureType.DATA` features which will be loaded
+    :type bands: list(int) or slice or int or None
+    :param memory_budget: Maximal amount of memory taken by lazily loaded features, e.g. `'4GB'`. Least recently used
+        features over the budget are unloaded and reloaded on the next access.
+    :type memory_budget: int or str or None
+    :param frame_filter: A function which receives a description of the saved EOPatch (see `EOPatch.describe`) and
+        returns a selection of time frames which will be loaded, in any form supported by parameter `time_slice` or
+        as a list of booleans, one for each time frame, or `None` to load all time frames. Descriptions of features
+        include summaries written by `EOPatch.save` with `summaries=True`, therefore frames can be filtered e.g. by
+        cloud coverage without loading any mask. Common conditions are implemented in `eolearn.core.frame_predicates`
+        module. It cannot be used together with `time_slice`.
+    :type frame_filter: callable or None
     """
-    def __init__(self, folder, *args, **kwargs):
+    def __init__(self, folder, *args, frame_filter=None, **kwargs):
+        if frame_filter is not None and kwargs.get('time_slice') is not None:
+            raise ValueError('Parameters frame_filter and time_slice cannot be used together')
+
         self.folder = folder
         self.args = args
         self.kwargs = kwargs
+        self.frame_filter = frame_filter
 
     def execute(self, *, eopatch_folder):
         """Loads the EOPatch from disk: `folder/eopatch_folder`.
@@ -93,7 +136,16 @@ class LoadFromDisk(EOTask):
         :return: EOPatch loaded from disk
         :rtype: EOPatch
         """
-        eopatch = EOPatch.load(os.path.join(self.folder, eopatch_folder), *self.args, **self.kwargs)
+        path = os.path.join(self.folder, eopatch_folder)
+
+        kwargs = self.kwargs
+        if self.frame_filter is not None:
+            time_slice = self.frame_filter(EOPatch.describe(path))
+            if isinstance(time_slice, (list, np.ndarray)) and np.asarray(time_slice).dtype == bool:
+                time_slice = np.flatnonzero(time_slice).tolist()
+            kwargs = dict(kwargs, time_slice=time_slice)
+
+        eopatch = EOPatch.load(path, *self.args, **kwargs)
         return eopatch
 
 
@@ -0,0 +1,91 @@
+"""
+The dtype_policy module contains a policy of dtypes in which numpy array features of EOPatch are kept in memory.
+
+A policy is applied whenever a numpy array feature is assigned to or loaded into an EOPatch with that policy. Arrays
+are only ever downcast, therefore a policy can be used to cap memory consumption of tasks which produce `float64`
+outputs.
+"""
+
+import numpy as np
+
+_INTEGER_DTYPES = [np.dtype(dtype) for dtype in [np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32,
+                                                 np.uint64, np.int64]]
+
+
+class DtypePolicy:
+    """ A policy which defines dtypes of numpy array features
+
+    :param float_dtype: Floating point arrays with a larger dtype are cast to this dtype, e.g. `numpy.float32`. Values
+        outside of its range become infinite. By default floating point arrays are not cast.
+    :type float_dtype: numpy.dtype or type or str or None
+    :param downcast_discrete: If `True`, integer arrays of discrete feature types are cast to the smallest integer
+        dtype which can hold all of their values
+    :type downcast_discrete: bool
+    """
+    def __init__(self, float_dtype=None, downcast_discrete=False):
+        self.float_dtype = None if float_dtype is None else np.dtype(float_dtype)
+        self.downcast_discrete = downcast_discrete
+
+        if self.float_dtype is not None and not np.issubdtype(self.float_dtype, np.floating):
+            raise ValueError('Parameter float_dtype should be a floating point dtype, got {}'.format(float_dtype))
+
+    def __repr__(self):
+        return '{}(float_dtype={}, downcast_discrete={})'.format(self.__class__.__name__, self.float_dtype,
+                                                                 self.downcast_discrete)
+
+    def get_dtype(self, feature_type, array):
+        """ Returns a dtype in which an array of a feature should be kept
+
+        :param feature_type: Type of the feature
+        :type feature_type: FeatureType
+        :param array: An array of the feature
+        :type array: numpy.ndarray
+        :return: A dtype, which is the dtype of the array if the array should not be cast
+        :rtype: numpy.dtype
+        """
+        dtype = array.dtype
+
+        if self.float_dtype is not None and np.issubdtype(dtype, np.floating) and \
+                dtype.itemsize > self.float_dtype.itemsize:
+            return self.float_dtype
+
+        if self.downcast_discrete and feature_type.is_discrete() and np.issubdtype(dtype, np.integer) and array.size:
+            return get_smallest_integer_dtype(array.min(), array.max(), dtype)
+
+        return dtype
+
+    def apply(self, feature_type, array):
+        """ Casts an array of a feature according to the policy
+
+        :param feature_type: Type of the feature
+        :type feature_type: FeatureType
+        :param array: An array of the feature
+        :type array: numpy.ndarray
+        :return: The given array if it does not have to be cast, otherwise a new array
+        :rtype: numpy.ndarray
+        """
+        dtype = self.get_dtype(feature_type, array)
+        return array if dtype == array.dtype else array.astype(dtype)
+
+
+def get_smallest_integer_dtype(min_value, max_value, default_dtype=np.int64):
+    """ Finds the smallest integer dtype which can hold all values in the given range. Unsigned dtypes are preferred
+    over signed dtypes of the same size.
+
+    :param min_value: The smallest value
+    :type min_value: int
+    :param max_value: The largest value
+    :type max_value: int
+    :param default_dtype: A dtype returned if none of the smaller dtypes can hold the values
+    :type default_dtype: numpy.dtype or type
+    :return: An integer dtype
+    :rtype: numpy.dtype
+    """
+    default_dtype = np.dtype(default_dtype)
+    for dtype in _INTEGER_DTYPES:
+        if dtype.itemsize >= default_dtype.itemsize:
+            break
+        dtype_info = np.iinfo(dtype)
+        if dtype_info.min <= min_value and max_value <= dtype_info.max:
+            return dtype
+    return default_dtype
@@ -2,39 +2,60 @@
 The eodata module provides core objects for handling remotely sensing multi-temporal data (such as satellite imagery).
 """
 
+import io
 import os
 import sys
+import json
 import logging
 import pickle
-import gzip
 import shutil
 import warnings
 import copy
 import datetime
+import contextlib
 import pickletools
+import functools
+import collections
+import mmap as mmap_module
 
 import attr
-import dateutil.parser
 import numpy as np
+import pandas as pd
 import geopandas as gpd
 
 import sentinelhub
 
-from .constants import FeatureType, FileFormat, OverwritePermission
-from .utilities import deep_eq, FeatureParser
+from .array_storage import save_chunked_array, append_chunked_array, commit_chunked_append, discard_chunked_append, \
+    load_chunked_array, load_chunked_header, load_npy_array, read_compressed_npy_array, read_npy_header, apply_window, \
+    normalize_window, save_packed_bits_array, load_packed_bits_array, is_binary_array, PackedMask, \
+    CHUNK_HEADER_FILENAME, DEFAULT_TILE_SIZE
+from .blob_store import BlobStore
+from .compression import get_codec, get_codec_by_file_format, detect_codec, detect_stream_codec
+from .container import is_container, write_container, read_container_index, get_member_location, \
+    open_container_member
+from .constants import FeatureType, FileFormat, OverwritePermission, MemoryStorage
+from .time_index import TimeIndex, parse_timestamps
+from .vector_storage import can_save_dataframe, save_dataframe, load_dataframe
+from .utilities import deep_eq, FeatureParser, map_concurrently, get_array_digest, set_array_digest, \
+    summarize_array, combine_frame_summaries
 
 # pylint: disable=too-many-lines
 LOGGER = logging.getLogger(__name__)
 
 MAX_DATA_REPR_LEN = 100
 
+MANIFEST_FILENAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+TILE_INFO_KEY = 'tile_info'
+
 
 if sentinelhub.__version__ >= '2.5.0':
     sys.modules['sentinelhub.common'] = sentinelhub.geometry
 
 
 @attr.s(repr=False, cmp=False, kw_only=True)
-class EOPatch:
+class EOPatch:  # pylint: disable=too-many-public-methods,too-many-instance-attributes
     """The basic data object for multi-temporal remotely sensed data, such as satellite imagery and its derivatives.
 
     The EOPatch contains multi-temporal remotely sensed data of a single patch of earth's surface defined by the
@@ -52,7 +73,17 @@ class EOPatch:
 
     Currently the EOPatch object doesn't enforce that the length of timestamp be equal to n_times dimensions of numpy
     arrays in other attributes.
+
+    EOPatch keeps track of features which were assigned since it was loaded or last saved. Features modified in place,
+    e.g. by changing values of a numpy array, are not tracked and have to be assigned again.
+
+    If EOPatch has a dtype policy, numpy array features are cast according to the policy when they are assigned or
+    loaded.
     """
+    _origin_path = attr.ib(default=None, init=False)
+    _changed_feature_types = attr.ib(factory=set, init=False)
+    dtype_policy = attr.ib(default=None)
+
     data = attr.ib(factory=dict)
     mask = attr.ib(factory=dict)
     scalar = attr.ib(factory=dict)
@@ -67,26 +98,42 @@ class EOPatch:
     bbox = attr.ib(default=None)
     timestamp = attr.ib(factory=list)
 
-    def __setattr__(self, key, value):
+    def __setattr__(self, key, value, track_changes=True):
         """Raises TypeError if feature type attributes are not of correct type.
 
-        In case they are a dictionary they are cast to _FeatureDict class
+        In case they are a dictionary they are cast to _FeatureDict class. Assigned features are marked as changed.
+        A new dtype policy is applied to all features which are already loaded.
         """
+        if key == 'dtype_policy':
+            super().__setattr__(key, value)
+            for feature_type in FeatureType:
+                feature_dict = self.__dict__.get(feature_type.value)
+                if isinstance(feature_dict, _FeatureDict):
+                    feature_dict.set_dtype_policy(value)
+            return
+
         if FeatureType.has_value(key) and not isinstance(value, _FileLoader):
             feature_type = FeatureType(key)
-            value = self._parse_feature_type_value(feature_type, value)
+            value = self._parse_feature_type_value(feature_type, value, getattr(self, 'dtype_policy', None))
+
+            if isinstance(value, _FeatureDict):
+                value.changed_features = set(value) if track_changes else set()
+            elif track_changes:
+                self._changed_feature_types.add(feature_type)
 
         super().__setattr__(key, value)
 
     @staticmethod
-    def _parse_feature_type_value(feature_type, value):
+    def _parse_feature_type_value(feature_type, value, dtype_policy=None):
         """ Checks or parses value which will be assigned to a feature type attribute of `EOPatch`. If the value
         cannot be parsed correctly it raises an error.
 
         :raises: TypeError, ValueError
         """
         if feature_type.has_dict() and isinstance(value, dict):
-            return value if isinstance(value, _FeatureDict) else _FeatureDict(value, feature_type)
+            if isinstance(value, _FeatureDict) and getattr(value, 'dtype_policy', None) is dtype_policy:
+                return value
+            return _FeatureDict(value, feature_type, dtype_policy=dtype_policy)
 
         if feature_type is FeatureType.BBOX:
             if value is None or isinstance(value, sentinelhub.BBox):
@@ -95,9 +142,9 @@ class EOPatch:
                 return sentinelhub.BBox(value[:4], crs=value[4])
 
         if feature_type is FeatureType.TIMESTAMP:
-            if isinstance(value, (tuple, list)):
-                return [timestamp if isinstance(timestamp, datetime.date) else dateutil.parser.parse(timestamp)
-                        for timestamp in value]
+            if isinstance(value, (tuple, list, TimeIndex)) or \
+                    (isinstance(value, np.ndarray) and np.issubdtype(value.dtype, np.datetime64)):
+                return parse_timestamps(value)
 
         raise TypeError('Attribute {} requires value of type {} - '
                         'failed to parse given value'.format(feature_type, feature_type.type()))
@@ -109,7 +156,7 @@ class EOPatch:
 
         if isinstance(value, _FileLoader) and load:
             value = value.load()
-            setattr(self, key, value)
+            self.__setattr__(key, value, track_changes=False)
             return getattr(self, key)
 
         return value
@@ -210,7 +257,7 @@ class EOPatch:
         if not features:  # For some reason deepcopy and copy pass {} by default
             features = ...
 
-        new_eopatch = EOPatch()
+        new_eopatch = EOPatch(dtype_policy=self.dtype_policy)
         for feature_type, feature_name in FeatureParser(features)(self):
             if feature_name is ...:
                 new_eopatch[feature_type] = copy.copy(self[feature_type])
@@ -389,6 +436,117 @@ class EOPatch:
                 feature_list.append(feature_type)
         return feature_list
 
+    @property
+    def nbytes(self):
+        """Number of bytes of numpy array and vector features which are held in memory. Memory-mapped features and
+        features which haven't been loaded yet by lazy loading are not counted. Views of other arrays are counted in
+        full.
+
+        :return: Number of bytes
+        :rtype: int
+        """
+        return sum(nbytes for _, _, _, _, nbytes, storage in self._iter_feature_memory()
+                   if storage not in (MemoryStorage.MEMMAP, MemoryStorage.NOT_LOADED))
+
+    def memory_report(self):
+        """Returns sizes of numpy array and vector features in memory, without loading any feature.
+
+        Column `storage` tells how a feature is kept in memory: `'resident'` for arrays which own their memory and
+        for vector features, `'view'` for views of other arrays, `'memmap'` for memory-mapped arrays, `'packed'` for
+        packed masks and `'not loaded'` for features which haven't been loaded yet by lazy loading. Sizes of vector
+        features are estimated by `pandas.DataFrame.memory_usage`.
+
+        :return: A table with a row for each feature and columns `feature_type`, `feature_name`, `shape`, `dtype`,
+            `nbytes` and `storage`, sorted by size in descending order
+        :rtype: pandas.DataFrame
+        """
+        columns = ['feature_type', 'feature_name', 'shape', 'dtype', 'nbytes', 'storage']
+        report = pd.DataFrame(list(self._iter_feature_memory()), columns=columns)
+        report['storage'] = [storage.value for storage in report['storage']]
+        return report.sort_values('nbytes', ascending=False, kind='mergesort').reset_index(drop=True)
+
+    def _iter_feature_memory(self):
+        """ Yields tuples `(feature_type, feature_name, shape, dtype, nbytes, storage)` of numpy array and vector
+        features without loading them
+        """
+        for feature_type in FeatureType:
+            if not feature_type.has_dict() or feature_type.is_meta():
+                continue
+
+            feature_dict = self.__getattribute__(feature_type.value, load=False)
+            if isinstance(feature_dict, _FileLoader):
+                yield feature_type, None, None, None, 0, MemoryStorage.NOT_LOADED
+                continue
+
+            for feature_name, value in dict.items(feature_dict):
+                if isinstance(value, _FileLoader):
+                    yield feature_type, feature_name, None, None, 0, MemoryStorage.NOT_LOADED
+                elif isinstance(value, pd.DataFrame):
+                    yield feature_type, feature_name, value.shape, None, int(value.memory_usage(deep=True).sum()), \
+                        MemoryStorage.RESIDENT
+                else:
+                    yield feature_type, feature_name, value.shape, value.dtype, value.nbytes, \
+                        _get_memory_storage(value)
+
+    def get_changed_features(self):
+        """Returns a list of features which were assigned since EOPatch was loaded or last saved. Features which
+        haven't been loaded yet by lazy loading are never considered as changed.
+
+        The elements are either only FeatureType or a pair of FeatureType and feature name.
+
+        :return: list of changed features
+        :rtype: list(FeatureType or (FeatureType, str))
+        """
+        feature_list = []
+        for feature_type in FeatureType:
+            value = self.__getattribute__(feature_type.value, load=False)
+            if feature_type.has_dict():
+                if isinstance(value, _FeatureDict):
+                    feature_list.extend((feature_type, feature_name) for feature_name in value
+                                        if self._is_feature_changed(feature_type, feature_name))
+            elif self._is_feature_changed(feature_type) and value and not isinstance(value, _FileLoader):
+                feature_list.append(feature_type)
+        return feature_list
+
+    def _is_feature_changed(self, feature_type, feature_name=None):
+        """Checks if a feature was assigned since EOPatch was loaded or last saved. Meta features are saved together,
+        therefore a meta feature is considered as changed if any feature of the same type was changed.
+        """
+        if not feature_type.has_dict():
+            return feature_type in self._changed_feature_types
+
+        feature_dict = self.__getattribute__(feature_type.value, load=False)
+        if not isinstance(feature_dict, _FeatureDict):
+            return False
+
+        changed_features = getattr(feature_dict, 'changed_features', None)
+        if changed_features is None:  # Because of serialization/deserialization during multiprocessing
+            return True
+        return bool(changed_features) if feature_type.is_meta() else feature_name in changed_features
+
+    def _reset_changes(self, path, saved_features=None):
+        """Marks given features, or all features if none are given, as unchanged and remembers the location of
+        EOPatch on disk
+        """
+        self._origin_path = os.path.abspath(path)
+
+        for feature_type in FeatureType:
+            if saved_features is not None and feature_type not in saved_features:
+                continue
+
+            if feature_type.has_dict():
+                feature_dict = self.__getattribute__(feature_type.value, load=False)
+                if not isinstance(feature_dict, _FeatureDict):
+                    continue
+
+                if saved_features is None or feature_type.is_meta():
+                    feature_dict.changed_features = set()
+                else:
+                    feature_dict.changed_features = set(getattr(feature_dict, 'changed_features', feature_dict)) - \
+                        saved_features[feature_type]
+            else:
+                self._changed_feature_types.discard(feature_type)
+
     @staticmethod
     def concatenate(eopatch1, eopatch2):
         """Joins all data from two EOPatches and returns a new EOPatch.
@@ -440,6 +598,171 @@ class EOPatch:
 
         return EOPatch(**eopatch_content)
 
+    @staticmethod
+    def concatenate_many(eopatches):
+        """Joins all data from multiple EOPatches and returns a new EOPatch.
+
+        Time-dependent numpy array features with the same name are joined along time. Their joined arrays are
+        allocated only once and filled with frames of each EOPatch, instead of being concatenated pairwise. If
+        EOPatches have timestamps, the joined timestamps are sorted and frames with the same timestamp are kept only
+        from the first EOPatch which contains them. In that case each time-dependent numpy array feature has to exist
+        in all EOPatches. If EOPatches have no timestamps, frames are joined in the given order. All other features
+        with the same name have to have equal values.
+
+        :param eopatches: A collection of EOPatches
+        :type eopatches: list(EOPatch)
+        :return: Joined EOPatch
+        :rtype: EOPatch
+        :raises: ValueError
+        """
+        eopatches = list(eopatches)
+        if not eopatches:
+            raise ValueError('At least one EOPatch has to be given')
+
+        timestamps_exist = [bool(eopatch.timestamp) for eopatch in eopatches]
+        if any(timestamps_exist) and not all(timestamps_exist):
+            raise ValueError('Either all or none of the EOPatches should have timestamps')
+
+        timestamp, frame_selections = EOPatch._get_frame_selections(eopatches) if all(timestamps_exist) else \
+            ([], None)
+
+        eopatch_content = {FeatureType.TIMESTAMP.value: timestamp}
+        joined_arrays = {}
+
+        for feature_type in FeatureType:
+            if feature_type.has_dict():
+                eopatch_content[feature_type.value] = {}
+                feature_names = list(collections.OrderedDict.fromkeys(
+                    feature_name for eopatch in eopatches for feature_name in eopatch[feature_type]))
+
+                for feature_name in feature_names:
+                    if feature_type.is_time_dependent() and feature_type.contains_ndarrays():
+                        joined_arrays[feature_type, feature_name] = EOPatch._get_joined_array_parts(
+                            eopatches, feature_type, feature_name, frame_selections, len(timestamp))
+                    elif feature_type.is_time_dependent():
+                        eopatch_content[feature_type.value][feature_name] = \
+                            EOPatch._concatenate_dataframes(eopatches, feature_name, frame_selections)
+                    else:
+                        eopatch_content[feature_type.value][feature_name] = \
+                            EOPatch._get_joined_value(eopatches, feature_type, feature_name)
+
+            elif feature_type is not FeatureType.TIMESTAMP:
+                eopatch_content[feature_type.value] = EOPatch._get_joined_value(eopatches, feature_type)
+
+        for (feature_type, feature_name), (arrays, selections, frame_count) in joined_arrays.items():
+            result = np.empty((frame_count,) + arrays[0].shape[1:], dtype=np.result_type(*arrays))
+            for array, (source_selection, target_selection) in zip(arrays, selections):
+                result[target_selection] = array[source_selection]
+            eopatch_content[feature_type.value][feature_name] = result
+
+        return EOPatch(**eopatch_content)
+
+    @staticmethod
+    def _get_frame_selections(eopatches):
+        """ Merges timestamps of EOPatches into a sorted list without duplicates and for each EOPatch decides which of
+        its time frames are kept and where they are placed in the joined EOPatch
+
+        :return: Joined timestamps and for each EOPatch a pair of selections of kept frames and their joined positions
+        :rtype: (list(datetime.datetime), list((slice or list(int), slice or list(int))))
+        """
+        timestamps = [timestamp for eopatch in eopatches for timestamp in eopatch.timestamp]
+        eopatch_indices = np.repeat(np.arange(len(eopatches)), [len(eopatch.timestamp) for eopatch in eopatches])
+        frame_indices = np.concatenate([np.arange(len(eopatch.timestamp)) for eopatch in eopatches])
+
+        time_index = TimeIndex(timestamps)
+        sort_order = time_index.sort_order
+        sorted_values = time_index.values[sort_order]
+
+        is_first = np.ones(len(sort_order), dtype=bool)
+        is_first[1:] = sorted_values[1:] != sorted_values[:-1]
+        kept_order = sort_order[is_first]
+        target_indices = np.arange(len(kept_order))
+
+        selections = []
+        for eopatch_idx in range(len(eopatches)):
+            is_selected = eopatch_indices[kept_order] == eopatch_idx
+            selections.append((_get_index_selection(frame_indices[kept_order[is_selected]].tolist()),
+                               _get_index_selection(target_indices[is_selected].tolist())))
+
+        return [timestamps[idx] for idx in kept_order], selections
+
+    @staticmethod
+    def _get_joined_array_parts(eopatches, feature_type, feature_name, frame_selections, frame_count):
+        """ Checks that arrays of a time-dependent feature can be joined and collects the arrays together with
+        selections of their frames and positions in the joined array. If frames are not selected by timestamps, they
+        are joined in the given order and the number of joined frames is calculated.
+
+        :raises: ValueError
+        """
+        arrays, selections = [], []
+        if frame_selections is None:
+            frame_count = 0
+
+        for eopatch_idx, eopatch in enumerate(eopatches):
+            if feature_name not in eopatch[feature_type]:
+                if frame_selections is not None:
+                    raise ValueError('Could not join ({}, {}) feature because it is missing in some '
+                                     'EOPatches'.format(feature_type, feature_name))
+                continue
+
+            array = eopatch[feature_type][feature_name]
+            if arrays and array.shape[1:] != arrays[0].shape[1:]:
+                raise ValueError('Could not join ({}, {}) feature because non-temporal dimensions do not '
+                                 'match'.format(feature_type, feature_name))
+
+            if frame_selections is None:
+                selections.append((slice(None), slice(frame_count, frame_count + array.shape[0])))
+                frame_count += array.shape[0]
+            else:
+                if array.shape[0] != len(eopatch.timestamp):
+                    raise ValueError('Could not join ({}, {}) feature because its number of time frames does not '
+                                     'match the number of timestamps'.format(feature_type, feature_name))
+                selections.append(frame_selections[eopatch_idx])
+
+            arrays.append(array)
+
+        return arrays, selections, frame_count
+
+    @staticmethod
+    def _concatenate_dataframes(eopatches, feature_name, frame_selections):
+        """ Joins time-dependent vector features. If EOPatches have timestamps, only rows with timestamps of kept
+        frames are joined and the result is sorted by timestamps.
+        """
+        dataframes = []
+        for eopatch_idx, eopatch in enumerate(eopatches):
+            if feature_name not in eopatch.vector:
+                continue
+
+            dataframe = eopatch.vector[feature_name]
+            if frame_selections is not None:
+                kept_timestamps = set(np.array(eopatch.timestamp, dtype=object)[frame_selections[eopatch_idx][0]])
+                dataframe = dataframe[dataframe[FeatureType.TIMESTAMP.value.upper()].isin(kept_timestamps)]
+            dataframes.append(dataframe)
+
+        joined_dataframe = gpd.GeoDataFrame(pd.concat(dataframes, ignore_index=True), crs=dataframes[0].crs)
+        if frame_selections is not None:
+            joined_dataframe = joined_dataframe.sort_values(FeatureType.TIMESTAMP.value.upper(), kind='mergesort')
+            joined_dataframe.reset_index(drop=True, inplace=True)
+        return joined_dataframe
+
+    @staticmethod
+    def _get_joined_value(eopatches, feature_type, feature_name=None):
+        """ Checks that all EOPatches have the same value of a feature which is not joined along time and returns it
+
+        :raises: ValueError
+        """
+        values = [eopatch[feature_type] for eopatch in eopatches] if feature_name is None else \
+            [eopatch[feature_type][feature_name] for eopatch in eopatches if feature_name in eopatch[feature_type]]
+        values = [value for value in values if value is not None]
+
+        if not values:
+            return None
+        for value in values[1:]:
+            if not deep_eq(values[0], value):
+                feature = feature_type if feature_name is None else (feature_type, feature_name)
+                raise ValueError('Could not merge {} feature because values differ'.format(feature))
+        return copy.copy(values[0])
+
     @staticmethod
     def concatenate_data(data1, data2):
         """A method that concatenates two numpy array along first axis.
@@ -456,37 +779,109 @@ class EOPatch:
         return np.concatenate((data1, data2), axis=0)
 
     def save(self, path, features=..., file_format=FileFormat.NPY,
-             overwrite_permission=OverwritePermission.ADD_ONLY, compress_level=0):
+             overwrite_permission=OverwritePermission.ADD_ONLY, compress_level=0, codec=None, quantization=None,
+             pack_masks=False, workers=1, only_changed=False, blob_store=None, container=False, summaries=False,
+             digests=False):
         """Saves EOPatch to disk.
 
+        Besides features a manifest file is written into the EOPatch folder. It lists all saved features together with
+        their file names, shapes, dtypes, file sizes and optionally digests of numpy array content. Loading and checks
+        for overwriting use the manifest instead of scanning the EOPatch folder. The manifest also records modification
+        times of feature type folders and files in the EOPatch folder and it is used only while they don't change.
+        Features which are added, removed or replaced by other means, e.g. by an older version of eo-learn, are
+        therefore never missed, the EOPatch folder is scanned instead.
+
+        If `container` is set, EOPatch is saved into a single file instead of a folder, see `eolearn.core.container`
+        module. `EOPatch.load` recognizes a container file by itself and supports all of its parameters, where
+        uncompressed npy features are memory-mapped directly from the container. Saving into an existing container
+        rewrites the entire container file.
+
         :param path: Location on the disk
         :type path: str
         :param features: A collection of features types specifying features of which type will be saved. By default
         all features will be saved.
         :type features: list(FeatureType) or list((FeatureType, str)) or ...
-        :param file_format: File format
+        :param file_format: File format. In case of `FileFormat.CHUNKED` each numpy array feature is saved into a
+            folder of chunks, where each chunk contains a single time frame and a spatial tile of at most
+            `DEFAULT_TILE_SIZE` x `DEFAULT_TILE_SIZE` pixels, and is compressed on its own.
         :type file_format: FileFormat or str
         :param overwrite_permission: A level of permission for overwriting an existing EOPatch
         :type overwrite_permission: OverwritePermission or int
         :param compress_level: A level of data compression and can be specified with an integer from 0 (no compression)
-            to 9 (highest compression).
+            to 9 (highest compression). If a codec is given, 0 means the default level of the codec.
         :type compress_level: int
+        :param codec: A name of a compression codec, see `eolearn.core.compression.get_available_codecs`, or a
+            dictionary mapping feature types into codec names, in which case features of each type are compressed
+            with their own codec (`None` meaning no compression). By default `gzip` is used if `compress_level` is
+            set, or `zlib` in case of `FileFormat.CHUNKED`. Files get an extension of the codec, while chunks of
+            chunked format are decompressed according to the codec written in their header. Features which are not
+            numpy arrays are always saved into files, therefore codecs which can only compress chunks (e.g. `zlib`)
+            are replaced by `gzip` for them.
+        :type codec: str or dict(FeatureType: str or None) or None
+        :param quantization: A dictionary mapping feature types or features `(feature_type, feature_name)` into
+            `Quantization` objects. Floating point features are then stored quantized into integers together with
+            scale, offset and nodata value, and are dequantized into their original dtype when loaded. NaN values
+            are preserved. Quantization is supported only with `FileFormat.CHUNKED`.
+        :type quantization: dict(FeatureType or (FeatureType, str): Quantization) or None
+        :param pack_masks: If `True`, features of types `FeatureType.MASK` and `FeatureType.MASK_TIMELESS` which are
+            boolean or contain only values 0 and 1 are saved in `FileFormat.PACKED_BITS` format, using a single bit
+            per value. Masks which are instances of `PackedMask` are always saved in this format.
+        :type pack_masks: bool
+        :param workers: Number of threads used to write features concurrently. Default is a single thread. If set to
+            `None` the number of threads will be chosen by `concurrent.futures.ThreadPoolExecutor`. All features are
+            still written into a temporary folder first and moved to the final location only once all of them are
+            written. If writing of multiple features fails, the error of the first failed feature (in the order of
+            saving) is raised. In case of `FileFormat.CHUNKED` the same number of threads is used to compress chunks
+            of each feature.
+        :type workers: int or None
+        :param only_changed: If `True`, only features which were assigned since EOPatch was loaded from or last saved
+            to the given location are saved, while files of other features are left untouched. Features modified in
+            place, without being assigned again, are not detected as changed.
+        :type only_changed: bool
+        :param blob_store: A content-addressed store shared by EOPatches of a dataset, or a location of its folder.
+            If given, each saved file is replaced with a hard link to a blob in the store, so that files identical
+            across EOPatches are stored only once. Digests of saved files are written into the manifest. The store has
+            to be on the same filesystem as the EOPatch.
+        :type blob_store: BlobStore or str or None
+        :param container: If `True` EOPatch is saved into a single container file at the given path. File format
+            `FileFormat.CHUNKED` and a blob store cannot be used with a container.
+        :type container: bool
+        :param summaries: If `True` a summary of each saved numeric array feature is written into the manifest. It
+            contains the number of values, the number of NaN values, minimum, maximum and mean, and for masks also the
+            fraction of non-zero values, see `eolearn.core.utilities.summarize_array`. Time-dependent features are
+            also summarized for each time frame. Summaries are available in `EOPatch.describe` without loading
+            features.
+        :type summaries: bool
+        :param digests: If `True` a digest of the content of each saved numpy array feature is computed and written
+            into the manifest. Arrays loaded with `mmap=True` then carry these digests and are compared with each other
+            without reading their values, see `eolearn.core.utilities.deep_eq`. Computing digests takes an additional
+            pass over the data, therefore without this parameter only digests which are already known, e.g. of arrays
+            loaded from an EOPatch saved with digests, are written.
+        :type digests: bool
+        :raises: ValueError
         """
-        if os.path.isfile(path):
-            raise NotADirectoryError("A file exists at the given path, expected a directory")
-
         file_format = FileFormat(file_format)
-        if file_format is FileFormat.GZIP:
-            raise ValueError('file_format cannot be {}, compression is specified with compression_level '
-                             'parameter'.format(FileFormat.GZIP))
+        if file_format.is_compression():
+            raise ValueError('file_format cannot be {}, compression is specified with compression_level and codec '
+                             'parameters'.format(file_format))
+
+        _check_save_location(path, file_format, blob_store, container)
 
         overwrite_permission = OverwritePermission(overwrite_permission)
+        if isinstance(blob_store, str):
+            blob_store = BlobStore(blob_store)
+
+        if only_changed and (overwrite_permission is OverwritePermission.OVERWRITE_PATCH or
+                             not self._is_origin_path(path)):
+            raise ValueError('Parameter only_changed can only be used for saving EOPatch into the location it was '
+                             'loaded from, without permission {}'.format(OverwritePermission.OVERWRITE_PATCH))
 
         tmp_path = '{}_tmp_{}'.format(path, datetime.datetime.now().timestamp())
         if os.path.exists(tmp_path):  # Basically impossible case
             raise OSError('Path {} already exists, try again'.format(tmp_path))
 
-        save_file_list = self._get_save_file_list(path, tmp_path, features, file_format, compress_level)
+        save_file_list = self._get_save_file_list(path, tmp_path, features, file_format, compress_level, codec,
+                                                  quantization, pack_masks, only_changed, summaries, digests)
 
         self._check_forbidden_characters(save_file_list)
 
@@ -499,47 +894,123 @@ class EOPatch:
             self._check_feature_uniqueness(save_file_list, existing_content)
 
         try:
-            for file_saver in save_file_list:
-                file_saver.save(self)
+            map_concurrently(lambda file_saver: file_saver.save(self, workers=workers, blob_store=blob_store),
+                             save_file_list, workers)
 
-            if os.path.exists(path):
-                if overwrite_permission is OverwritePermission.OVERWRITE_PATCH:
-                    shutil.rmtree(path)
-                    os.renames(tmp_path, path)
-                else:
-                    for file_saver in save_file_list:
-                        existing_features = existing_content.get(file_saver.feature_type.value, {})
-                        if file_saver.feature_name is None and isinstance(existing_features, _FileLoader):
-                            os.remove(existing_features.get_file_path())
-                        elif isinstance(existing_features, dict) and file_saver.feature_name in existing_features:
-                            os.remove(existing_features[file_saver.feature_name].get_file_path())
-                        os.renames(file_saver.tmp_filename, file_saver.final_filename)
-                    if os.path.exists(tmp_path):
-                        shutil.rmtree(tmp_path)
-            else:
-                os.renames(tmp_path, path)
+            manifest_entries = _get_manifest_entries(path, save_file_list, existing_content)
+
+            _finalize_saved_files(path, tmp_path, save_file_list, existing_content, manifest_entries,
+                                  overwrite_permission, container)
 
         except BaseException as ex:
             if os.path.exists(tmp_path):
                 shutil.rmtree(tmp_path)
             raise ex
 
-    def _get_save_file_list(self, path, tmp_path, features, file_format, compress_level):
+        self._track_saved_features(path, save_file_list, overwrite_permission)
+
+    def _is_origin_path(self, path):
+        """Checks if EOPatch was loaded from or last saved to the given location. This is also true if EOPatch has
+        never been loaded or saved.
+        """
+        return self._origin_path is None or self._origin_path == os.path.abspath(path)
+
+    def _track_saved_features(self, path, save_file_list, overwrite_permission):
+        """Marks saved features as unchanged, if they were saved into the location EOPatch originates from. If the
+        entire EOPatch folder was overwritten, all features which were not saved are marked as changed.
+        """
+        if not self._is_origin_path(path):
+            return
+
+        if overwrite_permission is OverwritePermission.OVERWRITE_PATCH:
+            self._mark_all_changed()
+
+        saved_features = collections.defaultdict(set)
+        for file_saver in save_file_list:
+            saved_features[file_saver.feature_type].add(file_saver.feature_name)
+        self._reset_changes(path, saved_features)
+
+    def _mark_all_changed(self):
+        """Marks all loaded features as changed
+        """
+        for feature_type in FeatureType:
+            value = self.__getattribute__(feature_type.value, load=False)
+            if isinstance(value, _FeatureDict):
+                value.changed_features = set(value)
+            elif not feature_type.has_dict():
+                self._changed_feature_types.add(feature_type)
+
+    def _get_save_file_list(self, path, tmp_path, features, file_format, compress_level, codec, quantization,
+                            pack_masks, only_changed=False, summaries=False, digests=False):
         """ Creates a list of _FileSaver classes for each feature which will have to be saved
         """
+        if isinstance(codec, dict):
+            codec = {FeatureType(feature_type): feature_codec for feature_type, feature_codec in codec.items()}
+
+        quantization = {(FeatureType(feature[0]), feature[1]) if isinstance(feature, (tuple, list)) else
+                        FeatureType(feature): feature_quantization
+                        for feature, feature_quantization in (quantization or {}).items()}
+
         save_file_list = []
         saved_feature_types = set()
         for feature_type, feature_name in FeatureParser(features)(self):
+            if only_changed and not self._is_feature_changed(feature_type, feature_name):
+                continue
             if not self[feature_type]:
                 continue
             if not feature_type.is_meta() or feature_type not in saved_feature_types:
+                feature_file_format = file_format if feature_type.contains_ndarrays() else FileFormat.PICKLE
+                if feature_type is FeatureType.TIMESTAMP and _can_save_as_datetime64(self.timestamp):
+                    feature_file_format = FileFormat.NPY
+                if feature_type is FeatureType.BBOX or \
+                        (feature_type is FeatureType.META_INFO and _can_save_as_json(self.meta_info)):
+                    feature_file_format = FileFormat.JSON
+                if feature_type.is_vector() and can_save_dataframe(self[feature_type][feature_name]):
+                    feature_file_format = FileFormat.COLUMNAR
+                if self._is_packed_mask(feature_type, feature_name, pack_masks):
+                    feature_file_format = FileFormat.PACKED_BITS
+
+                feature_quantization = quantization.get((feature_type, feature_name), quantization.get(feature_type))
+                if feature_quantization is not None and feature_file_format is not FileFormat.CHUNKED:
+                    raise ValueError('Feature ({}, {}) can be quantized only if it is saved in file format '
+                                     '{}'.format(feature_type, feature_name, FileFormat.CHUNKED))
+
                 save_file_list.append(_FileSaver(path, tmp_path, feature_type,
                                                  None if feature_type.is_meta() else feature_name,
-                                                 file_format if feature_type.contains_ndarrays() else FileFormat.PICKLE,
-                                                 compress_level))
+                                                 feature_file_format, compress_level,
+                                                 self._get_feature_codec(codec, feature_type, feature_file_format,
+                                                                         compress_level),
+                                                 feature_quantization, summaries, digests))
             saved_feature_types.add(feature_type)
         return save_file_list
 
+    def _is_packed_mask(self, feature_type, feature_name, pack_masks):
+        """ Checks if a feature will be saved in packed bits format
+        """
+        if feature_type not in (FeatureType.MASK, FeatureType.MASK_TIMELESS):
+            return False
+
+        value = self[feature_type][feature_name]
+        return isinstance(value, PackedMask) or (pack_masks and is_binary_array(value))
+
+    @staticmethod
+    def _get_feature_codec(codec, feature_type, file_format, compress_level):
+        """ Decides with which codec a feature will be compressed. Returns `None` if it won't be compressed.
+        """
+        if isinstance(codec, dict):
+            if feature_type in codec:
+                return get_codec(codec[feature_type]) if codec[feature_type] else None
+            codec = None
+
+        if codec is not None:
+            codec = get_codec(codec)
+            if codec.file_format is None and not feature_type.contains_ndarrays():
+                return get_codec('gzip')
+            return codec
+        if compress_level:
+            return get_codec('zlib' if file_format is FileFormat.CHUNKED else 'gzip')
+        return None
+
     @staticmethod
     def _check_forbidden_characters(save_file_list):
         """ Checks if feature names have properties which might cause problems during saving or loading
@@ -613,24 +1084,252 @@ class EOPatch:
                                  "options {}".format(existing_feature, file_path, alternative_permissions))
 
     @staticmethod
-    def load(path, features=..., lazy_loading=False, mmap=False):
+    def append_frames(path, eopatch, compress_level=0, workers=1):
+        """Appends time frames of an EOPatch to an EOPatch saved on disk, without rewriting the existing frames.
+
+        Time-dependent numpy array features of the saved EOPatch have to be saved in `FileFormat.CHUNKED` format,
+        where each chunk contains a single time frame, therefore only chunks of new frames are written. The given
+        EOPatch has to contain the same time-dependent numpy array features as the saved one, with matching shapes
+        except for the time dimension. Appended timestamps have to be increasing and later than timestamps of the
+        saved EOPatch. Timestamps and features of type `FeatureType.VECTOR` are concatenated and rewritten, together
+        with the manifest. Other features of the given EOPatch are ignored.
+
+        All new files are first written under temporary names, without changing the saved EOPatch. Only then headers
+        of chunked features, timestamps and vector features are replaced and the manifest is written last. If
+        appending fails before that, the saved EOPatch remains unchanged.
+
+        :param path: Location of the saved EOPatch on disk
+        :type path: str
+        :param eopatch: EOPatch containing time frames which will be appended
+        :type eopatch: EOPatch
+        :param compress_level: A level of compression of new chunks. If it is 0 the default level of the codec, with
+            which each feature was saved, is used.
+        :type compress_level: int
+        :param workers: Number of threads used to compress and write chunks of each feature concurrently
+        :type workers: int or None
+        :raises: ValueError
+        """
+        if not os.path.exists(path):
+            raise ValueError('Specified path {} does not exist'.format(path))
+        if is_container(path):
+            raise ValueError('Frames cannot be appended to an EOPatch saved in a container file')
+
+        existing_content = EOPatch._get_eopatch_content(path)
+        appended_features = EOPatch._get_appended_features(existing_content, eopatch)
+
+        saved_timestamp = parse_timestamps(existing_content[FeatureType.TIMESTAMP.value].load()) \
+            if FeatureType.TIMESTAMP.value in existing_content else []
+        if bool(saved_timestamp) != bool(eopatch.timestamp) and (saved_timestamp or appended_features):
+            raise ValueError('Either both or none of the saved EOPatch and the given EOPatch should have timestamps')
+
+        appended_timestamp = saved_timestamp[-1:] + eopatch.timestamp
+        if any(timestamp >= next_timestamp for timestamp, next_timestamp in
+               zip(appended_timestamp[:-1], appended_timestamp[1:])):
+            raise ValueError('Timestamps of the given EOPatch have to be increasing, without duplicates, and later '
+                             'than timestamps of the saved EOPatch')
+
+        if FeatureType.BBOX.value in existing_content and eopatch.bbox is not None and \
+                EOPatch._parse_feature_type_value(FeatureType.BBOX, existing_content[FeatureType.BBOX.value].load()) \
+                != eopatch.bbox:
+            raise ValueError('Bounding box of the given EOPatch does not match bounding box of the saved EOPatch')
+
+        rewritten_eopatch = EOPatch(timestamp=saved_timestamp + eopatch.timestamp)
+        for feature_name, dataframe in eopatch.vector.items():
+            saved_loaders = existing_content.get(FeatureType.VECTOR.value, {})
+            if feature_name in saved_loaders:
+                saved_dataframe = saved_loaders[feature_name].load()
+                dataframe = gpd.GeoDataFrame(pd.concat([saved_dataframe, dataframe], ignore_index=True),
+                                             crs=saved_dataframe.crs)
+            rewritten_eopatch.vector[feature_name] = dataframe
+
+        tmp_path = '{}_tmp_{}'.format(path, datetime.datetime.now().timestamp())
+        save_file_list = rewritten_eopatch._get_save_file_list(  # pylint: disable=protected-access
+            path, tmp_path, [FeatureType.TIMESTAMP, FeatureType.VECTOR], FileFormat.NPY, 0, None, None, False
+        )
+
+        started_appends = []
+        try:
+            for loader, array in appended_features.values():
+                started_appends.append(loader.get_file_path())
+                append_chunked_array(loader.get_file_path(), array, compress_level=compress_level, workers=workers,
+                                     commit=False)
+
+            map_concurrently(lambda file_saver: file_saver.save(rewritten_eopatch, workers=workers), save_file_list,
+                             workers)
+
+            manifest_entries = EOPatch._get_appended_manifest_entries(path, save_file_list, existing_content,
+                                                                      appended_features)
+        except BaseException:
+            for chunked_path in started_appends:
+                discard_chunked_append(chunked_path)
+            if os.path.exists(tmp_path):
+                shutil.rmtree(tmp_path)
+            raise
+
+        _remove_manifest(path)
+        for chunked_path in started_appends:
+            commit_chunked_append(chunked_path)
+        _finalize_saved_files(path, tmp_path, save_file_list, existing_content, manifest_entries,
+                              OverwritePermission.OVERWRITE_FEATURES, container=False)
+
+    @staticmethod
+    def _get_appended_manifest_entries(path, save_file_list, existing_content, appended_features):
+        """ Collects manifest entries of an EOPatch to which frames are being appended, before the appended frames are
+        committed
+
+        :return: A list of manifest entries
+        :rtype: list(dict)
+        """
+        manifest_entries = _get_manifest_entries(path, save_file_list, existing_content)
+        for entry in manifest_entries:
+            feature_key = FeatureType(entry['feature_type']), entry['feature_name']
+            if feature_key not in appended_features:
+                continue
+
+            loader, array = appended_features[feature_key]
+            saved_shape, _ = loader.load_header()
+            chunked_path = loader.get_file_path()
+
+            entry['shape'] = [saved_shape[0] + array.shape[0]] + list(saved_shape[1:])
+            header_size = os.path.getsize(os.path.join(chunked_path, CHUNK_HEADER_FILENAME))
+            entry['size'] = _get_file_size(chunked_path) - header_size
+            entry.pop('digest', None)
+            if 'summary' in entry:
+                is_mask = feature_key[0] is FeatureType.MASK
+                appended_summary = summarize_array(array, time_dependent=True, is_mask=is_mask)
+                entry['summary'] = combine_frame_summaries(entry['summary']['frames'] + appended_summary['frames'],
+                                                           is_mask=is_mask)
+        return manifest_entries
+
+    @staticmethod
+    def _get_appended_features(existing_content, eopatch):
+        """ Collects time-dependent numpy array features which will be appended to a saved EOPatch and checks that
+        they match the saved features
+
+        :return: A dictionary mapping features into pairs of loaders of saved features and arrays with new frames
+        :rtype: dict((FeatureType, str): (_FileLoader, numpy.ndarray))
+        :raises: ValueError
+        """
+        appended_features = {}
+        frame_counts = {len(eopatch.timestamp)} if eopatch.timestamp else set()
+
+        for feature_type in FeatureType:
+            if not feature_type.is_time_dependent() or not feature_type.contains_ndarrays():
+                continue
+
+            saved_loaders = existing_content.get(feature_type.value, {})
+            if set(saved_loaders) != set(eopatch[feature_type]):
+                raise ValueError('The given EOPatch has to contain the same {} features as the saved EOPatch, got {} '
+                                 'instead of {}'.format(feature_type, sorted(eopatch[feature_type]),
+                                                        sorted(saved_loaders)))
+
+            for feature_name, loader in saved_loaders.items():
+                if FileFormat.split_by_extensions(loader.filename)[-1] is not FileFormat.CHUNKED:
+                    raise ValueError('Frames can only be appended to features saved in format {}, feature ({}, {}) is '
+                                     'saved in {}'.format(FileFormat.CHUNKED, feature_type, feature_name,
+                                                          loader.get_file_path()))
+
+                array = np.asarray(eopatch[feature_type][feature_name])
+                saved_shape, _ = loader.load_header()
+                if array.shape[1:] != saved_shape[1:]:
+                    raise ValueError('Feature ({}, {}) has shape {}, which does not match the shape {} of the saved '
+                                     'feature'.format(feature_type, feature_name, array.shape, saved_shape))
+
+                frame_counts.add(array.shape[0])
+                appended_features[feature_type, feature_name] = loader, array
+
+        if len(frame_counts) > 1:
+            raise ValueError('Features and timestamps of the given EOPatch have different numbers of time frames: '
+                             '{}'.format(sorted(frame_counts)))
+        return appended_features
+
+    @staticmethod
+    def load(path, features=..., lazy_loading=False, mmap=False, workers=1, time_slice=None, pixel_window=None,
+             bands=None, memory_budget=None, dtype_policy=None):
         """Loads EOPatch from disk.
 
+        Parameters `time_slice`, `pixel_window` and `bands` select only a part of each numpy array feature. Only the
+        selected parts are read from disk, i.e. a strided read from uncompressed npy files, a read of only the
+        required chunks in case of chunked format and a streaming decompression of only the required time frames
+        in case of compressed npy files. Timestamps and bounding box are trimmed to match the selection. Vector features
+        are loaded in full.
+
         :param path: Location on the disk
         :type path: str
         :param features: A collection of features to be loaded. By default all features will be loaded.
         :type features: object
         :param lazy_loading: If `True` features will be lazy loaded.
         :type lazy_loading: bool
-        :param mmap: If True, then memory-map the file. Works only on uncompressed npy files
+        :param mmap: If True, then memory-map the file. Works only on uncompressed npy files. Memory-mapped arrays
+            are read-only and carry digests from the manifest, therefore they are compared with other such arrays
+            (e.g. in `EOPatch.concatenate`) without reading their values.
         :type mmap: bool
+        :param workers: Number of threads used to read features concurrently. Default is a single thread. If set to
+            `None` the number of threads will be chosen by `concurrent.futures.ThreadPoolExecutor`. If reading of
+            multiple features fails, the error of the first failed feature is raised. The parameter has no effect in
+            case of lazy loading.
+        :type workers: int or None
+        :param time_slice: Selection of time frames of time-dependent features and timestamps, e.g. `slice(-5, None)`
+            for the last 5 frames. A list of time indices can also be given.
+        :type time_slice: slice or int or list(int) or None
+        :param pixel_window: A pair of slices `(row_slice, col_slice)` selecting a spatial window of spatial raster
+            features. Slices cannot have steps.
+        :type pixel_window: (slice, slice) or None
+        :param bands: Selection of bands (i.e. the last dimension) of features of type `FeatureType.DATA`, e.g.
+            `[1, 2, 3]`
+        :type bands: list(int) or slice or int or None
+        :param memory_budget: Maximal amount of memory taken by lazily loaded numpy array features, either a number
+            of bytes or a string such as `'4GB'` or `'500MB'` (units are powers of 1024). Once features loaded from
+            disk exceed the budget, the least recently accessed ones are unloaded again and are reloaded on the next
+            access. Loaded arrays are read-only, a modified feature has to be assigned back to EOPatch, after which it
+            is not unloaded anymore. The most recently accessed feature is always kept in memory. Can be used only
+            together with lazy loading.
+        :type memory_budget: int or str or None
+        :param dtype_policy: A dtype policy of the loaded EOPatch, which is applied to numpy array features as they are
+            loaded. Memory-mapped arrays which have to be cast are loaded into memory.
+        :type dtype_policy: DtypePolicy or None
         :return: Loaded EOPatch
         :rtype: EOPatch
         """
         if not os.path.exists(path):
             raise ValueError('Specified path {} does not exist'.format(path))
+        if memory_budget is not None and not lazy_loading:
+            raise ValueError('Parameter memory_budget can only be used together with lazy loading')
 
-        entire_content = EOPatch._get_eopatch_content(path, mmap=mmap)
+        for use_manifest in [True, False]:
+            entire_content = EOPatch._get_eopatch_content(path, mmap=mmap, use_manifest=use_manifest)
+            requested_content = EOPatch._get_requested_content(entire_content, features)
+
+            if time_slice is not None or pixel_window is not None or bands is not None:
+                EOPatch._set_loading_windows(requested_content, entire_content, time_slice, pixel_window, bands)
+
+            if lazy_loading:
+                break
+
+            try:
+                EOPatch._load_content(requested_content, workers)
+                break
+            except FileNotFoundError:
+                if not use_manifest:
+                    raise
+                warnings.warn('Manifest of EOPatch in {} is out of date, folder content will be scanned '
+                              'instead'.format(path))
+
+        eopatch = EOPatch(dtype_policy=dtype_policy, **requested_content)
+        eopatch._reset_changes(path)  # pylint: disable=protected-access
+
+        if memory_budget is not None:
+            feature_cache = _FeatureCache(_parse_memory_size(memory_budget))
+            for feature_type in FeatureType:
+                if feature_type.has_dict() and not feature_type.is_meta():
+                    eopatch.__getattribute__(feature_type.value, load=False).feature_cache = feature_cache
+
+        return eopatch
+
+    @staticmethod
+    def _get_requested_content(entire_content, features):
+        """ Selects only requested features from a dictionary describing content of existing EOPatch
+        """
         requested_content = {}
         for feature_type, feature_name in FeatureParser(features):
             feature_type_str = feature_type.value
@@ -645,31 +1344,126 @@ class EOPatch:
                     requested_content[feature_type_str] = {}
                 requested_content[feature_type_str][feature_name] = content[feature_name]
 
-        if not lazy_loading:
-            for feature_type, content in requested_content.items():
-                if isinstance(content, _FileLoader):
-                    requested_content[feature_type] = content.load()
-                elif isinstance(content, dict):
-                    for feature_name, loader in content.items():
-                        content[feature_name] = loader.load()
+        return requested_content
+
+    @staticmethod
+    def _load_content(requested_content, workers):
+        """ Replaces all _FileLoader classes in the content with loaded data
+        """
+        loading_list = []
+        for feature_type, content in requested_content.items():
+            if isinstance(content, _FileLoader):
+                loading_list.append((requested_content, feature_type, content))
+            elif isinstance(content, dict):
+                for feature_name, loader in content.items():
+                    loading_list.append((content, feature_name, loader))
+
+        loaded_values = map_concurrently(lambda item: item[2].load(), loading_list, workers)
+        for (container, key, loader), value in zip(loading_list, loaded_values):
+            loader.attach_digest(value)
+            container[key] = value
+
+    @staticmethod
+    def _set_loading_windows(requested_content, entire_content, time_slice, pixel_window, bands):
+        """ Sets windows to file loaders of requested content and trims the bounding box according to the pixel window
+        """
+        if pixel_window is not None:
+            if not isinstance(pixel_window, (tuple, list)) or len(pixel_window) != 2 or \
+                    not all(isinstance(axis_slice, slice) and axis_slice.step in (None, 1)
+                            for axis_slice in pixel_window):
+                raise ValueError('Parameter pixel_window should be a pair of slices without steps, got '
+                                 '{}'.format(pixel_window))
+            pixel_window = tuple(pixel_window)
+
+        for feature_type_str, content in requested_content.items():
+            feature_type = FeatureType(feature_type_str)
+
+            if feature_type.is_raster():
+                window = EOPatch._get_loading_window(feature_type, time_slice, pixel_window, bands)
+                for loader in content.values():
+                    loader.window = window
+
+            elif feature_type is FeatureType.TIMESTAMP and time_slice is not None:
+                content.window = (time_slice,)
+
+            elif feature_type is FeatureType.BBOX and pixel_window is not None:
+                raster_shape = EOPatch._get_saved_raster_shape(entire_content)
+                if raster_shape is None:
+                    warnings.warn('Bounding box cannot be trimmed to pixel window because EOPatch does not contain '
+                                  'any spatial raster feature')
+                    continue
+
+                bbox = EOPatch._parse_feature_type_value(feature_type, content.load())
+                requested_content[feature_type_str] = _get_window_bbox(bbox, raster_shape, pixel_window)
+
+    @staticmethod
+    def _get_loading_window(feature_type, time_slice, pixel_window, bands):
+        """ Joins selection parameters into a window of a raster feature type
+        """
+        window = [slice(None)] * feature_type.ndim()
+
+        if feature_type.is_time_dependent() and time_slice is not None:
+            window[0] = time_slice
+
+        if feature_type.is_spatial() and pixel_window is not None:
+            height_axis = 1 if feature_type.is_time_dependent() else 0
+            window[height_axis: height_axis + 2] = pixel_window
+
+        if feature_type is FeatureType.DATA and bands is not None:
+            window[-1] = bands
+
+        return tuple(window)
+
+    @staticmethod
+    def _get_saved_raster_shape(eopatch_content):
+        """ Finds a spatial raster feature in the content of saved EOPatch and returns its height and width
+        """
+        for feature_type in FeatureType:
+            if not (feature_type.is_raster() and feature_type.is_spatial()) or \
+                    not eopatch_content.get(feature_type.value):
+                continue
+
+            loader = next(iter(eopatch_content[feature_type.value].values()))
+            shape = loader.load_shape()
+            return shape[1:3] if feature_type.is_time_dependent() else shape[0:2]
 
-        return EOPatch(**requested_content)
+        return None
 
     @staticmethod
-    def _get_eopatch_content(path, mmap=False):
-        """ Checks the content of saved EOPatch and creates a dictionary with _FileLoader classes
+    def _get_eopatch_content(path, mmap=False, use_manifest=True):
+        """ Checks the content of saved EOPatch and creates a dictionary with _FileLoader classes. The content is
+        obtained from the manifest file. If manifest doesn't exist or cannot be parsed, the EOPatch folder is scanned
+        instead.
 
         :param path: Location on the disk
         :type path: str
         :param mmap: If True, then memory-map the file. Works only on uncompressed npy files
         :type mmap: bool
+        :param use_manifest: If `False` the EOPatch folder is always scanned and manifest file is ignored
+        :type use_manifest: bool
         :return: A dictionary describing content of existing EOPatch
         """
+        if is_container(path):
+            return EOPatch._get_container_content(path, mmap=mmap)
+
+        manifest_entries = _load_manifest(path) if use_manifest else None
+        if manifest_entries is not None:
+            return EOPatch._get_manifest_content(path, manifest_entries, mmap=mmap)
+
+        return EOPatch._scan_eopatch_folder(path, mmap=mmap)
+
+    @staticmethod
+    def _scan_eopatch_folder(path, mmap=False):
+        """ Creates a dictionary with _FileLoader classes by scanning files of the EOPatch folder
+        """
         eopatch_content = {}
 
         for feature_type_name in os.listdir(path):
             feature_type_path = os.path.join(path, feature_type_name)
 
+            if feature_type_name == MANIFEST_FILENAME:
+                continue
+
             if os.path.isdir(feature_type_path):
                 if not FeatureType.has_value(feature_type_name) or FeatureType(feature_type_name).is_meta():
                     warnings.warn('Folder {} is not recognized in EOPatch folder structure, will be skipped'.format(
@@ -685,7 +1479,8 @@ class EOPatch:
 
                 for feature in os.listdir(feature_type_path):
                     feature_path = os.path.join(feature_type_path, feature)
-                    if os.path.isdir(feature_path):
+                    if os.path.isdir(feature_path) and \
+                            FileFormat.split_by_extensions(feature)[-1] is not FileFormat.CHUNKED:
                         warnings.warn(
                             'Folder {} is not recognized in EOPatch folder structure, will be skipped'.format(
                                 feature_path))
@@ -697,7 +1492,7 @@ class EOPatch:
                         continue
 
                     eopatch_content[feature_type_name][feature_name] = \
-                        _FileLoader(path, os.path.join(feature_type_name, feature))
+                        _FileLoader(path, os.path.join(feature_type_name, feature), mmap)
             else:
                 feature_type_str = FileFormat.split_by_extensions(feature_type_name)[0]
                 if not FeatureType.has_value(feature_type_str):
@@ -711,6 +1506,86 @@ class EOPatch:
 
         return eopatch_content
 
+    @staticmethod
+    def _get_manifest_content(path, manifest_entries, mmap=False):
+        """ Creates a dictionary with _FileLoader classes from entries of a manifest file
+        """
+        eopatch_content = {}
+        for entry in manifest_entries:
+            feature_type_str, feature_name = entry['feature_type'], entry['feature_name']
+
+            loader = _FileLoader(path, entry['filename'], mmap, digest=entry.get('digest'))
+            if feature_name is None:
+                eopatch_content[feature_type_str] = loader
+            else:
+                eopatch_content.setdefault(feature_type_str, {})[feature_name] = loader
+
+        return eopatch_content
+
+    @staticmethod
+    def _get_container_content(path, mmap=False):
+        """ Creates a dictionary with _ContainerFileLoader classes from the manifest of a container file
+
+        :raises: ValueError
+        """
+        manifest_entries = _load_manifest(path)
+        if manifest_entries is None:
+            raise ValueError('Container {} does not contain a valid manifest'.format(path))
+
+        eopatch_content = {}
+        for entry in manifest_entries:
+            feature_type_str, feature_name = entry['feature_type'], entry['feature_name']
+            loader = _ContainerFileLoader(path, entry['filename'], mmap, digest=entry.get('digest'))
+            if feature_name is None:
+                eopatch_content[feature_type_str] = loader
+            else:
+                eopatch_content.setdefault(feature_type_str, {})[feature_name] = loader
+
+        return eopatch_content
+
+    @staticmethod
+    def describe(path, features=...):
+        """Describes an EOPatch saved on disk without loading any of its arrays.
+
+        Shapes and dtypes of numpy array features are obtained from the manifest file or, if it doesn't contain them,
+        from headers of npy files (for compressed npy files only the first bytes are decompressed) and headers of
+        chunked format. Arrays saved with pickle have no header and their shape and dtype remain unknown.
+
+        :param path: Location on the disk
+        :type path: str
+        :param features: A collection of features to be described. By default all features will be described.
+        :type features: object
+        :return: Description of the saved EOPatch
+        :rtype: EOPatchDescription
+        """
+        if not os.path.exists(path):
+            raise ValueError('Specified path {} does not exist'.format(path))
+
+        manifest_entries = {(entry['feature_type'], entry['feature_name']): entry for entry in
+                            _load_manifest(path) or []}
+
+        for use_manifest in [True, False]:
+            entire_content = EOPatch._get_eopatch_content(path, use_manifest=use_manifest)
+            requested_content = EOPatch._get_requested_content(entire_content, features)
+
+            try:
+                feature_descriptions = []
+                for feature_type_str, content in requested_content.items():
+                    loaders = {None: content} if isinstance(content, _FileLoader) else content
+                    for feature_name, loader in loaders.items():
+                        entry = manifest_entries.get((feature_type_str, feature_name), {}) if use_manifest else {}
+                        feature_descriptions.append(FeatureDescription.from_saved_feature(
+                            FeatureType(feature_type_str), feature_name, loader, entry
+                        ))
+                return EOPatchDescription(path=path, features=feature_descriptions)
+            except FileNotFoundError:
+                if not use_manifest:
+                    raise
+                warnings.warn('Manifest of EOPatch in {} is out of date, folder content will be scanned '
+                              'instead'.format(path))
+
+        return None
+
     def time_series(self, ref_date=None, scale_time=1):
         """Returns a numpy array with seconds passed between the reference date and the timestamp of each image.
 
@@ -727,55 +1602,785 @@ class EOPatch:
         if not self.timestamp:
             return None
 
-        if ref_date is None:
-            ref_date = self.timestamp[0]
-
-        return np.asarray([round((timestamp - ref_date).total_seconds() / scale_time) for timestamp in self.timestamp],
-                          dtype=np.int64)
+        return self.time_index.time_series(ref_date=ref_date, scale_time=scale_time)
 
-    def consolidate_timestamps(self, timestamps):
-        """Removes all frames from the EOPatch with a date not found in the provided timestamps list.
+    @property
+    def time_index(self):
+        """A time index of EOPatch timestamps, which supports vectorised lookups and set operations. The index is
+        created from the current timestamps on each access.
 
-        :param timestamps: keep frames with date found in this list
-        :type timestamps: list of datetime objects
-        :return: set of removed frames' dates
-        :rtype: set of datetime objects
+        :return: Time index
+        :rtype: TimeIndex
+        """
+        return TimeIndex(self.timestamp)
+
+    def subset(self, time=None, rows=None, cols=None):
+        """Returns a new EOPatch with selected time frames and a spatial window of this EOPatch.
+
+        Numpy array features of the new EOPatch are views of arrays of this EOPatch, and therefore share memory with
+        them, whenever the selection can be made with basic slicing. That is the case if time frames are given with a
+        slice or if the selected frames are consecutive. Otherwise arrays are copied. Timestamps and rows of
+        time-dependent vector features are selected as well and the bounding box is trimmed to the spatial window.
+        Other features are shared with this EOPatch.
+
+        :param time: Selection of time frames, given either as a slice, a boolean mask, a list of frame indices or a
+            list of timestamps. By default all frames are selected.
+        :type time: slice or list(bool) or list(int) or list(datetime.datetime) or numpy.ndarray or None
+        :param rows: A slice of raster rows, counted from the top of the raster, without a step
+        :type rows: slice or None
+        :param cols: A slice of raster columns, without a step
+        :type cols: slice or None
+        :return: A new EOPatch
+        :rtype: EOPatch
+        :raises: ValueError
         """
-        remove_from_patch = set(self.timestamp).difference(timestamps)
-        remove_from_patch_idxs = [self.timestamp.index(rm_date) for rm_date in remove_from_patch]
-        good_timestamp_idxs = [idx for idx, _ in enumerate(self.timestamp) if idx not in remove_from_patch_idxs]
-        good_timestamps = [date for idx, date in enumerate(self.timestamp) if idx not in remove_from_patch_idxs]
+        time_selection = self._parse_time_selection(time)
 
-        for feature_type in [feature_type for feature_type in FeatureType if (feature_type.is_time_dependent() and
-                                                                              feature_type.has_dict())]:
+        pixel_window = rows if rows is not None else slice(None), cols if cols is not None else slice(None)
+        if not all(isinstance(axis_slice, slice) and axis_slice.step in (None, 1) for axis_slice in pixel_window):
+            raise ValueError('Parameters rows and cols should be slices without steps, got {}'.format(pixel_window))
 
-            for feature_name, value in self[feature_type].items():
-                if isinstance(value, np.ndarray):
-                    self[feature_type][feature_name] = value[good_timestamp_idxs, ...]
-                if isinstance(value, list):
-                    self[feature_type][feature_name] = [value[idx] for idx in good_timestamp_idxs]
+        new_eopatch = EOPatch()
+        for feature_type in FeatureType:
+            if feature_type.is_raster():
+                window = ((time_selection,) if feature_type.is_time_dependent() else ()) + \
+                    (pixel_window if feature_type.is_spatial() else ())
+                for feature_name, value in self[feature_type].items():
+                    new_eopatch[feature_type][feature_name] = value[window] if window else value
+
+            elif feature_type is FeatureType.VECTOR and time is not None and self.timestamp:
+                kept_timestamps = self._select_timestamps(time_selection)
+                for feature_name, dataframe in self[feature_type].items():
+                    new_eopatch[feature_type][feature_name] = \
+                        dataframe[dataframe[FeatureType.TIMESTAMP.value.upper()].isin(kept_timestamps)]
+
+            elif feature_type is FeatureType.TIMESTAMP:
+                new_eopatch.timestamp = self._select_timestamps(time_selection)
+
+            elif feature_type is FeatureType.BBOX and self.bbox is not None and (rows is not None or cols is not None):
+                raster_shape = self._get_raster_shape()
+                if raster_shape is None:
+                    warnings.warn('Bounding box cannot be trimmed to pixel window because EOPatch does not contain '
+                                  'any spatial raster feature')
+                    new_eopatch.bbox = self.bbox
+                else:
+                    new_eopatch.bbox = _get_window_bbox(self.bbox, raster_shape, pixel_window)
+
+            else:
+                new_eopatch[feature_type] = copy.copy(self[feature_type])
+
+        return new_eopatch
+
+    def _parse_time_selection(self, time):
+        """ Parses a selection of time frames into a slice, which is kept if possible, or into a list of frame indices
+
+        :raises: ValueError
+        """
+        if time is None:
+            return slice(None)
+        if isinstance(time, slice):
+            return time
+
+        selection = np.asarray(time)
+        if selection.ndim != 1:
+            raise ValueError('Selection of time frames should be one-dimensional, got {}'.format(time))
+
+        frame_count = self._get_frame_count()
+        if selection.dtype == bool:
+            if selection.size != frame_count:
+                raise ValueError('Boolean mask of time frames has size {}, but EOPatch has {} time '
+                                 'frames'.format(selection.size, frame_count))
+            frame_indices = np.flatnonzero(selection)
+        elif not selection.size or np.issubdtype(selection.dtype, np.integer):
+            frame_indices = selection.astype(np.int64)
+            if np.any((frame_indices < -frame_count) | (frame_indices >= frame_count)):
+                raise ValueError('Indices of time frames {} are out of range for {} time '
+                                 'frames'.format(time, frame_count))
+            frame_indices = frame_indices % max(frame_count, 1)
+        else:
+            frame_indices = self.time_index.get_indices(time)
+            if np.any(frame_indices == -1):
+                raise ValueError('Some of the given timestamps are not in EOPatch')
+
+        return _get_index_selection(frame_indices.tolist())
+
+    def _get_frame_count(self):
+        """ Returns the number of time frames, given by timestamps or by time-dependent numpy array features
+        """
+        if self.timestamp:
+            return len(self.timestamp)
+        for feature_type in FeatureType:
+            if feature_type.is_time_dependent() and feature_type.is_raster():
+                for value in self[feature_type].values():
+                    return value.shape[0]
+        return 0
+
+    def _select_timestamps(self, time_selection):
+        """ Selects timestamps of time frames given by a slice or a list of indices
+        """
+        if isinstance(time_selection, slice):
+            return self.timestamp[time_selection]
+        return [self.timestamp[idx] for idx in time_selection]
+
+    def _get_raster_shape(self):
+        """ Returns height and width of spatial raster features or `None` if there are no such features
+        """
+        for feature_type in FeatureType:
+            if feature_type.is_spatial() and feature_type.is_raster():
+                for feature_name in self[feature_type]:
+                    return self.get_spatial_dimension(feature_type, feature_name)
+        return None
+
+    def split_tiles(self, tile_shape, halo=0):
+        """Splits the EOPatch into a grid of spatial tiles, which overlap by a halo of pixels around each tile.
+
+        Tiles are created with `EOPatch.subset`, therefore their numpy array features are views of arrays of this
+        EOPatch and their bounding boxes are trimmed to halo-padded windows. Halos are clipped at borders of the
+        raster. Position of each tile is written into its meta info under key `TILE_INFO_KEY`, which is used by
+        `EOPatch.merge_tiles` to stitch tiles back together.
+
+        :param tile_shape: Height and width of tiles without halos. Tiles at the bottom and right border of the
+            raster can be smaller.
+        :type tile_shape: int or (int, int)
+        :param halo: Number of overlapping pixels added to each side of a tile, either the same for rows and columns or
+            given separately
+        :type halo: int or (int, int)
+        :return: A generator of tiles in row-major order
+        :rtype: generator(EOPatch)
+        :raises: ValueError
+        """
+        tile_shape = _parse_pixel_pair(tile_shape, 'tile_shape')
+        halo = _parse_pixel_pair(halo, 'halo')
+        if min(tile_shape) < 1 or min(halo) < 0:
+            raise ValueError('Tile shape should be positive and halo non-negative, got {} and '
+                             '{}'.format(tile_shape, halo))
+
+        raster_shape = self._get_raster_shape()
+        if raster_shape is None:
+            raise ValueError('EOPatch cannot be split into tiles because it does not contain any spatial raster '
+                             'feature')
+
+        for row_start in range(0, raster_shape[0], tile_shape[0]):
+            for col_start in range(0, raster_shape[1], tile_shape[1]):
+                window = tuple((start, min(start + size, axis_size)) for start, size, axis_size in
+                               zip((row_start, col_start), tile_shape, raster_shape))
+                halo_window = tuple((max(start - axis_halo, 0), min(stop + axis_halo, axis_size)) for
+                                    (start, stop), axis_halo, axis_size in zip(window, halo, raster_shape))
+
+                tile = self.subset(rows=slice(*halo_window[0]), cols=slice(*halo_window[1]))
+                tile.meta_info[TILE_INFO_KEY] = {
+                    'raster_shape': raster_shape,
+                    'window': window,
+                    'halo_window': halo_window,
+                    'bbox': self.bbox
+                }
+                yield tile
+
+    @staticmethod
+    def merge_tiles(tiles):
+        """Stitches tiles created by `EOPatch.split_tiles` back into an EOPatch with the shape of the parent EOPatch.
+
+        Halos are cropped from spatial raster features of tiles and the remaining parts are written into arrays, which
+        are allocated only once. Each spatial raster feature has to exist in all tiles and tiles have to cover the
+        entire raster exactly once. Other features and the bounding box of the parent EOPatch are taken from the first
+        tile.
+
+        :param tiles: A collection of tiles
+        :type tiles: list(EOPatch)
+        :return: Merged EOPatch
+        :rtype: EOPatch
+        :raises: ValueError
+        """
+        tiles = list(tiles)
+        if not tiles:
+            raise ValueError('At least one tile has to be given')
+
+        tile_infos = [tile.meta_info.get(TILE_INFO_KEY) for tile in tiles]
+        if any(tile_info is None for tile_info in tile_infos):
+            raise ValueError('Tiles should be created with EOPatch.split_tiles, some are missing meta info '
+                             '{}'.format(TILE_INFO_KEY))
+
+        raster_shape = tuple(tile_infos[0]['raster_shape'])
+        if any(tuple(tile_info['raster_shape']) != raster_shape for tile_info in tile_infos):
+            raise ValueError('Tiles have been split from EOPatches with different shapes')
+
+        crops, windows = [], []
+        is_covered = np.zeros(raster_shape, dtype=bool)
+        for tile_info in tile_infos:
+            (row_start, row_stop), (col_start, col_stop) = tile_info['window']
+            (halo_row_start, _), (halo_col_start, _) = tile_info['halo_window']
+
+            if is_covered[row_start: row_stop, col_start: col_stop].any():
+                raise ValueError('Tiles overlap at window {}'.format(tile_info['window']))
+            is_covered[row_start: row_stop, col_start: col_stop] = True
+
+            windows.append((slice(row_start, row_stop), slice(col_start, col_stop)))
+            crops.append((slice(row_start - halo_row_start, row_stop - halo_row_start),
+                          slice(col_start - halo_col_start, col_stop - halo_col_start)))
+
+        if not is_covered.all():
+            raise ValueError('Tiles do not cover the entire raster of shape {}'.format(raster_shape))
+
+        merged_eopatch = EOPatch()
+        for feature_type in FeatureType:
+            if feature_type.is_spatial() and feature_type.is_raster():
+                for feature_name in tiles[0][feature_type]:
+                    merged_eopatch[feature_type][feature_name] = \
+                        EOPatch._get_merged_array(tiles, feature_type, feature_name, raster_shape, windows, crops)
+            elif feature_type is FeatureType.BBOX:
+                merged_eopatch.bbox = tile_infos[0]['bbox']
+            elif feature_type is FeatureType.META_INFO:
+                merged_eopatch.meta_info = {name: value for name, value in tiles[0].meta_info.items()
+                                            if name != TILE_INFO_KEY}
+            else:
+                merged_eopatch[feature_type] = copy.copy(tiles[0][feature_type])
+
+        return merged_eopatch
+
+    @staticmethod
+    def _get_merged_array(tiles, feature_type, feature_name, raster_shape, windows, crops):
+        """ Allocates an array of a spatial raster feature with the parent shape and fills it with cropped tile arrays
+
+        :raises: ValueError
+        """
+        arrays = []
+        for tile in tiles:
+            if feature_name not in tile[feature_type]:
+                raise ValueError('Feature ({}, {}) is missing in some of the tiles'.format(feature_type, feature_name))
+            arrays.append(tile[feature_type][feature_name])
+
+        time_axes = 1 if feature_type.is_time_dependent() else 0
+        leading_shape, band_shape = arrays[0].shape[:time_axes], arrays[0].shape[time_axes + 2:]
+        if any(array.shape[:time_axes] != leading_shape or array.shape[time_axes + 2:] != band_shape
+               for array in arrays):
+            raise ValueError('Tiles of feature ({}, {}) have incompatible shapes'.format(feature_type, feature_name))
+
+        merged_array = np.empty(leading_shape + raster_shape + band_shape, dtype=np.result_type(*arrays))
+        time_window = (slice(None),) * time_axes
+        for array, window, crop in zip(arrays, windows, crops):
+            merged_array[time_window + window] = array[time_window + crop]
+
+        return merged_array
+
+    def consolidate_timestamps(self, timestamps):
+        """Removes all frames from the EOPatch with a date not found in the provided timestamps list.
+
+        :param timestamps: keep frames with date found in this list
+        :type timestamps: list of datetime objects
+        :return: set of removed frames' dates
+        :rtype: set of datetime objects
+        """
+        is_kept = self.time_index.isin(timestamps)
+        remove_from_patch = {date for date, is_kept_date in zip(self.timestamp, is_kept) if not is_kept_date}
+        good_timestamp_idxs = np.flatnonzero(is_kept).tolist()
+        good_timestamps = [self.timestamp[idx] for idx in good_timestamp_idxs]
+
+        for feature_type in [feature_type for feature_type in FeatureType if (feature_type.is_time_dependent() and
+                                                                              feature_type.has_dict())]:
+
+            for feature_name, value in self[feature_type].items():
+                if isinstance(value, np.ndarray):
+                    self[feature_type][feature_name] = value[good_timestamp_idxs, ...]
+                if isinstance(value, list):
+                    self[feature_type][feature_name] = [value[idx] for idx in good_timestamp_idxs]
 
         self.timestamp = good_timestamps
         return remove_from_patch
 
 
+@attr.s(frozen=True)
+class FeatureDescription:
+    """ A description of a single feature of an EOPatch saved on disk
+
+    :ivar feature_type: Type of the feature
+    :ivar feature_name: Name of the feature or `None` for bounding box, timestamps and meta info
+    :ivar shape: Shape of a numpy array feature, `None` if unknown
+    :ivar dtype: Dtype of a numpy array feature, `None` if unknown
+    :ivar length: Number of elements of timestamps or vector feature, `None` if unknown
+    :ivar value: Value of the bounding box feature, otherwise `None`
+    :ivar size: Size of the saved feature on disk in bytes
+    :ivar summary: A summary of values of a numeric array feature, if it was saved with summaries, see
+        `eolearn.core.utilities.summarize_array`, otherwise `None`
+    """
+    feature_type = attr.ib()
+    feature_name = attr.ib(default=None)
+    shape = attr.ib(default=None)
+    dtype = attr.ib(default=None)
+    length = attr.ib(default=None)
+    value = attr.ib(default=None)
+    size = attr.ib(default=None)
+    summary = attr.ib(default=None)
+
+    @property
+    def nbytes(self):
+        """ Number of bytes the numpy array feature would occupy in memory once loaded
+
+        :return: Number of bytes or `None` if shape and dtype are unknown
+        :rtype: int or None
+        """
+        if self.shape is None or self.dtype is None:
+            return None
+        return int(np.prod(self.shape, dtype=np.int64)) * self.dtype.itemsize
+
+    @staticmethod
+    def from_saved_feature(feature_type, feature_name, loader, manifest_entry):
+        """ Creates a description of a saved feature. Information stored in the manifest entry is used, the rest is
+        read from the file header.
+
+        :param feature_type: Type of the feature
+        :type feature_type: FeatureType
+        :param feature_name: Name of the feature
+        :type feature_name: str or None
+        :param loader: A loader of the saved feature
+        :type loader: _FileLoader
+        :param manifest_entry: An entry of the manifest file describing the feature, can be empty
+        :type manifest_entry: dict
+        :return: Description of the feature
+        :rtype: FeatureDescription
+        """
+        shape, dtype, length = manifest_entry.get('shape'), manifest_entry.get('dtype'), manifest_entry.get('length')
+        value = None
+
+        if feature_type.is_raster() and shape is None:
+            header = loader.load_header()
+            if header is not None:
+                shape, dtype = header
+
+        if feature_type is FeatureType.TIMESTAMP and length is None:
+            length = len(loader.load())
+
+        if feature_type is FeatureType.BBOX:
+            value = tuple(manifest_entry['bbox']) + (manifest_entry['crs'],) if 'bbox' in manifest_entry else \
+                loader.load()
+            if not isinstance(value, sentinelhub.BBox):
+                value = sentinelhub.BBox(value[:4], crs=value[4])
+
+        size = manifest_entry.get('size')
+        if size is None:
+            size = _get_file_size(loader.get_file_path())
+
+        return FeatureDescription(
+            feature_type=feature_type,
+            feature_name=feature_name,
+            shape=None if shape is None else tuple(shape),
+            dtype=None if dtype is None else np.dtype(dtype),
+            length=length,
+            value=value,
+            size=size,
+            summary=manifest_entry.get('summary')
+        )
+
+
+@attr.s(frozen=True)
+class EOPatchDescription:
+    """ A lightweight description of an EOPatch saved on disk, which is returned by `EOPatch.describe`
+
+    :ivar path: Location of EOPatch on disk
+    :ivar features: Descriptions of saved features
+    """
+    path = attr.ib()
+    features = attr.ib(factory=list)
+
+    def get_feature(self, feature_type, feature_name=None):
+        """ Returns a description of a feature
+
+        :param feature_type: Type of the feature
+        :type feature_type: FeatureType
+        :param feature_name: Name of the feature
+        :type feature_name: str or None
+        :return: Description of the feature
+        :rtype: FeatureDescription
+        :raises: KeyError
+        """
+        feature_type = FeatureType(feature_type)
+        for feature_description in self.features:
+            if feature_description.feature_type is feature_type and feature_description.feature_name == feature_name:
+                return feature_description
+
+        raise KeyError('Feature ({}, {}) is not described'.format(feature_type, feature_name))
+
+    def get_feature_list(self):
+        """ Returns a list of described features in the same form as `EOPatch.get_feature_list`
+
+        :return: List of features
+        :rtype: list(FeatureType or (FeatureType, str))
+        """
+        return [feature.feature_type if feature.feature_name is None else (feature.feature_type, feature.feature_name)
+                for feature in self.features]
+
+    @property
+    def bbox(self):
+        """ Bounding box of the saved EOPatch or `None` if it was not described
+        """
+        for feature_description in self.features:
+            if feature_description.feature_type is FeatureType.BBOX:
+                return feature_description.value
+        return None
+
+    @property
+    def timestamp_count(self):
+        """ Number of timestamps of the saved EOPatch or `None` if they were not described
+        """
+        for feature_description in self.features:
+            if feature_description.feature_type is FeatureType.TIMESTAMP:
+                return feature_description.length
+        return None
+
+    @property
+    def nbytes(self):
+        """ Number of bytes numpy array features would occupy in memory once loaded. Features with unknown shape or
+        dtype are not counted.
+        """
+        return sum(feature.nbytes for feature in self.features if feature.nbytes is not None)
+
+
+def _load_manifest(path):
+    """ Loads entries of a manifest file of a saved EOPatch
+
+    :param path: Location of EOPatch on disk
+    :type path: str
+    :return: A list of manifest entries, one for each saved feature, or `None` if manifest doesn't exist, cannot be
+        parsed or is of an unsupported version
+    :rtype: list(dict) or None
+    """
+    try:
+        if is_container(path):
+            with open_container_member(path, MANIFEST_FILENAME) as manifest_file:
+                manifest = json.loads(manifest_file.read().decode('utf-8'))
+        else:
+            with open(os.path.join(path, MANIFEST_FILENAME), 'r') as manifest_file:
+                manifest = json.load(manifest_file)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        warnings.warn('Manifest of EOPatch in {} cannot be parsed and will be ignored'.format(path))
+        return None
+
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        warnings.warn('Manifest of EOPatch in {} has an unsupported version and will be ignored'.format(path))
+        return None
+
+    try:
+        is_outdated = not is_container(path) and manifest.get('folder_state') != _get_folder_state(path)
+    except FileNotFoundError:
+        is_outdated = True
+    if is_outdated:
+        warnings.warn('Manifest of EOPatch in {} is out of date, folder content will be scanned instead'.format(path))
+        return None
+
+    entries = manifest.get('features', [])
+    if not all(FeatureType.has_value(entry.get('feature_type')) and 'filename' in entry for entry in entries):
+        warnings.warn('Manifest of EOPatch in {} contains invalid entries and will be ignored'.format(path))
+        return None
+
+    return entries
+
+
+def _save_manifest(path, manifest_entries):
+    """ Writes a manifest file into the EOPatch folder. The file is first written under a temporary name and then
+    moved in place, so that readers never see a partially written manifest.
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    tmp_manifest_path = '{}_tmp_{}'.format(manifest_path, datetime.datetime.now().timestamp())
+
+    os.makedirs(path, exist_ok=True)
+    folder_state = _get_folder_state(path)
+    with open(tmp_manifest_path, 'w') as manifest_file:
+        manifest_file.write(_dump_manifest(manifest_entries, folder_state=folder_state))
+    os.replace(tmp_manifest_path, manifest_path)
+
+
+def _dump_manifest(manifest_entries, folder_state=None):
+    """ Serializes manifest entries into content of a manifest file
+
+    :rtype: str
+    """
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'features': manifest_entries
+    }
+    if folder_state is not None:
+        manifest['folder_state'] = folder_state
+    return json.dumps(manifest, indent=1)
+
+
+def _get_folder_state(path):
+    """ Collects modification times of feature type folders and files in the EOPatch folder. A modification time of a
+    folder changes whenever a feature is added, removed or replaced in it, therefore the manifest is valid only as long
+    as the state doesn't change.
+
+    :param path: Location of EOPatch folder
+    :type path: str
+    :return: A dictionary mapping names of folders and files to modification times in nanoseconds
+    :rtype: dict(str: int)
+    """
+    return {name: os.stat(os.path.join(path, name)).st_mtime_ns for name in sorted(os.listdir(path))
+            if FeatureType.has_value(FileFormat.split_by_extensions(name)[0])}
+
+
+def _save_container(path, save_file_list, existing_content, manifest_entries):
+    """ Writes a container file with saved features, features of the existing container which were not saved again and
+    the manifest
+
+    :param path: Location of the container file
+    :type path: str
+    :param save_file_list: A list of savers of features which were saved into a temporary folder
+    :type save_file_list: list(_FileSaver)
+    :param existing_content: A dictionary describing content of the existing container
+    :type existing_content: dict
+    :param manifest_entries: A list of manifest entries
+    :type manifest_entries: list(dict)
+    """
+    saved_features = {(file_saver.feature_type.value, file_saver.feature_name) for file_saver in save_file_list}
+    container_index = read_container_index(path) if existing_content else {}
+    members = []
+
+    for feature_type_str, content in existing_content.items():
+        loaders = {None: content} if isinstance(content, _FileLoader) else content
+        for feature_name, loader in loaders.items():
+            member_name = loader.get_member_name()
+            if (feature_type_str, feature_name) not in saved_features and member_name in container_index:
+                members.append((member_name, (functools.partial(open_container_member, path, member_name),
+                                              container_index[member_name][1])))
+
+    for file_saver in save_file_list:
+        members.append((os.path.relpath(file_saver.final_filename, path).replace(os.sep, '/'),
+                        (functools.partial(open, file_saver.tmp_filename, 'rb'),
+                         os.path.getsize(file_saver.tmp_filename))))
+
+    manifest = _dump_manifest(manifest_entries).encode('utf-8')
+    members.append((MANIFEST_FILENAME, (functools.partial(io.BytesIO, manifest), len(manifest))))
+
+    write_container(path, members)
+
+
+def _check_save_location(path, file_format, blob_store, container):
+    """ Checks that an EOPatch can be saved into the given location, either into a folder or into a container file
+
+    :raises: ValueError, IsADirectoryError, NotADirectoryError
+    """
+    if not container:
+        if os.path.isfile(path):
+            raise NotADirectoryError("A file exists at the given path, expected a directory")
+        return
+
+    if os.path.isdir(path):
+        raise IsADirectoryError("A directory exists at the given path, expected a container file")
+    if file_format is FileFormat.CHUNKED or blob_store is not None:
+        raise ValueError('File format {} and blob store cannot be used together with a container '
+                         'file'.format(FileFormat.CHUNKED))
+
+
+def _finalize_saved_files(path, tmp_path, save_file_list, existing_content, manifest_entries, overwrite_permission,
+                          container):
+    """ Moves features, which were written into a temporary folder, into the EOPatch location together with the
+    manifest, replacing files of existing features which are overwritten
+
+    :param path: Location of EOPatch on disk
+    :type path: str
+    :param tmp_path: A temporary folder into which features were written
+    :type tmp_path: str
+    :param save_file_list: A list of savers of features which were written
+    :type save_file_list: list(_FileSaver)
+    :param existing_content: A dictionary describing content of existing EOPatch which will not be removed
+    :type existing_content: dict
+    :param manifest_entries: Entries of the manifest of the saved EOPatch
+    :type manifest_entries: list(dict)
+    :param overwrite_permission: A level of permission for overwriting an existing EOPatch
+    :type overwrite_permission: OverwritePermission
+    :param container: If `True` EOPatch is saved into a single container file
+    :type container: bool
+    """
+    if container:
+        _save_container(path, save_file_list, existing_content, manifest_entries)
+    elif not os.path.exists(path):
+        _save_manifest(tmp_path, manifest_entries)
+        os.renames(tmp_path, path)
+    elif overwrite_permission is OverwritePermission.OVERWRITE_PATCH:
+        _save_manifest(tmp_path, manifest_entries)
+        shutil.rmtree(path)
+        os.renames(tmp_path, path)
+    else:
+        _remove_manifest(path)
+        for file_saver in save_file_list:
+            existing_features = existing_content.get(file_saver.feature_type.value, {})
+            if file_saver.feature_name is None and isinstance(existing_features, _FileLoader):
+                existing_features.remove_file()
+            elif isinstance(existing_features, dict) and file_saver.feature_name in existing_features:
+                existing_features[file_saver.feature_name].remove_file()
+            os.renames(file_saver.tmp_filename, file_saver.final_filename)
+        _save_manifest(path, manifest_entries)
+
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+
+
+def _remove_manifest(path):
+    """ Removes a manifest file from the EOPatch folder if it exists
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+
+def _get_manifest_entries(path, save_file_list, existing_content):
+    """ Collects manifest entries of features which remain in the saved EOPatch and of features which are being
+    saved
+
+    :param path: Location of EOPatch on disk
+    :type path: str
+    :param save_file_list: A list of savers of features which are being saved
+    :type save_file_list: list(_FileSaver)
+    :param existing_content: A dictionary describing content of existing EOPatch which will not be removed
+    :type existing_content: dict
+    :return: A list of manifest entries
+    :rtype: list(dict)
+    """
+    existing_entries = {(entry['feature_type'], entry['feature_name']): entry for entry in _load_manifest(path) or []} \
+        if existing_content else {}
+
+    manifest_entries = {}
+    for feature_type_str, content in existing_content.items():
+        loaders = {None: content} if isinstance(content, _FileLoader) else content
+        for feature_name, loader in loaders.items():
+            feature_key = feature_type_str, feature_name
+            if feature_key in existing_entries:
+                manifest_entries[feature_key] = existing_entries[feature_key]
+                continue
+
+            manifest_entries[feature_key] = {
+                'feature_type': feature_type_str,
+                'feature_name': feature_name,
+                'filename': loader.filename,
+                'size': _get_file_size(loader.get_file_path())
+            }
+
+    for file_saver in save_file_list:
+        manifest_entries[file_saver.feature_type.value, file_saver.feature_name] = file_saver.get_manifest_entry(path)
+
+    return list(manifest_entries.values())
+
+
+def _get_file_size(path):
+    """ Returns a size of a file in bytes or a total size of all files in a folder
+    """
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+
+    return sum(os.path.getsize(os.path.join(path, filename)) for filename in os.listdir(path))
+
+
+def _can_save_as_datetime64(timestamps):
+    """ Checks if timestamps can be saved as an array of dtype `datetime64` without losing any information, i.e. if
+    they are all `datetime` objects without a timezone
+    """
+    return all(isinstance(timestamp, datetime.datetime) and timestamp.tzinfo is None for timestamp in timestamps)
+
+
+def _can_save_as_json(value):
+    """ Checks if a value can be saved as JSON and loaded back unchanged, i.e. if it consists only of dictionaries with
+    string keys, lists, strings, integers, finite floats, booleans and `None`
+    """
+    # pylint: disable=unidiomatic-typecheck
+    if isinstance(value, dict):
+        return type(value) in (dict, _FeatureDict) and \
+            all(type(key) is str and _can_save_as_json(item) for key, item in value.items())
+    if type(value) is list:
+        return all(_can_save_as_json(item) for item in value)
+    if type(value) is float:
+        return bool(np.isfinite(value))
+    return value is None or type(value) in (str, int, bool)
+
+
+def _get_index_selection(indices):
+    """ Returns a slice if the given indices are consecutive, otherwise the list of indices, which numpy would
+    interpret as advanced indexing
+    """
+    if indices and indices == list(range(indices[0], indices[0] + len(indices))):
+        return slice(indices[0], indices[-1] + 1)
+    return indices
+
+
+def _get_memory_storage(value):
+    """ Determines how a numpy array or a packed mask is kept in memory
+
+    :param value: A numpy array or a packed mask
+    :type value: numpy.ndarray or PackedMask
+    :rtype: MemoryStorage
+    """
+    if isinstance(value, PackedMask):
+        return MemoryStorage.PACKED
+
+    is_view = False
+    base = value
+    while base is not None:
+        if isinstance(base, (np.memmap, mmap_module.mmap)):
+            return MemoryStorage.MEMMAP
+        if base is not value and isinstance(base, np.ndarray):
+            is_view = True
+        base = getattr(base, 'base', None)
+
+    return MemoryStorage.VIEW if is_view else MemoryStorage.RESIDENT
+
+
+def _parse_pixel_pair(value, name):
+    """ Parses a number of pixels, which is either the same for rows and columns or given as a pair
+
+    :raises: ValueError
+    """
+    pair = (value, value) if isinstance(value, (int, np.integer)) else tuple(value)
+    if len(pair) != 2 or not all(isinstance(number, (int, np.integer)) for number in pair):
+        raise ValueError('Parameter {} should be an integer or a pair of integers, got {}'.format(name, value))
+    return tuple(int(number) for number in pair)
+
+
+def _get_window_bbox(bbox, raster_shape, pixel_window):
+    """ Calculates a bounding box of a spatial window of a raster
+
+    :param bbox: A bounding box of the entire raster
+    :type bbox: sentinelhub.BBox
+    :param raster_shape: Height and width of the raster
+    :type raster_shape: (int, int)
+    :param pixel_window: A pair of slices `(row_slice, col_slice)`, where rows are counted from the top of the raster
+    :type pixel_window: (slice, slice)
+    :return: A bounding box of the window
+    :rtype: sentinelhub.BBox
+    :raises: ValueError
+    """
+    rows, columns = [range(axis_size)[axis_slice] for axis_slice, axis_size in zip(pixel_window, raster_shape)]
+    if not rows or not columns:
+        raise ValueError('Pixel window {} of a raster with shape {} is empty'.format(pixel_window, raster_shape))
+
+    height, width = raster_shape
+    min_x, min_y, max_x, max_y = tuple(bbox)
+    x_resolution, y_resolution = (max_x - min_x) / width, (max_y - min_y) / height
+
+    return sentinelhub.BBox((min_x + columns[0] * x_resolution, max_y - (rows[-1] + 1) * y_resolution,
+                             min_x + (columns[-1] + 1) * x_resolution, max_y - rows[0] * y_resolution), crs=bbox.crs)
+
+
 class _FeatureDict(dict):
     """A dictionary structure that holds features of certain feature type.
 
     It checks that features have a correct and dimension. It also supports lazy loading by accepting a function as a
-    feature value, which is then called when the feature is accessed.
+    feature value, which is then called when the feature is accessed. Names of assigned features are collected in
+    `changed_features`. If a dtype policy is given, numpy arrays are cast according to it.
 
     :param feature_dict: A dictionary of feature names and values
     :type feature_dict: dict(str: object)
     :param feature_type: Type of features
     :type feature_type: FeatureType
+    :param dtype_policy: A policy of dtypes of numpy array features
+    :type dtype_policy: DtypePolicy or None
     """
-    def __init__(self, feature_dict, feature_type):
+    def __init__(self, feature_dict, feature_type, dtype_policy=None):
         super().__init__()
 
         self.feature_type = feature_type
         self.ndim = self.feature_type.ndim()
         self.is_vector = self.feature_type.is_vector()
+        self.changed_features = set()
+        self.dtype_policy = dtype_policy
 
         for feature_name, value in feature_dict.items():
             self[feature_name] = value
@@ -785,22 +2390,70 @@ class _FeatureDict(dict):
         transform value in correct form.
         """
         value = self._parse_feature_value(value)
+
+        feature_cache = getattr(self, 'feature_cache', None)
+        if feature_cache is not None:
+            feature_cache.discard(self, feature_name)
+
+        changed_features = getattr(self, 'changed_features', None)
+        if changed_features is not None:
+            changed_features.add(feature_name)
+
         super().__setitem__(feature_name, value)
 
     def __getitem__(self, feature_name, load=True):
         """Implements lazy loading."""
         value = super().__getitem__(feature_name)
+        feature_cache = getattr(self, 'feature_cache', None)
 
         if isinstance(value, _FileLoader) and load:
-            value = value.load()
-            self[feature_name] = value
+            loader = value
+            loaded_value = loader.load()
+            value = self._parse_feature_value(loaded_value)
+            super().__setitem__(feature_name, value)
+
+            if feature_cache is not None:
+                feature_cache.add(self, feature_name, loader, value)
+            if value is loaded_value:
+                loader.attach_digest(value)
+        elif feature_cache is not None:
+            feature_cache.touch(self, feature_name)
 
         return value
 
+    def __delitem__(self, feature_name):
+        feature_cache = getattr(self, 'feature_cache', None)
+        if feature_cache is not None:
+            feature_cache.discard(self, feature_name)
+
+        changed_features = getattr(self, 'changed_features', None)
+        if changed_features is not None:
+            if self.feature_type.is_meta():
+                changed_features.add(feature_name)
+            else:
+                changed_features.discard(feature_name)
+
+        super().__delitem__(feature_name)
+
     def get_dict(self):
         """Returns a Python dictionary of features and value."""
         return dict(self)
 
+    def set_dtype_policy(self, dtype_policy):
+        """ Sets a dtype policy and applies it to features which are already loaded. Features which are cast are
+        assigned again and therefore marked as changed.
+
+        :param dtype_policy: A policy of dtypes of numpy array features
+        :type dtype_policy: DtypePolicy or None
+        """
+        self.dtype_policy = dtype_policy
+        if dtype_policy is None or not self.ndim:
+            return
+
+        for feature_name, value in list(dict.items(self)):
+            if isinstance(value, np.ndarray) and dtype_policy.get_dtype(self.feature_type, value) != value.dtype:
+                self[feature_name] = value
+
     def _parse_feature_value(self, value):
         """ Checks if value fits the feature type. If not it tries to fix it or raise an error
 
@@ -812,6 +2465,12 @@ class _FeatureDict(dict):
             return value
 
         if self.ndim:
+            if isinstance(value, PackedMask) and self.feature_type in (FeatureType.MASK, FeatureType.MASK_TIMELESS):
+                if value.ndim != self.ndim:
+                    raise ValueError('Packed mask of {} feature has to have {} '
+                                     'dimensions'.format(self.feature_type, self.ndim))
+                return value
+
             if not isinstance(value, np.ndarray):
                 raise ValueError('{} feature has to be a numpy array'.format(self.feature_type))
             if value.ndim != self.ndim:
@@ -834,7 +2493,9 @@ class _FeatureDict(dict):
             #         raise ValueError('{} is a floating feature type therefore dtype of data has to be a subtype of '
             #                          'numpy.floating or numpy.float, found type {}'.format(self.feature_type,
             #                                                                                value.dtype.type))
-            return value
+
+            dtype_policy = getattr(self, 'dtype_policy', None)
+            return value if dtype_policy is None else dtype_policy.apply(self.feature_type, value)
 
         if self.is_vector:
             if isinstance(value, gpd.GeoSeries):
@@ -854,10 +2515,98 @@ class _FeatureDict(dict):
         return value
 
 
+class _FeatureCache:
+    """ Keeps track of numpy array features which were lazily loaded into _FeatureDict classes. Once the total size
+    of loaded features exceeds the memory budget, the least recently used features are replaced back with their
+    _FileLoader classes. Tracked arrays are made read-only, so that a feature can only be modified by assigning a new
+    value, which stops its tracking.
+    """
+    def __init__(self, memory_budget):
+        """
+        :param memory_budget: Maximal number of bytes of tracked features
+        :type memory_budget: int
+        """
+        self.memory_budget = memory_budget
+        self.size = 0
+        self._entries = collections.OrderedDict()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def add(self, feature_dict, feature_name, loader, value):
+        """ Starts tracking a loaded feature and unloads least recently used features if memory budget is exceeded
+        """
+        if not isinstance(value, np.ndarray):
+            return
+
+        if value.flags.writeable:
+            value.flags.writeable = False
+
+        key = id(feature_dict), feature_name
+        self.discard(feature_dict, feature_name)
+        self._entries[key] = feature_dict, feature_name, loader, value
+        self.size += value.nbytes
+
+        self._unload_features()
+
+    def touch(self, feature_dict, feature_name):
+        """ Marks a feature as the most recently used one
+        """
+        key = id(feature_dict), feature_name
+        if key in self._entries:
+            self._entries.move_to_end(key)
+
+    def discard(self, feature_dict, feature_name):
+        """ Stops tracking a feature, e.g. because it was modified
+        """
+        entry = self._entries.pop((id(feature_dict), feature_name), None)
+        if entry is not None:
+            self.size -= entry[-1].nbytes
+
+    def _unload_features(self):
+        """ Unloads least recently used features until the memory budget is satisfied, the most recently used one is
+        always kept
+        """
+        while self.size > self.memory_budget and len(self._entries) > 1:
+            _, (feature_dict, feature_name, loader, value) = self._entries.popitem(last=False)
+            self.size -= value.nbytes
+
+            if dict.get(feature_dict, feature_name) is value:
+                LOGGER.debug('Unloading feature (%s, %s) from memory', feature_dict.feature_type, feature_name)
+                dict.__setitem__(feature_dict, feature_name, loader)
+
+
+def _parse_memory_size(memory_size):
+    """ Parses a memory size given as a number of bytes or as a string with units, e.g. `'4GB'`
+
+    :param memory_size: A memory size
+    :type memory_size: int or str
+    :return: Number of bytes
+    :rtype: int
+    :raises: ValueError
+    """
+    if isinstance(memory_size, str):
+        units = {'': 1, 'B': 1, 'KB': 2 ** 10, 'MB': 2 ** 20, 'GB': 2 ** 30, 'TB': 2 ** 40}
+        value = memory_size.strip().upper().replace('IB', 'B')
+        unit = value.lstrip('0123456789. ')
+        number = value[:len(value) - len(unit)].strip()
+
+        if unit not in units or not number:
+            raise ValueError('Cannot parse memory size {}, expected a string such as 4GB'.format(memory_size))
+        memory_size = float(number) * units[unit]
+
+    if memory_size < 0:
+        raise ValueError('Memory size cannot be negative, got {}'.format(memory_size))
+    return int(memory_size)
+
+
 class _FileLoader:
     """ Class taking care for loading objects from disk. Its purpose is to support lazy loading
     """
-    def __init__(self, patch_path, filename, mmap=False):
+    def __init__(self, patch_path, filename, mmap=False, window=None, digest=None):
         """
         :param patch_path: Location of EOPatch on disk
         :type patch_path: str
@@ -865,10 +2614,20 @@ class _FileLoader:
         :type filename: str
         :param mmap: In case of npy files the tile can be loaded as memory map
         :type mmap: bool
+        :param window: A tuple of slices, integers or lists of indices which selects only a part of a numpy array
+            feature, e.g. `(slice(-5, None), slice(100, 200), slice(100, 200), [1, 2, 3])` selects last 5 time frames
+            of a 100 x 100 pixel window and 3 bands. Only the selected part is read from disk, except for pickled and
+            Fortran-ordered arrays. In case of a list feature (i.e. timestamps) only the first element of the window is
+            applied. By default the entire feature is loaded.
+        :type window: tuple(slice or int or list(int)) or None
+        :param digest: A digest of the saved numpy array, as written in the manifest file
+        :type digest: str or None
         """
         self.patch_path = patch_path
         self.filename = filename
         self.mmap = mmap
+        self.window = window
+        self.digest = digest
 
     def __repr__(self):
         return '{}({})'.format(self.__class__.__name__, self.get_file_path())
@@ -883,16 +2642,36 @@ class _FileLoader:
         """
         return os.path.join(self.patch_path, self.filename)
 
+    def remove_file(self):
+        """ Removes the file (or a folder in case of chunked format) from where feature would be loaded
+        """
+        path = self.get_file_path()
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def attach_digest(self, value):
+        """ Attaches the digest of the saved array to a loaded array, so that it can be compared with other arrays
+        without reading its values. The digest is attached only if the entire array was loaded and is read-only, e.g.
+        memory-mapped.
+
+        :param value: A value loaded by this loader
+        :type value: object
+        """
+        if self.digest is not None and self.window is None and isinstance(value, np.ndarray):
+            set_array_digest(value, self.digest)
+
     @staticmethod
-    def _correctly_load_bbox(bbox, path, is_zipped=False):
+    def _correctly_load_bbox(bbox, path, codec=None):
         """ Helper method for loading old version of pickled BBox object
 
         :param bbox: BBox object which was incorrectly loaded with pickle
         :type bbox: sentinelhub.BBox
         :param path: Path to file where BBox object is stored
         :type path: str
-        :param is_zipped: `True` if file is zipped and `False` otherwise
-        :type is_zipped: bool
+        :param codec: A codec with which the file is compressed or `None` if file is not compressed
+        :type codec: Codec or None
         :return: Correctly loaded BBox object
         :rtype: sentinelhub.BBox
         """
@@ -900,7 +2679,7 @@ class _FileLoader:
                       "anymore. Please save bounding box again, you can overwrite the existing one", DeprecationWarning,
                       stacklevel=4)
 
-        with open(gzip.open(path) if is_zipped else path, 'rb') as pickle_file:
+        with codec.open(path, 'rb') if codec else open(path, 'rb') as pickle_file:
             crs_cnt = -1
             for _, arg, _ in pickletools.genops(pickle_file):
                 if arg == 'sentinelhub.constants CRS':
@@ -912,65 +2691,237 @@ class _FileLoader:
         raise ValueError('Failed to correctly load BBox object, try downgrading sentinelhub package to <=2.4.7')
 
     def load(self):
-        """ Method which loads data from the file
+        """ Method which loads data from the file. If loader has a window only the selected part of data is loaded.
         """
         # pylint: disable=too-many-return-statements
+        path = self._get_existing_file_path()
+        file_formats = FileFormat.split_by_extensions(path)[1:]
+
+        if file_formats and file_formats[-1] is FileFormat.CHUNKED:
+            return load_chunked_array(path, window=self.window)
+
+        if not file_formats or file_formats[-1] is FileFormat.PICKLE:
+            return self._load_pickle(path, self._detect_codec(path) if not file_formats else None)
+
+        if file_formats[-1] is FileFormat.PACKED_BITS:
+            with self._open(path) as infile:
+                return load_packed_bits_array(infile, window=self.window)
+
+        if file_formats[-1] is FileFormat.NPY:
+            return self._load_npy(path)
+
+        if file_formats[-1] in (FileFormat.JSON, FileFormat.COLUMNAR):
+            return self._load_document(path, file_formats[-1])
+
+        if file_formats[-1].is_compression():
+            codec = get_codec_by_file_format(file_formats[-1])
+
+            if len(file_formats) > 1 and file_formats[-2] is FileFormat.NPY:
+                return read_compressed_npy_array(functools.partial(self._open, path, codec), window=self.window)
+
+            if len(file_formats) > 1 and file_formats[-2] is FileFormat.PACKED_BITS:
+                with self._open(path, codec) as infile:
+                    return load_packed_bits_array(infile, window=self.window)
+
+            if len(file_formats) > 1 and file_formats[-2] in (FileFormat.JSON, FileFormat.COLUMNAR):
+                return self._load_document(path, file_formats[-2], codec)
+
+            if len(file_formats) == 1 or file_formats[-2] is FileFormat.PICKLE:
+                return self._load_pickle(path, codec)
+
+        raise ValueError('Could not load data from unsupported file format {}'.format(file_formats[-1]))
+
+    @staticmethod
+    def _open(path, codec=None):
+        """ Opens a file for reading, optionally decompressing it with a given codec
+
+        :return: A binary file object
+        """
+        return codec.open(path, 'rb') if codec else open(path, 'rb')
+
+    @staticmethod
+    def _detect_codec(path):
+        """ Detects a codec with which a file without a compression extension is compressed
+        """
+        return detect_codec(path)
+
+    def _load_npy(self, path):
+        """ Loads an array from an uncompressed npy file
+        """
+        if self.window is not None:
+            return load_npy_array(path, window=self.window, mmap=self.mmap)
+        if self.mmap:
+            return np.load(path, mmap_mode='r')
+        return np.load(path)
+
+    def _load_pickle(self, path, codec=None):
+        """ Loads a pickled object from a file, which is optionally compressed with a given codec
+        """
+        with self._open(path, codec) as infile:
+            data = pickle.load(infile)
+
+        if isinstance(data, sentinelhub.BBox) and not hasattr(data, 'crs'):
+            return self._correctly_load_bbox(data, path, codec=codec)
+        return self._apply_window(data)
+
+    def _load_document(self, path, file_format, codec=None):
+        """ Loads a JSON document or a vector feature in columnar format from a file, which is optionally compressed
+        with a given codec
+        """
+        with self._open(path, codec) as infile:
+            if file_format is FileFormat.JSON:
+                return json.loads(infile.read().decode('utf-8'))
+            return self._apply_window(load_dataframe(infile))
+
+    def load_shape(self):
+        """ Loads the shape of a saved numpy array feature. For npy files and chunked format only the header of the
+        file is read. The window of the loader is not applied.
+
+        :return: Shape of the saved array
+        :rtype: tuple(int)
+        """
+        header = self.load_header()
+        if header is not None:
+            return header[0]
+
+        loader = copy.copy(self)
+        loader.window = None
+        return np.shape(loader.load())
+
+    def load_header(self):
+        """ Reads shape and dtype of a saved numpy array feature from the header of the file, without reading any array
+        data. In case of compressed npy files only the first bytes of the file are decompressed. The window of the
+        loader is not applied.
+
+        :return: Shape and dtype of the saved array or `None` if the file format has no header (i.e. pickle)
+        :rtype: (tuple(int), numpy.dtype) or None
+        """
+        path = self._get_existing_file_path()
+        file_formats = FileFormat.split_by_extensions(path)[1:]
+
+        if file_formats and file_formats[-1] is FileFormat.CHUNKED:
+            header = load_chunked_header(path)
+            return tuple(header['shape']), np.dtype(header['dtype'])
+
+        if file_formats and file_formats[-1] in (FileFormat.NPY, FileFormat.PACKED_BITS):
+            with self._open(path) as infile:
+                shape, _, dtype = read_npy_header(infile)
+                return shape, dtype
+
+        if len(file_formats) > 1 and file_formats[-1].is_compression() and \
+                file_formats[-2] in (FileFormat.NPY, FileFormat.PACKED_BITS):
+            with self._open(path, get_codec_by_file_format(file_formats[-1])) as infile:
+                shape, _, dtype = read_npy_header(infile)
+                return shape, dtype
+
+        return None
+
+    def _get_existing_file_path(self):
+        """ Returns file path from where feature will be loaded and checks that it exists
+
+        :raises: OSError
+        """
         if not os.path.isdir(self.patch_path):
             raise OSError('EOPatch does not exist in path {} anymore'.format(self.patch_path))
 
         path = self.get_file_path()
         if not os.path.exists(path):
-            raise OSError('Feature in path {} does not exist anymore'.format(path))
+            raise FileNotFoundError('Feature in path {} does not exist anymore'.format(path))
 
-        file_formats = FileFormat.split_by_extensions(path)[1:]
+        return path
 
-        if not file_formats or file_formats[-1] is FileFormat.PICKLE:
-            with open(path, "rb") as infile:
-                data = pickle.load(infile)
+    def _apply_window(self, data):
+        """ Applies the window of the loader on data which has been loaded in full
+        """
+        if self.window is None:
+            return data
 
-                if isinstance(data, sentinelhub.BBox) and not hasattr(data, 'crs'):
-                    return self._correctly_load_bbox(data, path)
-                return data
+        if isinstance(data, np.ndarray):
+            return apply_window(data, self.window)
 
-        if file_formats[-1] is FileFormat.NPY:
-            if self.mmap:
-                return np.load(path, mmap_mode='r')
-            return np.load(path)
+        if isinstance(data, list):
+            indices = np.arange(len(data))[normalize_window(self.window[:1], (len(data),))[0]]
+            return [data[idx] for idx in indices]
 
-        if file_formats[-1] is FileFormat.GZIP:
-            if file_formats[-2] is FileFormat.NPY:
-                return np.load(gzip.open(path))
+        return data
 
-            if len(file_formats) == 1 or file_formats[-2] is FileFormat.PICKLE:
-                data = pickle.load(gzip.open(path))
 
-                if isinstance(data, sentinelhub.BBox) and not hasattr(data, 'crs'):
-                    return self._correctly_load_bbox(data, path, is_zipped=True)
-                return data
+class _ContainerFileLoader(_FileLoader):
+    """ Class taking care for loading objects from members of a container file of a saved EOPatch. Uncompressed npy
+    members are memory-mapped at their offset in the container, other members are read as streams. Members are looked
+    up in the container each time they are loaded, because the container could have been written again since.
 
-        raise ValueError('Could not load data from unsupported file format {}'.format(file_formats[-1]))
+    Parameter `patch_path` is the location of the container file and `filename` is also the name of a container member.
+    """
+
+    def get_member_name(self):
+        """ Returns the name of the container member
+        """
+        return self.filename.replace(os.sep, '/')
+
+    def remove_file(self):
+        """ Members cannot be removed from a container, the container has to be written again instead
+        """
+        raise ValueError('Feature {} cannot be removed from a container file'.format(self.filename))
+
+    def _get_existing_file_path(self):
+        """ Returns the path of the member and checks that the container exists
+
+        :raises: OSError
+        """
+        if not os.path.isfile(self.patch_path):
+            raise OSError('EOPatch container does not exist in path {} anymore'.format(self.patch_path))
+        return self.get_file_path()
+
+    @contextlib.contextmanager
+    def _open(self, path, codec=None):
+        with open_container_member(self.patch_path, self.get_member_name()) as member:
+            if codec is None:
+                yield member
+            else:
+                with codec.open(member, 'rb') as infile:
+                    yield infile
+
+    def _detect_codec(self, path):
+        with open_container_member(self.patch_path, self.get_member_name()) as member:
+            return detect_stream_codec(member)
+
+    def _load_npy(self, path):
+        offset, _ = get_member_location(self.patch_path, self.get_member_name())
+        return load_npy_array(self.patch_path, window=self.window, mmap=self.mmap, offset=offset)
 
 
 class _FileSaver:
     """ Class taking care for saving feature to disk
     """
-    def __init__(self, path, tmp_path, feature_type, feature_name, file_format, compress_level):
+    def __init__(self, path, tmp_path, feature_type, feature_name, file_format, compress_level, codec=None,
+                 quantization=None, summarize=False, compute_digest=False):
         self.feature_type = feature_type
         self.feature_name = feature_name
         self.file_format = file_format
         self.compress_level = compress_level
+        self.codec = codec
+        self.quantization = quantization
+        self.summarize = summarize
+        self.compute_digest = compute_digest
 
         self.final_filename = self.get_file_path(path)
         self.tmp_filename = self.get_file_path(tmp_path)
 
+        self.data_info = {}
+        self.blob = None
+
     def get_file_path(self, path):
         """ Creates a filename with file path
         """
         feature_filename = self._get_filename_path(path)
 
         feature_filename += self.file_format.extension()
-        if self.compress_level:
-            feature_filename += FileFormat.GZIP.extension()
+        if self.codec is not None and self.file_format is not FileFormat.CHUNKED:
+            if self.codec.file_format is None:
+                raise ValueError('Codec {} can only be used with file format '
+                                 '{}'.format(self.codec.name, FileFormat.CHUNKED))
+            feature_filename += self.codec.file_format.extension()
 
         return feature_filename
 
@@ -984,7 +2935,7 @@ class _FileSaver:
 
         return feature_filename
 
-    def save(self, eopatch, use_tmp=True):
+    def save(self, eopatch, use_tmp=True, workers=1, blob_store=None):
         """ Method which does the saving
 
         :param eopatch: EOPatch containing the data which will be saved
@@ -992,9 +2943,20 @@ class _FileSaver:
         :param use_tmp: If `True` data will be saved to temporary file, otherwise it will be saved to intended
         (i.e. final) location
         :type use_tmp: bool
+        :param workers: Number of threads used to compress chunks in case of chunked file format
+        :type workers: int or None
+        :param blob_store: A store into which saved files are added
+        :type blob_store: BlobStore or None
         """
         filename = self.tmp_filename if use_tmp else self.final_filename
+        self._save_data(eopatch, filename, workers)
 
+        if blob_store is not None:
+            self.blob = blob_store.add(filename)
+
+    def _save_data(self, eopatch, filename, workers):
+        """ Saves data of the feature into the given file or a folder in case of chunked format
+        """
         if self.feature_name is None:
             data = eopatch[self.feature_type]
             if self.feature_type.has_dict():
@@ -1005,11 +2967,23 @@ class _FileSaver:
         else:
             data = eopatch[self.feature_type][self.feature_name]
 
+        self.data_info = self._get_data_info(data)
+
+        if self.feature_type is FeatureType.TIMESTAMP and self.file_format is FileFormat.NPY:
+            data = TimeIndex(data).values
+
         file_dir = os.path.dirname(filename)
         os.makedirs(file_dir, exist_ok=True)
 
-        if self.compress_level:
-            file_handle = gzip.GzipFile(filename, 'w', self.compress_level)
+        if self.file_format is FileFormat.CHUNKED:
+            LOGGER.debug("Saving (%s, %s) to %s", str(self.feature_type), str(self.feature_name), filename)
+            save_chunked_array(filename, data, chunk_shape=self._get_chunk_shape(data.shape),
+                               compress_level=self.compress_level, codec=self.codec,
+                               quantization=self.quantization, workers=workers)
+            return
+
+        if self.codec is not None:
+            file_handle = self.codec.open(filename, 'wb', self.compress_level or None)
         else:
             file_handle = open(filename, 'wb')
 
@@ -1018,8 +2992,81 @@ class _FileSaver:
 
             if self.file_format is FileFormat.NPY:
                 np.save(outfile, data)
+            elif self.file_format is FileFormat.PACKED_BITS:
+                save_packed_bits_array(outfile, data)
+            elif self.file_format is FileFormat.JSON:
+                outfile.write(json.dumps(data).encode('utf-8'))
+            elif self.file_format is FileFormat.COLUMNAR:
+                save_dataframe(outfile, data)
             elif self.file_format is FileFormat.PICKLE:
                 pickle.dump(data, outfile)
             else:
                 ValueError('File {} was not saved because saving in file format {} is currently not '
                            'supported'.format(filename, self.file_format))
+
+    def get_manifest_entry(self, path):
+        """ Returns an entry describing the saved feature in the manifest file. It should be called after the
+        feature has been saved.
+
+        :param path: Location of EOPatch on disk
+        :type path: str
+        :return: A manifest entry
+        :rtype: dict
+        """
+        entry = {
+            'feature_type': self.feature_type.value,
+            'feature_name': self.feature_name,
+            'filename': os.path.relpath(self.final_filename, path),
+            'file_format': [file_format.value for file_format in
+                            FileFormat.split_by_extensions(os.path.basename(self.final_filename))[1:]],
+            'size': _get_file_size(self.tmp_filename if os.path.exists(self.tmp_filename) else self.final_filename)
+        }
+        entry.update(self.data_info)
+        if self.blob is not None:
+            entry['blob'] = self.blob
+        return entry
+
+    def _get_data_info(self, data):
+        """ Collects information about data which is stored in the manifest file
+        """
+        if self.feature_type is FeatureType.BBOX:
+            return {
+                'bbox': [float(coord) for coord in data[:4]],
+                'crs': data[4]
+            }
+        if isinstance(data, (np.ndarray, PackedMask)):
+            data_info = {
+                'shape': list(data.shape),
+                'dtype': data.dtype.str
+            }
+            digest = get_array_digest(data, compute=self.compute_digest) \
+                if isinstance(data, np.ndarray) and self.quantization is None else None
+            if digest is not None:
+                data_info['digest'] = digest
+            if self.summarize and self.feature_type.is_raster():
+                summary = summarize_array(data, time_dependent=self.feature_type.is_time_dependent(),
+                                          is_mask=self.feature_type in (FeatureType.MASK, FeatureType.MASK_TIMELESS))
+                if summary is not None:
+                    data_info['summary'] = summary
+            return data_info
+        if isinstance(data, (list, gpd.GeoDataFrame)):
+            return {
+                'length': len(data)
+            }
+        return {}
+
+    def _get_chunk_shape(self, shape):
+        """ Chunks of time-dependent features contain a single time frame and chunks of spatial features contain a
+        spatial tile of at most `DEFAULT_TILE_SIZE` x `DEFAULT_TILE_SIZE` pixels
+        """
+        chunk_shape = list(shape)
+
+        if self.feature_type.is_time_dependent():
+            chunk_shape[0] = 1
+
+        if self.feature_type.is_spatial():
+            height_axis = 1 if self.feature_type.is_time_dependent() else 0
+            chunk_shape[height_axis] = DEFAULT_TILE_SIZE
+            chunk_shape[height_axis + 1] = DEFAULT_TILE_SIZE
+
+        return tuple(chunk_shape)
@@ -10,10 +10,15 @@ If the input graph is cyclic, the workflow raises a `CyclicDependencyError`.
 The result of a workflow execution is an immutable mapping from tasks to results. The result contains tasks with
 zero out-degree (i.e. terminal tasks).
 
+By default tasks are executed one after another. With parameter `workers` of `EOWorkflow.execute` independent branches
+of the graph are executed concurrently in a pool of threads, which is useful for tasks which release the GIL, e.g. most
+numpy, scikit-image and OpenCV computations.
+
 The workflow can be exported to a DOT description language and visualized.
 """
 
 import collections
+import concurrent.futures
 import logging
 import warnings
 import uuid
@@ -149,7 +154,7 @@ class EOWorkflow:
 
         return LinearWorkflow(*tasks, **kwargs)
 
-    def execute(self, input_args=None, monitor=False):
+    def execute(self, input_args=None, monitor=False, workers=1):
         """Executes the workflow.
 
         :param input_args: External input arguments to the workflow. They have to be in a form of a dictionary where
@@ -157,6 +162,11 @@ class EOWorkflow:
         :type input_args: dict(EOTask: dict(str: object) or tuple(object))
         :param monitor: If True workflow execution will be monitored
         :type monitor: bool
+        :param workers: Maximal number of tasks executed at the same time. If it is `1` tasks are executed sequentially
+            in the calling thread. Otherwise each task is started in a pool of threads as soon as all its input tasks
+            have finished. If it is `None` the number of threads is chosen by
+            `concurrent.futures.ThreadPoolExecutor`.
+        :type workers: int or None
         :return: An immutable mapping containing results of terminal tasks
         :rtype: WorkflowResults
         """
@@ -164,7 +174,11 @@ class EOWorkflow:
 
         input_args = self.parse_input_args(input_args)
 
-        _, intermediate_results = self._execute_tasks(input_args=input_args, out_degs=out_degs, monitor=monitor)
+        if workers == 1:
+            _, intermediate_results = self._execute_tasks(input_args=input_args, out_degs=out_degs, monitor=monitor)
+        else:
+            intermediate_results = self._execute_tasks_concurrently(input_args=input_args, out_degs=out_degs,
+                                                                    monitor=monitor, workers=workers)
 
         return WorkflowResults(intermediate_results)
 
@@ -213,6 +227,61 @@ class EOWorkflow:
 
         return done_tasks, intermediate_results
 
+    def _execute_tasks_concurrently(self, *, input_args, out_degs, monitor, workers):
+        """Executes tasks comprising the workflow in a pool of threads. A task is submitted as soon as all tasks it
+        depends on have finished. Results are collected and dependencies are relaxed in the calling thread.
+
+        :param input_args: External input arguments to the workflow.
+        :type input_args: Dict
+        :param out_degs: Dictionary mapping vertices (task IDs) to their out-degrees. (The out-degree equals the number
+        of tasks that depend on this task.)
+        :type out_degs: Dict
+        :param workers: Maximal number of threads
+        :type workers: int or None
+        :return: A dictionary containing results of terminal tasks
+        :rtype: dict
+        """
+        in_degrees = dict(self.dag.get_indegrees())
+        ready_dependencies = [dep for dep in self.ordered_dependencies if in_degrees[dep] == 0]
+
+        intermediate_results = {}
+        running_futures = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                while ready_dependencies or running_futures:
+                    for dep in ready_dependencies:
+                        inputs = {input_dep: intermediate_results[input_dep] for input_dep in self._get_inputs(dep)}
+                        future = executor.submit(self._execute_task, dependency=dep, input_args=input_args,
+                                                 intermediate_results=inputs, monitor=monitor)
+                        running_futures[future] = dep
+                    ready_dependencies = []
+
+                    done_futures, _ = concurrent.futures.wait(running_futures,
+                                                              return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done_futures:
+                        dep = running_futures.pop(future)
+                        intermediate_results[dep] = future.result()
+
+                        self._relax_dependencies(dependency=dep,
+                                                 out_degrees=out_degs,
+                                                 intermediate_results=intermediate_results)
+
+                        for next_dep in self.dag[dep]:
+                            in_degrees[next_dep] -= 1
+                            if in_degrees[next_dep] == 0:
+                                ready_dependencies.append(next_dep)
+            except BaseException:
+                for future in running_futures:
+                    future.cancel()
+                raise
+
+        return intermediate_results
+
+    def _get_inputs(self, dependency):
+        """Returns dependencies of input tasks of the given dependency."""
+        return [self.uuid_dict[input_task.private_task_config.uuid] for input_task in dependency.inputs]
+
     def _execute_task(self, *, dependency, input_args, intermediate_results, monitor):
         """Executes a task of the workflow.
 
@@ -0,0 +1,180 @@
+"""
+The frame_predicates module implements conditions on time frames of saved EOPatches, which are evaluated before
+EOPatches are loaded.
+
+A predicate receives a description of a saved EOPatch (see `EOPatch.describe`) and decides for each time frame if it
+will be loaded. It only reads small features, such as timestamps, a cloud mask or a scalar feature, or it uses summaries
+of features written into the manifest by `EOPatch.save` with `summaries=True`, in which case it doesn't read any
+feature at all. A predicate is given to `LoadFromDisk` as parameter `frame_filter`, which then reads only the selected
+time frames of all features, e.g. with memory-mapped npy files or chunked format only the selected frames are read from
+disk. Predicates can be combined with operators `&` and `|`.
+
+Example:
+
+.. code-block:: python
+
+    frame_filter = TimeIntervalPredicate('2018-04-01', '2018-09-30') & \\
+        MaxFractionPredicate((FeatureType.MASK, 'CLM'), max_fraction=0.1)
+    load_task = LoadFromDisk('path/to/eopatches', mmap=True, frame_filter=frame_filter)
+"""
+
+import numpy as np
+
+from .constants import FeatureType
+from .eodata import EOPatch
+from .time_index import to_datetime64
+from .utilities import FeatureParser
+
+MASK_BLOCK_SIZE = 2 ** 24
+
+
+class FramePredicate:
+    """ A base class of conditions on time frames of a saved EOPatch
+    """
+    def __call__(self, description):
+        """
+        :param description: A description of the saved EOPatch
+        :type description: EOPatchDescription
+        :return: A list of booleans, one for each time frame, which are `True` for frames which satisfy the condition
+        :rtype: list(bool)
+        """
+        return np.asarray(self.evaluate(description), dtype=bool).tolist()
+
+    def evaluate(self, description):
+        """ Evaluates the condition on each time frame of the saved EOPatch
+
+        :param description: A description of the saved EOPatch
+        :type description: EOPatchDescription
+        :return: An array of booleans, one for each time frame
+        :rtype: numpy.ndarray
+        """
+        raise NotImplementedError
+
+    def __and__(self, other):
+        return _CombinedPredicate(np.logical_and, self, other)
+
+    def __or__(self, other):
+        return _CombinedPredicate(np.logical_or, self, other)
+
+
+class _CombinedPredicate(FramePredicate):
+    """ A combination of two predicates with a logical operation
+    """
+    def __init__(self, operation, first_predicate, second_predicate):
+        self.operation = operation
+        self.first_predicate = first_predicate
+        self.second_predicate = second_predicate
+
+    def evaluate(self, description):
+        return self.operation(self.first_predicate.evaluate(description), self.second_predicate.evaluate(description))
+
+
+class TimeIntervalPredicate(FramePredicate):
+    """ Selects time frames with timestamps inside a time interval. Only timestamps of the saved EOPatch are read.
+    """
+    def __init__(self, start_time=None, end_time=None):
+        """
+        :param start_time: Start of the interval, which is included. `None` means no lower bound.
+        :type start_time: datetime.datetime or str or None
+        :param end_time: End of the interval, which is included. `None` means no upper bound.
+        :type end_time: datetime.datetime or str or None
+        """
+        self.start_time = None if start_time is None else to_datetime64([start_time])[0]
+        self.end_time = None if end_time is None else to_datetime64([end_time])[0]
+
+    def evaluate(self, description):
+        timestamps = to_datetime64(EOPatch.load(description.path, features=FeatureType.TIMESTAMP).timestamp)
+
+        selection = np.ones(len(timestamps), dtype=bool)
+        if self.start_time is not None:
+            selection &= timestamps >= self.start_time
+        if self.end_time is not None:
+            selection &= timestamps <= self.end_time
+        return selection
+
+
+class MaxFractionPredicate(FramePredicate):
+    """ Selects time frames in which the fraction of non-zero values of a mask is at most a given value, e.g. frames
+    with cloud coverage under a threshold
+
+    If the mask was saved with summaries, fractions are taken from the manifest. Otherwise the mask is read in blocks
+    of consecutive time frames, therefore it is never loaded into memory as a whole. Only the frames of each block are
+    read from memory-mapped npy files and from chunked format, while compressed files are decompressed from the start
+    up to the last frame of each block.
+    """
+    def __init__(self, mask_feature, max_fraction, block_size=MASK_BLOCK_SIZE):
+        """
+        :param mask_feature: A time-dependent mask feature, e.g. `(FeatureType.MASK, 'CLM')`
+        :type mask_feature: (FeatureType, str)
+        :param max_fraction: Maximal fraction of non-zero values in a selected time frame, between 0 and 1
+        :type max_fraction: float
+        :param block_size: Maximal number of bytes of the mask loaded at once if the mask was saved without summaries.
+            A block always contains at least one time frame.
+        :type block_size: int
+        """
+        self.mask_feature = next(FeatureParser(mask_feature, allowed_feature_types=[FeatureType.MASK])())
+        self.max_fraction = max_fraction
+        self.block_size = block_size
+
+    def evaluate(self, description):
+        return np.array(self._get_fractions(description)) <= self.max_fraction
+
+    def _get_fractions(self, description):
+        """ Collects fractions of non-zero values of each time frame of the mask
+        """
+        feature_description = description.get_feature(*self.mask_feature)
+        summary = feature_description.summary
+        if summary is not None and 'frames' in summary:
+            return [frame['true_fraction'] for frame in summary['frames']]
+
+        frame_count = description.get_feature(FeatureType.TIMESTAMP).length if feature_description.shape is None \
+            else feature_description.shape[0]
+        frames_per_block = 1
+        if feature_description.nbytes and frame_count:
+            frames_per_block = max(self.block_size * frame_count // feature_description.nbytes, 1)
+
+        fractions = []
+        for start_frame in range(0, frame_count, frames_per_block):
+            mask = self._load_mask(description.path, slice(start_frame, start_frame + frames_per_block))
+            fractions.extend(np.count_nonzero(frame) / frame.size if frame.size else 0 for frame in mask)
+        return fractions
+
+    def _load_mask(self, path, time_slice):
+        """ Loads the given time frames of the mask
+        """
+        feature_type, feature_name = self.mask_feature
+        return EOPatch.load(path, features=[self.mask_feature], mmap=True, time_slice=time_slice)[feature_type][
+            feature_name]
+
+
+class ScalarThresholdPredicate(FramePredicate):
+    """ Selects time frames in which a band of a scalar feature lies within given bounds, e.g. frames with a sufficient
+    fraction of valid data, which was computed by another workflow. Only the scalar feature is read.
+    """
+    def __init__(self, scalar_feature, min_value=None, max_value=None, band=0):
+        """
+        :param scalar_feature: A feature of type `FeatureType.SCALAR`
+        :type scalar_feature: (FeatureType, str)
+        :param min_value: Minimal value, which is included. `None` means no lower bound.
+        :type min_value: float or None
+        :param max_value: Maximal value, which is included. `None` means no upper bound.
+        :type max_value: float or None
+        :param band: Index of the band of the scalar feature
+        :type band: int
+        """
+        self.scalar_feature = next(FeatureParser(scalar_feature, allowed_feature_types=[FeatureType.SCALAR])())
+        self.min_value = min_value
+        self.max_value = max_value
+        self.band = band
+
+    def evaluate(self, description):
+        feature_type, feature_name = self.scalar_feature
+        eopatch = EOPatch.load(description.path, features=[self.scalar_feature])
+        values = eopatch[feature_type][feature_name][:, self.band]
+
+        selection = ~np.isnan(values) if np.issubdtype(values.dtype, np.floating) else np.ones(values.shape, bool)
+        if self.min_value is not None:
+            selection &= values >= self.min_value
+        if self.max_value is not None:
+            selection &= values <= self.max_value
+        return selection
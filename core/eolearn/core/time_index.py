@@ -0,0 +1,195 @@
+"""
+The time_index module contains a time index of EOPatch timestamps, which is backed by a numpy array of dtype
+`datetime64[us]`. Lookups and set operations of the index are vectorised and work on sorted arrays.
+"""
+
+import re
+import datetime
+
+import dateutil.parser
+import numpy as np
+
+TIME_INDEX_DTYPE = np.dtype('datetime64[us]')
+
+_ISO_TIMESTAMP_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?)?$')
+
+
+class TimeIndex:
+    """ An index of timestamps of time frames
+
+    The index keeps timestamps in the order of time frames, while lookups and set operations use a sorted view of
+    timestamps, therefore they take O(n log n) time. Timezone-aware timestamps are converted to UTC.
+
+    :param timestamps: A collection of timestamps, given as `datetime` objects, ISO formatted strings or numpy
+        `datetime64` values
+    :type timestamps: list(datetime.datetime or str) or numpy.ndarray or TimeIndex
+    """
+    def __init__(self, timestamps=None):
+        self.values = to_datetime64(timestamps if timestamps is not None else [])
+        self._sort_order = None
+
+    def __len__(self):
+        return len(self.values)
+
+    def __eq__(self, other):
+        return isinstance(other, TimeIndex) and np.array_equal(self.values, other.values)
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, self.values)
+
+    @property
+    def sort_order(self):
+        """ Indices which sort timestamps, equal timestamps keep their order
+
+        :return: An array of indices
+        :rtype: numpy.ndarray
+        """
+        if self._sort_order is None:
+            self._sort_order = np.argsort(self.values, kind='mergesort')
+        return self._sort_order
+
+    @property
+    def sorted_values(self):
+        """ Sorted timestamps
+
+        :return: A sorted array of dtype `datetime64[us]`
+        :rtype: numpy.ndarray
+        """
+        return self.values[self.sort_order]
+
+    def to_datetimes(self):
+        """ Returns timestamps as `datetime` objects
+
+        :return: A list of timestamps
+        :rtype: list(datetime.datetime)
+        """
+        return self.values.astype(datetime.datetime).tolist()
+
+    def get_indices(self, timestamps):
+        """ Finds indices of time frames with given timestamps. If multiple frames have the same timestamp, the index
+        of the first one is returned.
+
+        :param timestamps: A collection of timestamps
+        :type timestamps: list(datetime.datetime or str) or numpy.ndarray or TimeIndex
+        :return: An array of indices, where `-1` means that a timestamp is not in the index
+        :rtype: numpy.ndarray
+        """
+        values = to_datetime64(timestamps)
+        sorted_values = self.sorted_values
+
+        positions = np.searchsorted(sorted_values, values)
+        found = positions < len(sorted_values)
+        found[found] = sorted_values[positions[found]] == values[found]
+
+        indices = np.full(len(values), -1, dtype=np.int64)
+        indices[found] = self.sort_order[positions[found]]
+        return indices
+
+    def isin(self, timestamps):
+        """ Checks which time frames have one of the given timestamps
+
+        :param timestamps: A collection of timestamps
+        :type timestamps: list(datetime.datetime or str) or numpy.ndarray or TimeIndex
+        :return: A boolean array with a value for each time frame
+        :rtype: numpy.ndarray
+        """
+        return np.isin(self.values, to_datetime64(timestamps))
+
+    def intersection(self, timestamps):
+        """ Sorted unique timestamps which are both in this index and in the given timestamps
+
+        :param timestamps: A collection of timestamps
+        :type timestamps: list(datetime.datetime or str) or numpy.ndarray or TimeIndex
+        :rtype: TimeIndex
+        """
+        return TimeIndex(np.intersect1d(self.values, to_datetime64(timestamps)))
+
+    def union(self, timestamps):
+        """ Sorted unique timestamps which are either in this index or in the given timestamps
+
+        :param timestamps: A collection of timestamps
+        :type timestamps: list(datetime.datetime or str) or numpy.ndarray or TimeIndex
+        :rtype: TimeIndex
+        """
+        return TimeIndex(np.union1d(self.values, to_datetime64(timestamps)))
+
+    def difference(self, timestamps):
+        """ Sorted unique timestamps which are in this index but not in the given timestamps
+
+        :param timestamps: A collection of timestamps
+        :type timestamps: list(datetime.datetime or str) or numpy.ndarray or TimeIndex
+        :rtype: TimeIndex
+        """
+        return TimeIndex(np.setdiff1d(self.values, to_datetime64(timestamps)))
+
+    def time_series(self, ref_date=None, scale_time=1):
+        """ Returns a numpy array with seconds passed between the reference date and each timestamp
+
+        :param ref_date: Reference date relative to which the time is measured. By default the first timestamp is used.
+        :type ref_date: datetime.datetime or None
+        :param scale_time: Scale seconds by factor. If `60`, time will be in minutes, if `3600` hours
+        :type scale_time: int
+        :return: An array of rounded scaled seconds
+        :rtype: numpy.ndarray
+        """
+        if not self.values.size:
+            return np.zeros(0, dtype=np.int64)
+
+        ref_date = self.values[0] if ref_date is None else to_datetime64([ref_date])[0]
+
+        seconds = (self.values - ref_date) / np.timedelta64(1, 's')
+        return np.round(seconds / scale_time).astype(np.int64)
+
+
+def to_datetime64(timestamps):
+    """ Converts a collection of timestamps into a numpy array of dtype `datetime64[us]`
+
+    :param timestamps: A collection of timestamps
+    :type timestamps: list(datetime.datetime or str) or numpy.ndarray or TimeIndex
+    :return: An array of timestamps
+    :rtype: numpy.ndarray
+    """
+    if isinstance(timestamps, TimeIndex):
+        return timestamps.values
+    if isinstance(timestamps, np.ndarray) and np.issubdtype(timestamps.dtype, np.datetime64):
+        return timestamps.astype(TIME_INDEX_DTYPE)
+
+    timestamps = [_to_naive_utc(timestamp) for timestamp in parse_timestamps(timestamps)]
+    return np.array(timestamps, dtype=TIME_INDEX_DTYPE)
+
+
+def parse_timestamps(timestamps):
+    """ Parses a collection of timestamps into a list of `datetime` objects. Objects which already are instances of
+    `datetime.date` are kept as they are. ISO formatted strings are parsed at once, other strings are parsed with
+    `dateutil.parser.parse`.
+
+    :param timestamps: A collection of timestamps
+    :type timestamps: list(datetime.datetime or str) or numpy.ndarray or TimeIndex
+    :return: A list of timestamps
+    :rtype: list(datetime.datetime)
+    """
+    if isinstance(timestamps, TimeIndex):
+        return timestamps.to_datetimes()
+    if isinstance(timestamps, np.ndarray) and np.issubdtype(timestamps.dtype, np.datetime64):
+        return timestamps.astype(TIME_INDEX_DTYPE).astype(datetime.datetime).tolist()
+
+    timestamps = list(timestamps)
+
+    iso_indices = [idx for idx, timestamp in enumerate(timestamps)
+                   if isinstance(timestamp, str) and _ISO_TIMESTAMP_PATTERN.match(timestamp)]
+    if iso_indices:
+        iso_timestamps = np.array([timestamps[idx] for idx in iso_indices], dtype=TIME_INDEX_DTYPE)
+        for idx, timestamp in zip(iso_indices, iso_timestamps.astype(datetime.datetime).tolist()):
+            timestamps[idx] = timestamp
+
+    return [timestamp if isinstance(timestamp, datetime.date) else
+            timestamp.astype(TIME_INDEX_DTYPE).item() if isinstance(timestamp, np.datetime64) else
+            dateutil.parser.parse(timestamp) for timestamp in timestamps]
+
+
+def _to_naive_utc(timestamp):
+    """ Converts a timezone-aware timestamp into a naive timestamp in UTC
+    """
+    if isinstance(timestamp, datetime.datetime) and timestamp.tzinfo is not None:
+        return timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return timestamp
@@ -4,14 +4,22 @@ two objects are deeply equal, padding of an image, etc.
 """
 
 import logging
+import hashlib
+import weakref
+import threading
+import concurrent.futures
 from collections import OrderedDict
 
 import numpy as np
+import pandas as pd
 
 from .constants import FeatureType
+from .time_index import TimeIndex
 
 LOGGER = logging.getLogger(__name__)
 
+COMPARISON_BLOCK_SIZE = 2 ** 24
+
 
 class FeatureParser:
     """ Takes a collection of features structured in a various ways and parses them into one way. It can parse features
@@ -322,6 +330,29 @@ class FeatureParser:
         return name
 
 
+def map_concurrently(function, items, workers):
+    """ Applies a function to each of the given items, either sequentially or in a pool of threads
+
+    :param function: A function taking a single item as a parameter
+    :type function: callable
+    :param items: A list of items
+    :type items: list
+    :param workers: Number of threads. If it is `1` items are processed sequentially in the calling thread. If it is
+        `None` the number of threads is chosen by `concurrent.futures.ThreadPoolExecutor`.
+    :type workers: int or None
+    :return: A list of results in the same order as the given items
+    :rtype: list
+    :raises: The error of the first item (in the order of items) for which the function failed
+    """
+    if workers == 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(function, item) for item in items]
+
+    return [future.result() for future in futures]
+
+
 def get_common_timestamps(source, target):
     """Return indices of timestamps from source that are also found in target.
 
@@ -332,19 +363,18 @@ def get_common_timestamps(source, target):
     :return: indices of timestamps from source that are also found in target
     :rtype: list of ints
     """
-    remove_from_source = set(source).difference(target)
-    remove_from_source_idxs = [source.index(rm_date) for rm_date in remove_from_source]
-    return [idx for idx, _ in enumerate(source) if idx not in remove_from_source_idxs]
+    return np.flatnonzero(TimeIndex(source).isin(target)).tolist()
 
 
 def deep_eq(fst_obj, snd_obj):
     """Compares whether fst_obj and snd_obj are deeply equal.
 
     In case when both fst_obj and snd_obj are of type np.ndarray or either np.memmap, they are compared using
-    np.array_equal(fst_obj, snd_obj). Otherwise, when they are lists or tuples, they are compared for length and then
-    deep_eq is applied component-wise. When they are dict, they are compared for key set equality, and then deep_eq is
-    applied value-wise. For all other data types that are not list, tuple, dict, or np.ndarray, the method falls back
-    to the __eq__ method.
+    `array_equal`, where NaN values are considered equal. Otherwise, when they are lists or tuples, they are compared
+    for length and then deep_eq is applied component-wise. When they are dict, they are compared for key set equality,
+    and then deep_eq is applied value-wise. Dataframes, including GeoDataFrames, are compared with `DataFrame.equals`
+    and CRS of GeoDataFrames have to be equal as well. For all other data types that are not list, tuple, dict,
+    np.ndarray or a dataframe, the method falls back to the __eq__ method.
 
     Because np.ndarray is not a hashable object, it is impossible to form a set of numpy arrays, hence deep_eq works
     correctly.
@@ -353,50 +383,281 @@ def deep_eq(fst_obj, snd_obj):
     :param snd_obj: Second object compared
     :return: `True` if objects are deeply equal, `False` otherwise
     """
-    # pylint: disable=too-many-return-statements
-    if isinstance(fst_obj, (np.ndarray, np.memmap)):
-        if not isinstance(snd_obj, (np.ndarray, np.memmap)):
-            return False
+    if isinstance(fst_obj, np.ndarray):
+        return isinstance(snd_obj, np.ndarray) and array_equal(fst_obj, snd_obj)
 
-        if fst_obj.dtype != snd_obj.dtype:
-            return False
+    if not isinstance(fst_obj, type(snd_obj)):
+        return False
 
-        fst_nan_mask = np.isnan(fst_obj)
-        snd_nan_mask = np.isnan(snd_obj)
+    if isinstance(fst_obj, (list, tuple)):
+        return len(fst_obj) == len(snd_obj) and \
+            all(deep_eq(element_fst, element_snd) for element_fst, element_snd in zip(fst_obj, snd_obj))
 
-        return np.array_equal(fst_obj[~fst_nan_mask], snd_obj[~snd_nan_mask]) and \
-            np.array_equal(fst_nan_mask, snd_nan_mask)
+    if isinstance(fst_obj, dict):
+        return fst_obj.keys() == snd_obj.keys() and all(deep_eq(fst_obj[key], snd_obj[key]) for key in fst_obj)
 
-    if not isinstance(fst_obj, type(snd_obj)):
+    if isinstance(fst_obj, pd.DataFrame):
+        return fst_obj.equals(snd_obj) and getattr(fst_obj, 'crs', None) == getattr(snd_obj, 'crs', None)
+
+    return fst_obj == snd_obj
+
+
+def array_equal(fst_array, snd_array, block_size=COMPARISON_BLOCK_SIZE):
+    """Compares whether two numpy arrays have the same shape, dtype and values, where NaN values are considered
+    equal.
+
+    If digests of both arrays are known (see `get_array_digest`), only the digests are compared. Otherwise arrays are
+    compared block by block along the first axis, so that the additional memory is bounded by the block size, and the
+    comparison stops at the first block which differs.
+
+    :param fst_array: First array
+    :type fst_array: numpy.ndarray
+    :param snd_array: Second array
+    :type snd_array: numpy.ndarray
+    :param block_size: Maximal number of bytes of each array compared at once
+    :type block_size: int
+    :return: `True` if arrays are equal, `False` otherwise
+    :rtype: bool
+    """
+    if fst_array.shape != snd_array.shape or fst_array.dtype != snd_array.dtype:
         return False
 
-    if isinstance(fst_obj, np.ndarray):
-        if fst_obj.dtype != snd_obj.dtype:
-            return False
-        fst_nan_mask = np.isnan(fst_obj)
-        snd_nan_mask = np.isnan(snd_obj)
-        return np.array_equal(fst_obj[~fst_nan_mask], snd_obj[~snd_nan_mask]) and \
-            np.array_equal(fst_nan_mask, snd_nan_mask)
+    if _is_same_memory(fst_array, snd_array):
+        return True
 
-    if isinstance(fst_obj, (list, tuple)):
-        if len(fst_obj) != len(snd_obj):
+    fst_digest, snd_digest = get_array_digest(fst_array, compute=False), get_array_digest(snd_array, compute=False)
+    if fst_digest is not None and snd_digest is not None:
+        return fst_digest == snd_digest
+
+    for fst_block, snd_block in zip(_iter_array_blocks(fst_array, block_size),
+                                    _iter_array_blocks(snd_array, block_size)):
+        if not _block_equal(fst_block, snd_block):
             return False
+    return True
+
+
+def _block_equal(fst_block, snd_block):
+    """Compares two blocks of arrays of the same shape and dtype, where NaN values are considered equal
+    """
+    if fst_block.dtype.hasobject:
+        return all(deep_eq(fst_value, snd_value) for fst_value, snd_value in zip(fst_block.ravel(), snd_block.ravel()))
 
-        for element_fst, element_snd in zip(fst_obj, snd_obj):
-            if not deep_eq(element_fst, element_snd):
-                return False
+    equal_mask = fst_block == snd_block
+    if equal_mask.all():
         return True
+    if not _has_nan_values(fst_block):
+        return False
 
-    if isinstance(fst_obj, dict):
-        if fst_obj.keys() != snd_obj.keys():
+    fst_differing, snd_differing = fst_block[~equal_mask], snd_block[~equal_mask]
+    return bool(np.all(np.isnan(fst_differing) & np.isnan(snd_differing)))
+
+
+def _is_same_memory(fst_array, snd_array):
+    """Checks whether two arrays of the same shape and dtype are views of exactly the same memory, e.g. the same array
+    or two identical views of it
+    """
+    return fst_array is snd_array or (fst_array.__array_interface__['data'] == snd_array.__array_interface__['data']
+                                      and fst_array.strides == snd_array.strides)
+
+
+def _has_nan_values(array):
+    """Checks whether dtype of an array can contain NaN values
+    """
+    return issubclass(array.dtype.type, np.inexact)
+
+
+def _iter_array_blocks(array, block_size):
+    """Yields consecutive views of an array along its first axis, each of at most the given number of bytes, or a
+    single row if a row is larger
+    """
+    if array.ndim == 0 or array.size == 0:
+        yield array
+        return
+
+    row_size = max(array[:1].nbytes, 1)
+    rows_per_block = max(block_size // row_size, 1)
+    for start_row in range(0, array.shape[0], rows_per_block):
+        yield array[start_row: start_row + rows_per_block]
+
+
+_ARRAY_DIGESTS = {}
+_ARRAY_DIGESTS_LOCK = threading.RLock()
+
+
+def get_array_digest(array, compute=True, block_size=COMPARISON_BLOCK_SIZE):
+    """Returns a digest of the content of a numpy array, which also depends on the shape and dtype of the array.
+
+    Digests of immutable arrays are cached for as long as arrays exist, therefore they are computed only once. An
+    array is immutable if it is read-only and the memory it views is read-only as well, see `is_immutable_array`.
+    Digests of other arrays are never cached because their values could be modified in place. A digest computed
+    elsewhere, e.g. when the array was saved, can be attached to an immutable array with `set_array_digest`.
+
+    :param array: A numpy array
+    :type array: numpy.ndarray
+    :param compute: If `False` only a cached digest is returned and `None` if it doesn't exist
+    :type compute: bool
+    :param block_size: Maximal number of bytes of array copied at once if the array is not contiguous
+    :type block_size: int
+    :return: A hexadecimal digest or `None` if the digest cannot be obtained, e.g. for arrays of objects
+    :rtype: str or None
+    """
+    with _ARRAY_DIGESTS_LOCK:
+        cached_entry = _ARRAY_DIGESTS.get(id(array))
+    if cached_entry is not None and cached_entry[0]() is array:
+        if is_immutable_array(array):
+            return cached_entry[1]
+        _remove_array_digest(id(array))
+
+    if not compute or array.dtype.hasobject:
+        return None
+
+    digest = compute_array_digest(array, block_size=block_size)
+    set_array_digest(array, digest)
+    return digest
+
+
+def compute_array_digest(array, block_size=COMPARISON_BLOCK_SIZE):
+    """Computes a digest of the content, shape and dtype of a numpy array without caching it. Arrays are hashed block
+    by block along the first axis, therefore non-contiguous arrays are never copied as a whole.
+
+    :param array: A numpy array which doesn't contain Python objects
+    :type array: numpy.ndarray
+    :param block_size: Maximal number of bytes of array copied at once if the array is not contiguous
+    :type block_size: int
+    :return: A hexadecimal digest
+    :rtype: str
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update('{}{}'.format(array.dtype.str, array.shape).encode())
+
+    for block in _iter_array_blocks(array, block_size):
+        hasher.update(np.ascontiguousarray(block).reshape(-1).view(np.uint8))
+
+    return hasher.hexdigest()
+
+
+def set_array_digest(array, digest):
+    """Attaches a known digest to an immutable numpy array, so that `array_equal` can compare it without reading its
+    values. Digests of other arrays are ignored because their values could be modified in place.
+
+    :param array: A numpy array
+    :type array: numpy.ndarray
+    :param digest: A digest obtained with `compute_array_digest`
+    :type digest: str
+    """
+    if digest is None or not is_immutable_array(array):
+        return
+
+    array_id = id(array)
+    reference = weakref.ref(array, lambda _: _remove_array_digest(array_id))
+    with _ARRAY_DIGESTS_LOCK:
+        _ARRAY_DIGESTS[array_id] = reference, digest
+
+
+def is_immutable_array(array):
+    """Checks whether values of a numpy array cannot change. This holds only if the array and all arrays in the chain
+    of its `base` attributes are read-only and the memory at the end of the chain is read-only as well, e.g. `bytes`
+    or a memory map opened for reading. A read-only view of a writable array, e.g. a result of `numpy.broadcast_to`,
+    changes together with the array it views.
+
+    :param array: A numpy array
+    :type array: numpy.ndarray
+    :return: `True` if values of the array cannot be modified in place and `False` otherwise
+    :rtype: bool
+    """
+    while isinstance(array, np.ndarray):
+        if array.flags.writeable:
             return False
+        array = array.base
 
-        for key in fst_obj:
-            if not deep_eq(fst_obj[key], snd_obj[key]):
-                return False
+    if array is None:
         return True
+    try:
+        return memoryview(array).readonly
+    except TypeError:
+        return False
 
-    return fst_obj == snd_obj
+
+def _remove_array_digest(array_id):
+    """Removes a cached digest of an array which doesn't exist anymore
+    """
+    with _ARRAY_DIGESTS_LOCK:
+        _ARRAY_DIGESTS.pop(array_id, None)
+
+
+def summarize_array(array, time_dependent=False, is_mask=False):
+    """ Computes a summary of values of a numeric array: number of values, number of NaN values, minimum, maximum and
+    mean of values which are not NaN and, for masks, a fraction of non-zero values. A time-dependent array is
+    summarized one time frame at a time and the summary also contains a list of summaries of each time frame.
+
+    :param array: A numeric array, e.g. a feature of an EOPatch
+    :type array: numpy.ndarray or PackedMask
+    :param time_dependent: If `True` the first axis of the array is a time axis
+    :type time_dependent: bool
+    :param is_mask: If `True` the summary also contains a fraction of non-zero values
+    :type is_mask: bool
+    :return: A JSON serializable summary or `None` if values of the array are not numeric
+    :rtype: dict or None
+    """
+    if not (np.issubdtype(array.dtype, np.integer) or np.issubdtype(array.dtype, np.floating) or
+            array.dtype == bool):
+        return None
+
+    if not time_dependent:
+        return _summarize_values(np.asarray(array), is_mask)
+
+    return combine_frame_summaries([_summarize_values(np.asarray(array[idx]), is_mask)
+                                    for idx in range(array.shape[0])], is_mask)
+
+
+def combine_frame_summaries(frame_summaries, is_mask=False):
+    """ Combines summaries of time frames, obtained with `summarize_array`, into a summary of a time-dependent array
+
+    :param frame_summaries: A list of summaries of time frames
+    :type frame_summaries: list(dict)
+    :param is_mask: If `True` the summary also contains a fraction of non-zero values
+    :type is_mask: bool
+    :return: A summary of the array, which contains the given summaries of time frames
+    :rtype: dict
+    """
+    count = sum(frame_summary['count'] for frame_summary in frame_summaries)
+    nan_count = sum(frame_summary['nan_count'] for frame_summary in frame_summaries)
+    valid_summaries = [frame_summary for frame_summary in frame_summaries
+                       if frame_summary['count'] > frame_summary['nan_count']]
+
+    summary = {
+        'count': count,
+        'nan_count': nan_count,
+        'min': min((frame_summary['min'] for frame_summary in valid_summaries), default=None),
+        'max': max((frame_summary['max'] for frame_summary in valid_summaries), default=None),
+        'mean': sum(frame_summary['mean'] * (frame_summary['count'] - frame_summary['nan_count'])
+                    for frame_summary in valid_summaries) / (count - nan_count) if valid_summaries else None
+    }
+    if is_mask:
+        summary['true_fraction'] = sum(frame_summary['true_fraction'] * frame_summary['count']
+                                       for frame_summary in frame_summaries if frame_summary['count']) / count \
+            if count else None
+    summary['frames'] = frame_summaries
+    return summary
+
+
+def _summarize_values(values, is_mask):
+    """ Computes a summary of all values of an array
+    """
+    nan_mask = np.isnan(values) if np.issubdtype(values.dtype, np.floating) else None
+    valid_values = values if nan_mask is None else values[~nan_mask]
+    has_values = valid_values.size > 0
+
+    summary = {
+        'count': int(values.size),
+        'nan_count': 0 if nan_mask is None else int(np.count_nonzero(nan_mask)),
+        'min': float(np.min(valid_values)) if has_values else None,
+        'max': float(np.max(valid_values)) if has_values else None,
+        'mean': float(np.mean(valid_values, dtype=np.float64)) if has_values else None
+    }
+    if is_mask:
+        summary['true_fraction'] = int(np.count_nonzero(values)) / values.size if values.size else None
+    return summary
 
 
 def negate_mask(mask):
@@ -0,0 +1,183 @@
+"""
+The vector_storage module implements a columnar format of vector features, which doesn't use pickle.
+
+A GeoDataFrame is saved as a sequence of npy arrays written one after another into a single file. The first array
+contains a JSON header with the CRS, names of columns and a description of each column. Geometries are encoded as WKB,
+concatenated into a single byte array and saved together with an array of offsets. Each attribute column, and the
+index if it is not the default one, is saved as a numpy array. Columns of strings are saved as numpy unicode arrays.
+
+Arrays are read with pickle disabled and the format can be read from streams, e.g. compressed files. Dataframes with
+columns which cannot be represented by numpy arrays without Python objects cannot be saved in this format.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely.wkb
+
+COLUMNAR_FORMAT_VERSION = 1
+
+
+def can_save_dataframe(dataframe):
+    """ Checks if a dataframe can be saved in columnar format
+
+    :param dataframe: A dataframe of a vector feature
+    :type dataframe: geopandas.GeoDataFrame
+    :rtype: bool
+    """
+    if not isinstance(dataframe, gpd.GeoDataFrame) or _encode_crs(dataframe.crs) is ... or \
+            not all(isinstance(column, str) for column in dataframe.columns) or not dataframe.columns.is_unique:
+        return False
+
+    if not _is_default_index(dataframe.index) and _encode_column(dataframe.index.to_series()) is None:
+        return False
+
+    geometry_column = _get_geometry_column(dataframe)
+    if geometry_column not in dataframe.columns:
+        return False
+    return all(_encode_column(dataframe[column]) is not None for column in dataframe.columns
+               if column != geometry_column)
+
+
+def save_dataframe(outfile, dataframe):
+    """ Writes a dataframe into a file object in columnar format
+
+    :param outfile: A file object opened for writing in binary mode, it can also be a stream of a compressed file
+    :type outfile: file object
+    :param dataframe: A dataframe, which can be saved in columnar format
+    :type dataframe: geopandas.GeoDataFrame
+    :raises: ValueError
+    """
+    if not can_save_dataframe(dataframe):
+        raise ValueError('Dataframe cannot be saved in columnar format')
+
+    geometry_column = _get_geometry_column(dataframe)
+    wkb_buffer, wkb_offsets = _encode_geometries(dataframe.geometry)
+    arrays = [wkb_buffer, wkb_offsets]
+
+    columns = []
+    for column in dataframe.columns:
+        if column == geometry_column:
+            columns.append({'name': column, 'kind': 'geometry'})
+        else:
+            columns.append({'name': column, 'kind': 'array'})
+            arrays.append(_encode_column(dataframe[column]))
+
+    header = {
+        'version': COLUMNAR_FORMAT_VERSION,
+        'length': len(dataframe),
+        'crs': _encode_crs(dataframe.crs),
+        'geometry_column': geometry_column,
+        'columns': columns,
+        'index': None
+    }
+    if not _is_default_index(dataframe.index):
+        header['index'] = {'name': dataframe.index.name}
+        arrays.append(_encode_column(dataframe.index.to_series()))
+
+    np.lib.format.write_array(outfile, np.frombuffer(json.dumps(header).encode('utf-8'), dtype=np.uint8))
+    for array in arrays:
+        np.lib.format.write_array(outfile, array, allow_pickle=False)
+
+
+def load_dataframe(infile):
+    """ Reads a dataframe saved in columnar format from a file object
+
+    :param infile: A file object opened for reading in binary mode, it can also be a stream of a compressed file
+    :type infile: file object
+    :return: Loaded dataframe
+    :rtype: geopandas.GeoDataFrame
+    :raises: ValueError
+    """
+    header = json.loads(np.lib.format.read_array(infile, allow_pickle=False).tobytes().decode('utf-8'))
+    if header.get('version', 0) > COLUMNAR_FORMAT_VERSION:
+        raise ValueError('Dataframe was saved with a newer version of columnar format, which is not supported')
+
+    wkb_buffer = np.lib.format.read_array(infile, allow_pickle=False)
+    wkb_offsets = np.lib.format.read_array(infile, allow_pickle=False)
+
+    data = {}
+    for column in header['columns']:
+        if column['kind'] == 'geometry':
+            data[column['name']] = _decode_geometries(wkb_buffer, wkb_offsets)
+        else:
+            data[column['name']] = np.lib.format.read_array(infile, allow_pickle=False)
+
+    index = None
+    if header['index'] is not None:
+        index = pd.Index(np.lib.format.read_array(infile, allow_pickle=False), name=header['index']['name'])
+
+    dataframe = pd.DataFrame(data, columns=[column['name'] for column in header['columns']], index=index)
+    return gpd.GeoDataFrame(dataframe, geometry=header['geometry_column'], crs=header['crs'])
+
+
+def _get_geometry_column(dataframe):
+    """ Returns the name of the active geometry column of a dataframe
+    """
+    return dataframe._geometry_column_name  # pylint: disable=protected-access
+
+
+def _is_default_index(index):
+    """ Checks if an index is a default range index, which doesn't have to be saved
+    """
+    return isinstance(index, pd.RangeIndex) and index.name is None and index.equals(pd.RangeIndex(len(index)))
+
+
+def _encode_crs(crs):
+    """ Encodes a CRS into a JSON serializable value or returns `...` if that is not possible
+    """
+    if crs is None or isinstance(crs, str):
+        return crs
+    if isinstance(crs, dict):
+        return crs if all(isinstance(key, str) and isinstance(value, (str, int, float, bool))
+                          for key, value in crs.items()) else ...
+
+    if hasattr(crs, 'to_authority') and crs.to_authority():
+        return ':'.join(crs.to_authority())
+    if hasattr(crs, 'to_wkt'):
+        return crs.to_wkt()
+    return ...
+
+
+def _encode_column(series):
+    """ Encodes a column into a numpy array which can be saved without pickle, or returns `None` if that is not
+    possible
+    """
+    if not isinstance(series.dtype, np.dtype):
+        return None
+
+    if not series.dtype.hasobject:
+        return series.values
+
+    values = series.values.tolist()
+    if not all(type(value) is str and not value.endswith('\0') for value in values):  # pylint: disable=C0123
+        return None  # Besides non-string objects, numpy unicode arrays can't hold trailing null characters
+
+    return np.array(values, dtype=str)
+
+
+def _encode_geometries(geometries):
+    """ Encodes geometries as WKB, concatenated into a byte array together with an array of offsets. Missing
+    geometries are encoded as empty byte strings.
+    """
+    if hasattr(geometries, 'to_wkb'):
+        wkbs = [wkb or b'' for wkb in geometries.to_wkb()]
+    else:
+        wkbs = [b'' if geometry is None else geometry.wkb for geometry in geometries]
+
+    offsets = np.zeros(len(wkbs) + 1, dtype=np.int64)
+    np.cumsum([len(wkb) for wkb in wkbs], out=offsets[1:])
+    return np.frombuffer(b''.join(wkbs), dtype=np.uint8), offsets
+
+
+def _decode_geometries(wkb_buffer, wkb_offsets):
+    """ Decodes geometries from a byte array of concatenated WKB and an array of offsets
+    """
+    wkb_bytes = wkb_buffer.tobytes()
+    wkbs = [wkb_bytes[start: stop] or None for start, stop in zip(wkb_offsets[:-1], wkb_offsets[1:])]
+
+    if hasattr(gpd.GeoSeries, 'from_wkb'):
+        return gpd.GeoSeries.from_wkb(wkbs).values
+    return [None if wkb is None else shapely.wkb.loads(wkb) for wkb in wkbs]
@@ -0,0 +1,303 @@
+import unittest
+import logging
+import os
+import tempfile
+import gzip
+import lzma
+
+import numpy as np
+
+from eolearn.core.array_storage import save_chunked_array, append_chunked_array, commit_chunked_append, \
+    discard_chunked_append, load_chunked_array, load_chunked_header, load_npy_array, load_compressed_npy_array, \
+    apply_window, Quantization, PackedMask, save_packed_bits_array, load_packed_bits_array, CHUNK_FILE_EXTENSION
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestChunkedArray(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.array = np.random.rand(5, 11, 13, 3).astype(np.float32)
+
+    def test_save_load(self):
+        for compress_level, workers in [(0, 1), (1, 1), (6, 3)]:
+            with tempfile.TemporaryDirectory() as tmp_dir_name:
+                path = os.path.join(tmp_dir_name, 'array')
+                save_chunked_array(path, self.array, chunk_shape=(1, 4, 5, 3), compress_level=compress_level,
+                                   workers=workers)
+
+                chunk_files = [filename for filename in os.listdir(path) if filename.endswith(CHUNK_FILE_EXTENSION)]
+                self.assertEqual(len(chunk_files), 5 * 3 * 3, msg='Wrong number of chunks')
+
+                header = load_chunked_header(path)
+                self.assertEqual(tuple(header['shape']), self.array.shape)
+                self.assertEqual(np.dtype(header['dtype']), self.array.dtype)
+
+                loaded_array = load_chunked_array(path, workers=workers)
+                self.assertEqual(loaded_array.dtype, self.array.dtype)
+                self.assertTrue(np.array_equal(loaded_array, self.array))
+
+    def test_window_loading(self):
+        windows = [
+            (slice(1, 3),),
+            (slice(None), slice(2, 9), slice(3, 12)),
+            (2, slice(5, 6)),
+            (slice(None, None, 2), slice(10, 1, -3), slice(None), slice(1, 3)),
+            (slice(3, 3),)
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            path = os.path.join(tmp_dir_name, 'array')
+            save_chunked_array(path, self.array, chunk_shape=(1, 4, 5, 3), compress_level=1)
+
+            for window in windows:
+                expected_window = tuple(slice(idx, idx + 1) if isinstance(idx, int) else idx for idx in window)
+                self.assertTrue(np.array_equal(load_chunked_array(path, window=window), self.array[expected_window]),
+                                msg='Window {} was loaded incorrectly'.format(window))
+
+            os.remove(os.path.join(path, '0_0_0_0' + CHUNK_FILE_EXTENSION))
+            window = (slice(1, 2), slice(4, 8))
+            self.assertTrue(np.array_equal(load_chunked_array(path, window=window), self.array[window]),
+                            msg='Only chunks intersecting the window should be read')
+
+            for filename in os.listdir(path):
+                if filename.startswith('2_') or filename.endswith('_1_0' + CHUNK_FILE_EXTENSION):
+                    os.remove(os.path.join(path, filename))
+            window = ([3, 1, 3], slice(4, 8), [12, 0])
+            self.assertTrue(np.array_equal(load_chunked_array(path, window=window),
+                                           self.array[[3, 1, 3]][:, 4: 8][:, :, [12, 0]]),
+                            msg='Only chunks containing selected indices should be read')
+
+    def test_append(self):
+        for compress_level, quantization in [(0, None), (1, None), (0, Quantization(value_range=(0, 1)))]:
+            with tempfile.TemporaryDirectory() as tmp_dir_name:
+                path = os.path.join(tmp_dir_name, 'array')
+                save_chunked_array(path, self.array[:3], chunk_shape=(1, 4, 5, 3), compress_level=compress_level,
+                                   quantization=quantization)
+                first_chunk_time = os.path.getmtime(os.path.join(path, '0_0_0_0' + CHUNK_FILE_EXTENSION))
+
+                append_chunked_array(path, self.array[3:4], workers=2)
+                append_chunked_array(path, self.array[4:].astype(np.float16))
+
+                self.assertEqual(tuple(load_chunked_header(path)['shape']), self.array.shape)
+                self.assertEqual(os.path.getmtime(os.path.join(path, '0_0_0_0' + CHUNK_FILE_EXTENSION)),
+                                 first_chunk_time)
+
+                loaded_array = load_chunked_array(path)
+                self.assertEqual(loaded_array.dtype, self.array.dtype)
+                atol = 0 if quantization is None else 1e-4
+                self.assertTrue(np.allclose(loaded_array[:4], self.array[:4], atol=atol, rtol=0))
+                self.assertTrue(np.allclose(loaded_array[4:], self.array[4:], atol=1e-3, rtol=0))
+
+    def test_invalid_append(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            path = os.path.join(tmp_dir_name, 'array')
+            save_chunked_array(path, self.array[:3], chunk_shape=(2, 4, 5, 3))
+
+            for array in [self.array[:, :10], self.array[0], self.array.astype(np.int64)]:
+                with self.assertRaises(ValueError):
+                    append_chunked_array(path, array)
+
+            with self.assertRaises(ValueError):
+                append_chunked_array(path, self.array[3:])
+
+            quantized_path = os.path.join(tmp_dir_name, 'quantized_array')
+            save_chunked_array(quantized_path, self.array[:2], chunk_shape=(1, 4, 5, 3),
+                               quantization=Quantization(np.uint8, value_range=(0, 1)))
+            saved_files = sorted(os.listdir(quantized_path))
+            with self.assertRaises(ValueError):
+                append_chunked_array(quantized_path, self.array[2:] + 1)
+            self.assertEqual(sorted(os.listdir(quantized_path)), saved_files)
+
+    def test_uncommitted_append(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            path = os.path.join(tmp_dir_name, 'array')
+            save_chunked_array(path, self.array[:2], chunk_shape=(1, 4, 5, 3))
+            saved_files = sorted(os.listdir(path))
+
+            append_chunked_array(path, self.array[2:], commit=False)
+            self.assertTrue(np.array_equal(load_chunked_array(path), self.array[:2]))
+            discard_chunked_append(path)
+            self.assertEqual(sorted(os.listdir(path)), saved_files)
+
+            append_chunked_array(path, self.array[2:], commit=False)
+            commit_chunked_append(path)
+            self.assertTrue(np.array_equal(load_chunked_array(path), self.array))
+
+    def test_object_dtype(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name, self.assertRaises(ValueError):
+            save_chunked_array(os.path.join(tmp_dir_name, 'array'), np.array([None, 'a']))
+
+
+class TestQuantization(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.array = np.random.rand(4, 9, 7, 2).astype(np.float32)
+        cls.array[0, 1:3, 2:5, :] = np.nan
+
+    def test_quantized_save_load(self):
+        for quantization in [Quantization(), Quantization(np.int16, value_range=(0, 1)),
+                             Quantization('uint8', scale=1 / 200, offset=0, nodata=255)]:
+            with tempfile.TemporaryDirectory() as tmp_dir_name:
+                path = os.path.join(tmp_dir_name, 'array')
+                save_chunked_array(path, self.array, chunk_shape=(1, 4, 4, 2), quantization=quantization,
+                                   compress_level=1)
+
+                header = load_chunked_header(path)
+                self.assertEqual(np.dtype(header['dtype']), self.array.dtype)
+                self.assertEqual(np.dtype(header['quantization']['dtype']), quantization.dtype)
+
+                loaded_array = load_chunked_array(path)
+                self.assertEqual(loaded_array.dtype, self.array.dtype)
+                self.assertTrue(np.array_equal(np.isnan(loaded_array), np.isnan(self.array)))
+
+                max_error = header['quantization']['scale'] / 2
+                self.assertTrue(np.nanmax(np.abs(loaded_array - self.array)) <= max_error + 1e-6,
+                                msg='Quantization error is too large for {}'.format(quantization))
+
+                window = (slice(0, 2), slice(1, 8))
+                np.testing.assert_array_equal(load_chunked_array(path, window=window), loaded_array[window])
+
+    def test_clipping(self):
+        array = np.array([-1, 0, 0.5, 1, 2, np.inf, -np.inf], dtype=np.float64)
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            path = os.path.join(tmp_dir_name, 'array')
+            save_chunked_array(path, array, quantization=Quantization(np.uint16, value_range=(0, 1)))
+            loaded_array = load_chunked_array(path)
+
+        self.assertEqual(loaded_array.dtype, np.float64)
+        self.assertTrue(np.allclose(loaded_array, [0, 0, 0.5, 1, 1, 1, 0], atol=1e-4))
+
+    def test_invalid_quantization(self):
+        with self.assertRaises(ValueError):
+            Quantization(np.float32)
+        with self.assertRaises(ValueError):
+            Quantization(scale=0.1)
+        with self.assertRaises(ValueError):
+            Quantization(np.uint8, nodata=-1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name, self.assertRaises(ValueError):
+            save_chunked_array(os.path.join(tmp_dir_name, 'array'), np.zeros((2, 2), dtype=np.uint8),
+                               quantization=Quantization())
+
+
+class TestPackedBits(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mask = np.random.rand(6, 7, 5, 1) > 0.5
+
+    def test_save_load(self):
+        windows = [None, (slice(2, 4),), (3, slice(1, 6), slice(0, 2)), ([5, 0], slice(None), slice(None, None, 2))]
+
+        for mask in [self.mask, self.mask.astype(np.uint8)]:
+            with tempfile.TemporaryDirectory() as tmp_dir_name:
+                path = os.path.join(tmp_dir_name, 'mask.bits')
+                with open(path, 'wb') as outfile:
+                    save_packed_bits_array(outfile, mask)
+
+                self.assertTrue(os.path.getsize(path) < mask.nbytes)
+
+                for window in windows:
+                    with open(path, 'rb') as infile:
+                        loaded_mask = load_packed_bits_array(infile, window=window)
+                    self.assertEqual(loaded_mask.dtype, mask.dtype)
+                    self.assertTrue(np.array_equal(loaded_mask, apply_window(mask, window)),
+                                    msg='Window {} was loaded incorrectly'.format(window))
+
+    def test_invalid_arrays(self):
+        for array in [np.array([0, 1, 2]), np.random.rand(3, 3), np.array(True)]:
+            with self.assertRaises(ValueError):
+                PackedMask.from_array(array)
+
+    def test_packed_mask(self):
+        packed_mask = PackedMask.from_array(self.mask)
+
+        self.assertEqual(packed_mask.shape, self.mask.shape)
+        self.assertEqual(packed_mask.dtype, self.mask.dtype)
+        self.assertEqual(packed_mask.ndim, 4)
+        self.assertEqual(len(packed_mask), 6)
+        self.assertTrue(packed_mask.nbytes < self.mask.nbytes)
+
+        keys = [2, -1, slice(1, 4), [0, 5], (3, slice(2, 4)), (slice(None), 0, 1), (..., 0), (-2, ..., 0), (...,),
+                (slice(1, None, -1), ..., -1, 0), (-1, -2, -3), ([0, -1], [1, 2], [3, 4]), (1, slice(None), [0, -1]),
+                ([0, 2], slice(None), [1, 3]), (None, 2), (..., None), self.mask[..., 0], (self.mask[:, 0, 0, 0], 1)]
+        for key in keys:
+            self.assertTrue(np.array_equal(packed_mask[key], self.mask[key]), msg='Indexing with {} failed'.format(key))
+            self.assertEqual(packed_mask[key].shape, self.mask[key].shape)
+
+        with self.assertRaises(IndexError):
+            _ = packed_mask[6]
+
+        self.assertTrue(np.array_equal(np.asarray(packed_mask), self.mask))
+        self.assertTrue(np.array_equal(packed_mask.unpack(), self.mask))
+        self.assertEqual(np.sum(packed_mask), np.sum(self.mask))
+        self.assertEqual(packed_mask, PackedMask.from_array(self.mask))
+        self.assertNotEqual(packed_mask, PackedMask.from_array(~self.mask))
+
+
+class TestWindows(unittest.TestCase):
+
+    WINDOWS = [
+        None,
+        (slice(1, 3),),
+        (-1, slice(2, 9), slice(3, 12), [2, 0]),
+        (slice(None, None, 2), slice(10, 1, -3), [5, 1, 1], slice(1, 3)),
+        (slice(3, 3),),
+        ([],)
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.array = np.random.randint(0, 1000, (5, 11, 13, 3), dtype=np.int32)
+
+    def _get_expected_array(self, window):
+        expected_array = self.array
+        for axis, axis_window in enumerate(window or ()):
+            if isinstance(axis_window, int):
+                axis_window = slice(axis_window, axis_window + 1 if axis_window != -1 else None)
+            if isinstance(axis_window, list):
+                expected_array = np.take(expected_array, axis_window, axis=axis)
+            else:
+                expected_array = expected_array[(slice(None),) * axis + (axis_window,)]
+        return expected_array
+
+    def test_apply_window(self):
+        for window in self.WINDOWS:
+            self.assertTrue(np.array_equal(apply_window(self.array, window), self._get_expected_array(window)),
+                            msg='Window {} was applied incorrectly'.format(window))
+
+        with self.assertRaises(IndexError):
+            apply_window(self.array, ([0, 5],))
+
+    def test_npy_windows(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            npy_path = os.path.join(tmp_dir_name, 'array.npy')
+            np.save(npy_path, self.array)
+
+            gzip_path = os.path.join(tmp_dir_name, 'array.npy.gz')
+            with gzip.open(gzip_path, 'w') as outfile:
+                np.save(outfile, self.array)
+
+            xz_path = os.path.join(tmp_dir_name, 'array.npy.xz')
+            with lzma.open(xz_path, 'w') as outfile:
+                np.save(outfile, self.array)
+
+            chunked_path = os.path.join(tmp_dir_name, 'array')
+            save_chunked_array(chunked_path, self.array, chunk_shape=(2, 5, 5, 3))
+
+            for window in self.WINDOWS:
+                expected_array = self._get_expected_array(window)
+                for loaded_array in [load_npy_array(npy_path, window=window),
+                                     load_npy_array(npy_path, window=window, mmap=True),
+                                     load_compressed_npy_array(gzip_path, 'gzip', window=window),
+                                     load_compressed_npy_array(xz_path, 'lzma', window=window),
+                                     load_chunked_array(chunked_path, window=window)]:
+                    self.assertTrue(np.array_equal(loaded_array, expected_array),
+                                    msg='Window {} was loaded incorrectly'.format(window))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import logging
+import os
+import json
+import shutil
+import datetime
+import tempfile
+
+import numpy as np
+
+from eolearn.core import EOPatch, FeatureType, FileFormat, BlobStore, OverwritePermission
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestBlobStore(unittest.TestCase):
+
+    @staticmethod
+    def _get_eopatch(index):
+        eopatch = EOPatch(timestamp=[datetime.datetime(2017, 1, 1), datetime.datetime(2017, 1, 2)],
+                          meta_info={'resolution': 10})
+        eopatch.data['bands'] = np.full((2, 4, 4, 2), index, dtype=np.float32)
+        eopatch.mask_timeless['land'] = np.ones((4, 4, 1), dtype=np.uint8)
+        return eopatch
+
+    def test_deduplication(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            blob_store = BlobStore.for_dataset(tmp_dir_name)
+            eopatches = [self._get_eopatch(index) for index in range(3)]
+            for index, eopatch in enumerate(eopatches):
+                eopatch.save(os.path.join(tmp_dir_name, 'patch_{}'.format(index)), blob_store=blob_store,
+                             compress_level=1)
+
+            for index, eopatch in enumerate(eopatches):
+                self.assertEqual(EOPatch.load(os.path.join(tmp_dir_name, 'patch_{}'.format(index))), eopatch)
+
+            shared_files = [os.path.join(tmp_dir_name, 'patch_{}'.format(index), 'mask_timeless', 'land.npy.gz')
+                            for index in range(3)]
+            self.assertTrue(all(os.path.samefile(shared_files[0], path) for path in shared_files[1:]))
+            self.assertFalse(os.path.samefile(os.path.join(tmp_dir_name, 'patch_0', 'data', 'bands.npy.gz'),
+                                              os.path.join(tmp_dir_name, 'patch_1', 'data', 'bands.npy.gz')))
+
+            with open(os.path.join(tmp_dir_name, 'patch_0', 'manifest.json')) as manifest_file:
+                entries = {(entry['feature_type'], entry['feature_name']): entry
+                           for entry in json.load(manifest_file)['features']}
+            blob_path = blob_store.get_blob_path(entries['mask_timeless', 'land']['blob'])
+            self.assertTrue(os.path.samefile(blob_path, shared_files[0]))
+            self.assertEqual(os.stat(blob_path).st_nlink, 4)
+
+            modified_eopatch = EOPatch.load(os.path.join(tmp_dir_name, 'patch_0'))
+            modified_eopatch.mask_timeless['land'] = np.zeros((4, 4, 1), dtype=np.uint8)
+            modified_eopatch.save(os.path.join(tmp_dir_name, 'patch_0'), blob_store=blob_store,
+                                  overwrite_permission=OverwritePermission.OVERWRITE_FEATURES, only_changed=True)
+            self.assertEqual(EOPatch.load(os.path.join(tmp_dir_name, 'patch_1')), eopatches[1])
+
+            shutil.rmtree(os.path.join(tmp_dir_name, 'patch_2'))
+            self.assertEqual(blob_store.remove_unreferenced(), 1)
+            self.assertEqual(blob_store.remove_unreferenced(), 0)
+
+    def test_chunked_deduplication(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            blob_store = os.path.join(tmp_dir_name, 'blobs')
+            for index in range(2):
+                self._get_eopatch(0).save(os.path.join(tmp_dir_name, 'patch_{}'.format(index)),
+                                          file_format=FileFormat.CHUNKED, blob_store=blob_store)
+
+            chunked_paths = [os.path.join(tmp_dir_name, 'patch_{}'.format(index), FeatureType.DATA.value,
+                                          'bands.chunked') for index in range(2)]
+            for filename in os.listdir(chunked_paths[0]):
+                self.assertTrue(os.path.samefile(os.path.join(chunked_paths[0], filename),
+                                                 os.path.join(chunked_paths[1], filename)))
+
+            self.assertEqual(EOPatch.load(os.path.join(tmp_dir_name, 'patch_1')), self._get_eopatch(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import logging
+import os
+import shutil
+import datetime
+import tempfile
+
+import numpy as np
+
+from eolearn.core import EOPatch, EOPatchCatalog, FeatureType, LoadFromDisk, BBox, CRS
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestEOPatchCatalog(unittest.TestCase):
+
+    @staticmethod
+    def _save_eopatch(folder, name, bbox, months):
+        eopatch = EOPatch(bbox=bbox, timestamp=[datetime.datetime(2018, month, 15) for month in months])
+        eopatch.data['bands'] = np.zeros((len(months), 2, 2, 3), dtype=np.float32)
+        if 6 in months:
+            eopatch.mask['CLP'] = np.zeros((len(months), 2, 2, 1), dtype=np.uint8)
+        eopatch.save(os.path.join(folder, name))
+
+    def test_catalog(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            self._save_eopatch(tmp_dir_name, 'patch_0', BBox((0, 0, 1, 1), CRS.WGS84), [5, 6])
+            self._save_eopatch(tmp_dir_name, 'patch_1', BBox((1, 0, 2, 1), CRS.WGS84), [6, 7])
+            self._save_eopatch(tmp_dir_name, 'patch_2', BBox((5, 5, 6, 6), CRS.WGS84), [1, 2])
+            utm_bbox = BBox((500000, 0, 510000, 10000), CRS.UTM_31N)
+            self._save_eopatch(tmp_dir_name, 'patch_3', utm_bbox, [12])
+
+            with EOPatchCatalog(tmp_dir_name) as catalog:
+                self.assertEqual(catalog.crawl(workers=2), 4)
+                self.assertEqual(catalog.crawl(), 0, msg='Unchanged EOPatches should not be ingested again')
+                self.assertEqual(catalog.get_eopatch_folders(), ['patch_0', 'patch_1', 'patch_2', 'patch_3'])
+
+                self.assertEqual(catalog.query(geometry=BBox((0.5, 0.5, 1.5, 0.6), CRS.WGS84)), ['patch_0', 'patch_1'])
+                self.assertEqual(catalog.query(geometry=utm_bbox.transform(CRS.WGS84)), ['patch_3'])
+                self.assertEqual(catalog.query(time_interval=('2018-06-01', '2018-06-30')), ['patch_0', 'patch_1'])
+                self.assertEqual(catalog.query(time_interval=(datetime.datetime(2018, 7, 1), None)),
+                                 ['patch_1', 'patch_3'])
+                self.assertEqual(catalog.query(time_interval=('2018-06-20', '2018-07-10')), [],
+                                 msg='An interval between two timestamps of an EOPatch should not match it')
+                self.assertEqual(catalog.query(features=FeatureType.MASK), ['patch_0', 'patch_1'])
+                self.assertEqual(catalog.query(geometry=BBox((0.1, 0.1, 0.2, 0.2), CRS.WGS84),
+                                               time_interval=('2018-06-01', '2018-06-30'),
+                                               features=[(FeatureType.MASK, 'CLP'), (FeatureType.DATA, 'bands')]),
+                                 ['patch_0'])
+                self.assertEqual(catalog.query(features=[(FeatureType.MASK, 'other')]), [])
+
+                load_task = LoadFromDisk(tmp_dir_name)
+                execution_args = catalog.get_execution_args([load_task], features=(FeatureType.MASK, 'CLP'))
+                self.assertEqual(execution_args, [{load_task: {'eopatch_folder': 'patch_0'}},
+                                                  {load_task: {'eopatch_folder': 'patch_1'}}])
+
+            for name in ['patch_0', 'patch_2']:
+                shutil.rmtree(os.path.join(tmp_dir_name, name))
+            self._save_eopatch(tmp_dir_name, 'patch_2', BBox((5, 5, 6, 6), CRS.WGS84), [6])
+            with EOPatchCatalog(tmp_dir_name) as catalog:
+                self.assertEqual(len(catalog), 4)
+                self.assertEqual(catalog.crawl(), 1)
+                self.assertEqual(catalog.query(features=(FeatureType.MASK, 'CLP')), ['patch_1', 'patch_2'])
+                self.assertEqual(len(catalog), 3)
+
+    def test_custom_catalog_path(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            patches_folder = os.path.join(tmp_dir_name, 'patches')
+            self._save_eopatch(patches_folder, 'patch', BBox((0, 0, 1, 1), CRS.WGS84), [6])
+            EOPatch(timestamp=[datetime.datetime(2018, 1, 1)]).save(os.path.join(patches_folder, 'no_bbox'))
+
+            catalog_path = os.path.join(tmp_dir_name, 'catalog.sqlite')
+            with EOPatchCatalog(patches_folder, catalog_path=catalog_path) as catalog:
+                self.assertEqual(catalog.ingest(['patch', 'no_bbox']), 2)
+                self.assertEqual(catalog.query(geometry=BBox((0, 0, 10, 10), CRS.WGS84)), ['patch'])
+                self.assertEqual(catalog.query(time_interval=(None, '2018-01-01')), ['no_bbox'])
+
+            self.assertEqual(sorted(os.listdir(patches_folder)), ['no_bbox', 'patch'])
+            with self.assertRaises(ValueError):
+                EOPatchCatalog(os.path.join(tmp_dir_name, 'missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
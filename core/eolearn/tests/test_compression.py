@@ -0,0 +1,94 @@
+import unittest
+import logging
+import os
+import tempfile
+import zlib
+
+from eolearn.core import FileFormat
+from eolearn.core.compression import Codec, GzipCodec, get_codec, get_codec_by_file_format, get_available_codecs, \
+    register_codec, detect_codec
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestCompression(unittest.TestCase):
+
+    DATA = b'eo-learn ' * 1000
+
+    def test_codecs(self):
+        for codec_name in get_available_codecs():
+            codec = get_codec(codec_name)
+
+            compressed_data = codec.compress(self.DATA)
+            self.assertTrue(len(compressed_data) < len(self.DATA), msg='Codec {} did not compress'.format(codec))
+            self.assertEqual(codec.decompress(compressed_data), self.DATA)
+            self.assertEqual(codec.decompress(codec.compress(self.DATA, level=1)), self.DATA)
+
+            if codec.file_format is None:
+                continue
+
+            self.assertEqual(get_codec_by_file_format(codec.file_format), codec)
+
+            with tempfile.TemporaryDirectory() as tmp_dir_name:
+                filename = os.path.join(tmp_dir_name, 'file')
+                with codec.open(filename, 'wb') as outfile:
+                    outfile.write(self.DATA)
+
+                self.assertEqual(detect_codec(filename), codec)
+                with codec.open(filename, 'rb') as infile:
+                    self.assertEqual(infile.read(), self.DATA)
+
+    def test_standard_codecs(self):
+        self.assertTrue({'gzip', 'bz2', 'lzma', 'zlib'}.issubset(get_available_codecs()))
+
+        with self.assertRaises(ValueError):
+            get_codec('non-existing-codec')
+
+        with self.assertRaises(ValueError):
+            get_codec('zlib').open('file', 'wb')
+
+    def test_detect_uncompressed(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            filename = os.path.join(tmp_dir_name, 'file')
+            with open(filename, 'wb') as outfile:
+                outfile.write(self.DATA)
+
+            self.assertIsNone(detect_codec(filename))
+
+    def test_register_codec(self):
+
+        class FastGzipCodec(GzipCodec):
+            """ A codec replacing the default gzip codec
+            """
+            name = 'fast-gzip'
+            default_level = 1
+
+        class RawCodec(Codec):
+            """ A codec without a file format
+            """
+            name = 'raw'
+
+            def compress(self, data, level=None):
+                return zlib.compress(data, 1)
+
+            def decompress(self, data):
+                return zlib.decompress(data)
+
+        gzip_codec = get_codec('gzip')
+        try:
+            register_codec(FastGzipCodec())
+            register_codec(RawCodec())
+
+            self.assertTrue(isinstance(get_codec_by_file_format(FileFormat.GZIP), FastGzipCodec))
+            self.assertEqual(get_codec('raw').decompress(get_codec('raw').compress(self.DATA)), self.DATA)
+        finally:
+            register_codec(gzip_codec)
+
+        self.assertEqual(get_codec_by_file_format(FileFormat.GZIP), gzip_codec)
+
+        with self.assertRaises(ValueError):
+            register_codec('gzip')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
 import unittest
 import logging
 import datetime
+import tempfile
+import os
 import numpy as np
 
-from eolearn.core import EOPatch, FeatureType, CopyTask, DeepCopyTask, AddFeature, RemoveFeature, RenameFeature
+from eolearn.core import EOPatch, FeatureType, CopyTask, DeepCopyTask, AddFeature, RemoveFeature, RenameFeature, \
+    SaveToDisk, LoadFromDisk
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -55,6 +58,27 @@ class TestCoreTasks(unittest.TestCase):
         self.assertFalse(np.array_equal(self.patch.data['bands'], patch_deepcopy.data['bands']),
                          'Data should be copied')
 
+    def test_frame_filter(self):
+        eopatch = EOPatch(timestamp=self.patch.timestamp[:3])
+        eopatch.data['bands'] = np.arange(3 * 2 * 2 * 2).reshape(3, 2, 2, 2)
+        eopatch.mask['CLM'] = np.zeros((3, 2, 2, 1), dtype=np.uint8)
+        eopatch.mask['CLM'][1] = 1
+
+        def is_clear(description):
+            return [frame['true_fraction'] < 0.5
+                    for frame in description.get_feature(FeatureType.MASK, 'CLM').summary['frames']]
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            SaveToDisk(tmp_dir_name, summaries=True).execute(eopatch, eopatch_folder='patch')
+            loaded_eopatch = LoadFromDisk(tmp_dir_name, frame_filter=is_clear).execute(eopatch_folder='patch')
+
+            self.assertEqual(loaded_eopatch.timestamp, [eopatch.timestamp[0], eopatch.timestamp[2]])
+            self.assertTrue(np.array_equal(loaded_eopatch.data['bands'], eopatch.data['bands'][[0, 2]]))
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir_name, 'patch', 'manifest.json')))
+
+        with self.assertRaises(ValueError):
+            LoadFromDisk('folder', frame_filter=is_clear, time_slice=[0])
+
     def test_partial_copy(self):
         partial_copy = DeepCopyTask(features=[(FeatureType.MASK_TIMELESS, 'mask'),
                                               FeatureType.BBOX]).execute(self.patch)
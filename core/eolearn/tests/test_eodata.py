@@ -5,10 +5,17 @@ import datetime
 import numpy as np
 import tempfile
 import itertools
+import pickle
+import json
+import warnings
+import copy
 
 from geopandas import GeoSeries, GeoDataFrame
 
-from eolearn.core import EOPatch, FeatureType, FeatureTypeSet, OverwritePermission, FileFormat, BBox, CRS
+from eolearn.core import EOPatch, FeatureType, FeatureTypeSet, OverwritePermission, FileFormat, BBox, CRS, \
+    Quantization, PackedMask, DtypePolicy
+from eolearn.core.utilities import array_equal, deep_eq, get_array_digest, set_array_digest, compute_array_digest, \
+    is_immutable_array
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -223,6 +230,45 @@ class TestEOPatch(unittest.TestCase):
         with self.assertRaises(ValueError):
             _ = eop1 + eop2
 
+    def test_concatenate_many(self):
+        bbox = BBox((1, 2, 3, 4), CRS.WGS84)
+        eopatches = []
+        for days in [[5, 6], [1, 3, 2], [2, 4]]:
+            eopatch = EOPatch(bbox=bbox, timestamp=[datetime.datetime(2017, 1, day) for day in days])
+            eopatch.data['bands'] = np.array(days, dtype=np.float32).reshape(-1, 1, 1, 1) * np.ones((1, 2, 3, 1))
+            eopatch.scalar['values'] = np.array(days, dtype=np.uint8).reshape(-1, 1)
+            eopatch.data_timeless['dem'] = np.ones((2, 3, 1))
+            eopatch.meta_info['index'] = 5
+            eopatches.append(eopatch)
+        eopatches[2].data['bands'][0] = 10
+        eopatches[1].meta_info['other'] = 1
+
+        eopatch = EOPatch.concatenate_many(eopatches)
+
+        self.assertEqual(eopatch.timestamp, [datetime.datetime(2017, 1, day) for day in range(1, 7)])
+        self.assertEqual(eopatch.data['bands'].shape, (6, 2, 3, 1))
+        self.assertTrue(np.array_equal(eopatch.data['bands'][:, 0, 0, 0], np.arange(1, 7)),
+                        msg='Frames should be sorted and duplicated frames should be taken from the first EOPatch')
+        self.assertTrue(np.array_equal(eopatch.scalar['values'][:, 0], np.arange(1, 7)))
+        self.assertEqual(eopatch.scalar['values'].dtype, np.uint8)
+        self.assertTrue(np.array_equal(eopatch.data_timeless['dem'], np.ones((2, 3, 1))))
+        self.assertEqual(eopatch.meta_info, {'index': 5, 'other': 1})
+        self.assertEqual(eopatch.bbox, bbox)
+
+        for eopatch in eopatches:
+            eopatch.timestamp = []
+        eopatch = EOPatch.concatenate_many(eopatches)
+        self.assertTrue(np.array_equal(eopatch.data['bands'],
+                                       np.concatenate([eopatch.data['bands'] for eopatch in eopatches])))
+        self.assertEqual(eopatch, EOPatch.concatenate(EOPatch.concatenate(*eopatches[:2]), eopatches[2]))
+
+        eopatches[0].data_timeless['dem'] = np.zeros((2, 3, 1))
+        with self.assertRaises(ValueError):
+            EOPatch.concatenate_many(eopatches)
+
+        with self.assertRaises(ValueError):
+            EOPatch.concatenate_many([])
+
     def test_equals(self):
         eop1 = EOPatch(data={'bands': np.arange(2 * 3 * 3 * 2).reshape(2, 3, 3, 2)})
         eop2 = EOPatch(data={'bands': np.arange(2 * 3 * 3 * 2).reshape(2, 3, 3, 2)})
@@ -249,6 +295,134 @@ class TestEOPatch(unittest.TestCase):
 
         self.assertNotEqual(eop1, eop2)
 
+    def test_blockwise_array_equality(self):
+        array = np.random.rand(10, 4, 4, 2)
+        array[3, 1, 1, 0] = np.nan
+
+        self.assertTrue(array_equal(array, array.copy(), block_size=64))
+        self.assertTrue(array_equal(array[::2], array[::2].copy(), block_size=1))
+
+        modified_array = array.copy()
+        modified_array[-1, -1, -1, -1] += 1
+        self.assertFalse(array_equal(array, modified_array, block_size=64))
+        self.assertFalse(array_equal(array, array.astype(np.float32)))
+        self.assertFalse(array_equal(array, array.reshape(5, 8, 4, 2)))
+
+    def test_array_digests(self):
+        array = np.arange(24, dtype=np.int32).reshape(2, 3, 4)
+        self.assertEqual(compute_array_digest(array), compute_array_digest(array.copy()))
+        self.assertEqual(compute_array_digest(array[:, ::2]), compute_array_digest(array[:, ::2].copy(), block_size=1))
+        self.assertNotEqual(compute_array_digest(array), compute_array_digest(array.reshape(4, 3, 2)))
+        self.assertNotEqual(compute_array_digest(array), compute_array_digest(array.astype(np.int64)))
+
+        self.assertIsNone(get_array_digest(array, compute=False))
+        get_array_digest(array)
+        self.assertIsNone(get_array_digest(array, compute=False), msg='Digests of writable arrays are not cached')
+
+        array = array.copy()
+        array.flags.writeable = False
+        digest = get_array_digest(array)
+        self.assertEqual(get_array_digest(array, compute=False), digest)
+
+        view = array[1:]
+        get_array_digest(view)
+        self.assertIsNotNone(get_array_digest(view, compute=False), msg='Views of read-only arrays are immutable')
+
+    def test_array_digests_of_views(self):
+        base_array = np.zeros((2, 3), dtype=np.uint8)
+        view = base_array.view()
+        view.flags.writeable = False
+        broadcasted_view = np.broadcast_to(base_array, (4, 2, 3))
+
+        for array in [view, broadcasted_view]:
+            self.assertFalse(is_immutable_array(array))
+            set_array_digest(array, compute_array_digest(array))
+            get_array_digest(array)
+            self.assertIsNone(get_array_digest(array, compute=False),
+                              msg='Digests of read-only views of writable arrays are not cached')
+
+        other_array = np.zeros((2, 3), dtype=np.uint8)
+        other_array.flags.writeable = False
+        get_array_digest(other_array)
+        self.assertTrue(array_equal(view, other_array))
+
+        base_array[0, 0] = 1
+        self.assertFalse(array_equal(view, other_array))
+        self.assertFalse(deep_eq(view, other_array))
+
+        self.assertTrue(is_immutable_array(np.frombuffer(b'abc', dtype=np.uint8)))
+        self.assertFalse(is_immutable_array(np.frombuffer(bytearray(b'abc'), dtype=np.uint8)))
+
+    def test_subset(self):
+        timestamps = [datetime.datetime(2017, 1, day) for day in range(1, 6)]
+        eopatch = EOPatch(bbox=BBox((0, 0, 30, 20), CRS.WGS84), timestamp=timestamps, meta_info={'index': 1})
+        eopatch.data['bands'] = np.random.rand(5, 20, 30, 2)
+        eopatch.scalar['values'] = np.random.rand(5, 3)
+        eopatch.mask_timeless['mask'] = np.random.randint(0, 2, (20, 30, 1), dtype=np.uint8)
+        eopatch.label_timeless['label'] = np.array([1, 2])
+
+        subset = eopatch.subset(time=slice(1, 3), rows=slice(5, 15), cols=slice(None, 10))
+
+        self.assertEqual(subset.timestamp, timestamps[1:3])
+        self.assertTrue(np.array_equal(subset.data['bands'], eopatch.data['bands'][1:3, 5:15, :10]))
+        self.assertTrue(np.shares_memory(subset.data['bands'], eopatch.data['bands']))
+        self.assertTrue(np.array_equal(subset.scalar['values'], eopatch.scalar['values'][1:3]))
+        self.assertTrue(np.array_equal(subset.mask_timeless['mask'], eopatch.mask_timeless['mask'][5:15, :10]))
+        self.assertTrue(subset.label_timeless['label'] is eopatch.label_timeless['label'])
+        self.assertEqual(subset.meta_info, eopatch.meta_info)
+        self.assertEqual(subset.bbox, BBox((0, 5, 10, 15), CRS.WGS84))
+
+        for time in [[False, True, True, False, False], [1, 2], [-4, -3], timestamps[1:3], ['2017-01-02', '2017-01-03']]:
+            subset = eopatch.subset(time=time)
+            self.assertEqual(subset.timestamp, timestamps[1:3])
+            self.assertTrue(np.shares_memory(subset.data['bands'], eopatch.data['bands']),
+                            msg='Consecutive frames {} should be selected without copying'.format(time))
+            self.assertEqual(subset.bbox, eopatch.bbox)
+
+        subset = eopatch.subset(time=[4, 0])
+        self.assertEqual(subset.timestamp, [timestamps[4], timestamps[0]])
+        self.assertTrue(np.array_equal(subset.data['bands'], eopatch.data['bands'][[4, 0]]))
+        self.assertFalse(np.shares_memory(subset.data['bands'], eopatch.data['bands']))
+
+        for kwargs in [{'time': [5]}, {'time': [True]}, {'time': [datetime.datetime(2018, 1, 1)]},
+                       {'rows': slice(None, None, 2)}, {'cols': 3}, {'rows': slice(10, 10)}]:
+            with self.assertRaises(ValueError):
+                eopatch.subset(**kwargs)
+
+    def test_split_and_merge_tiles(self):
+        eopatch = EOPatch(bbox=BBox((0, 0, 30, 20), CRS.WGS84), timestamp=[datetime.datetime(2017, 1, 1)] * 2,
+                          meta_info={'index': 1})
+        eopatch.data['bands'] = np.random.rand(2, 20, 30, 2)
+        eopatch.mask_timeless['mask'] = np.random.randint(0, 2, (20, 30, 1), dtype=np.uint8)
+        eopatch.scalar['values'] = np.random.rand(2, 3)
+
+        tiles = list(eopatch.split_tiles((8, 12), halo=2))
+        self.assertEqual(len(tiles), 9)
+
+        first_tile, last_tile = tiles[0], tiles[-1]
+        self.assertEqual(first_tile.data['bands'].shape, (2, 10, 14, 2))
+        self.assertTrue(np.shares_memory(first_tile.data['bands'], eopatch.data['bands']))
+        self.assertEqual(first_tile.bbox, BBox((0, 10, 14, 20), CRS.WGS84))
+        self.assertTrue(np.array_equal(last_tile.mask_timeless['mask'], eopatch.mask_timeless['mask'][14:, 22:]))
+        self.assertEqual(last_tile.bbox, BBox((22, 0, 30, 6), CRS.WGS84))
+
+        for tile in tiles:
+            tile.data['bands'] = tile.data['bands'] * 2
+
+        merged_eopatch = EOPatch.merge_tiles(tiles)
+        self.assertTrue(np.array_equal(merged_eopatch.data['bands'], eopatch.data['bands'] * 2))
+        self.assertTrue(np.array_equal(merged_eopatch.mask_timeless['mask'], eopatch.mask_timeless['mask']))
+        self.assertEqual(merged_eopatch.bbox, eopatch.bbox)
+        self.assertEqual(merged_eopatch.meta_info, eopatch.meta_info)
+        self.assertEqual(merged_eopatch.timestamp, eopatch.timestamp)
+
+        with self.assertRaises(ValueError):
+            EOPatch.merge_tiles(tiles[1:])
+        with self.assertRaises(ValueError):
+            EOPatch.merge_tiles(tiles + tiles[:1])
+        with self.assertRaises(ValueError):
+            list(eopatch.split_tiles(0))
+
     def test_timestamp_consolidation(self):
         # 10 frames
         timestamps = [datetime.datetime(2017, 1, 1, 10, 4, 7),
@@ -359,6 +533,303 @@ class TestSavingLoading(unittest.TestCase):
             eopatch2 = EOPatch.load(tmp_dir_name, lazy_loading=True, mmap=False)
             self.assertEqual(self.eopatch, eopatch2)
 
+    def test_timestamp_storage(self):
+        timestamps = [datetime.datetime(2017, 1, day, 10, 30, 15, 500) for day in [3, 1, 2]]
+        eopatch = EOPatch(timestamp=np.array(timestamps, dtype='datetime64[us]'))
+        self.assertEqual(eopatch.timestamp, timestamps)
+        self.assertEqual(eopatch.time_series(ref_date=datetime.datetime(2017, 1, 1), scale_time=60).tolist(),
+                         [3510, 630, 2070])
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name)
+            timestamp_array = np.load(os.path.join(tmp_dir_name, 'timestamp.npy'), allow_pickle=False)
+            self.assertEqual(timestamp_array.dtype, np.dtype('datetime64[us]'))
+
+            for lazy_loading in [True, False]:
+                self.assertEqual(EOPatch.load(tmp_dir_name, lazy_loading=lazy_loading).timestamp, timestamps)
+            self.assertEqual(EOPatch.load(tmp_dir_name, time_slice=[2, 0]).timestamp, timestamps[2::-2])
+            self.assertEqual(EOPatch.describe(tmp_dir_name).timestamp_count, 3)
+
+            timezone = datetime.timezone(datetime.timedelta(hours=1))
+            eopatch.timestamp = [timestamp.replace(tzinfo=timezone) for timestamp in timestamps]
+            eopatch.save(tmp_dir_name, overwrite_permission=OverwritePermission.OVERWRITE_PATCH)
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir_name, 'timestamp.pkl')),
+                            msg='Timestamps with timezones should be pickled')
+            self.assertEqual(EOPatch.load(tmp_dir_name).timestamp, eopatch.timestamp)
+
+    def test_pickle_free_storage(self):
+        eopatch = EOPatch(bbox=BBox((1, 2, 3, 4), CRS.WGS84), timestamp=self.eopatch.timestamp,
+                          meta_info={'index': 1, 'name': 'patch', 'values': [0.5, None, True], 'nested': {'a': 'b'}})
+        polygons = [BBox((1, 2, 1.5, 3), crs=CRS.WGS84).get_geometry(), None]
+        eopatch.vector['clouds'] = GeoDataFrame({'TIMESTAMP': eopatch.timestamp, 'label': ['a', 'bc'],
+                                                 'value': [1, 2]}, geometry=polygons, crs={'init': 'epsg:4326'})
+        eopatch.vector_timeless['fields'] = GeoDataFrame({'area': [2.5]}, index=['field_1'],
+                                                         geometry=polygons[:1], crs={'init': 'epsg:4326'})
+
+        for compress_level in [0, 1]:
+            with tempfile.TemporaryDirectory() as tmp_dir_name:
+                eopatch.save(tmp_dir_name, compress_level=compress_level)
+                extension = '.gz' if compress_level else ''
+                for filename in ['bbox.json', 'meta_info.json', 'vector/clouds.columnar',
+                                 'vector_timeless/fields.columnar']:
+                    self.assertTrue(os.path.exists(os.path.join(tmp_dir_name, filename + extension)))
+
+                loaded_eopatch = EOPatch.load(tmp_dir_name)
+                self.assertEqual(loaded_eopatch, eopatch)
+                self.assertEqual(loaded_eopatch.bbox, eopatch.bbox)
+                self.assertEqual(loaded_eopatch.vector_timeless['fields'].index.tolist(), ['field_1'])
+                self.assertIsNone(loaded_eopatch.vector['clouds'].geometry[1])
+
+                loaded_eopatch.vector['clouds'].loc[0, 'value'] = 3
+                self.assertNotEqual(loaded_eopatch, eopatch)
+
+        eopatch.meta_info['tuple'] = (1, 2)
+        eopatch.vector_timeless['fields']['objects'] = [{'a': 1}]
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name)
+            for filename in ['meta_info.pkl', 'vector_timeless/fields.pkl']:
+                self.assertTrue(os.path.exists(os.path.join(tmp_dir_name, filename)),
+                                msg='Features which cannot be saved without pickle should be pickled')
+            self.assertEqual(EOPatch.load(tmp_dir_name), eopatch)
+
+    def test_codecs(self):
+        for codec, extension in [('bz2', '.bz2'), ('lzma', '.xz')]:
+            for file_format in [FileFormat.NPY, FileFormat.PICKLE]:
+                with tempfile.TemporaryDirectory() as tmp_dir_name:
+                    self.eopatch.save(tmp_dir_name, file_format=file_format, codec=codec)
+                    self.assertTrue(os.path.exists(os.path.join(tmp_dir_name, 'data_timeless',
+                                                                'mask' + file_format.extension() + extension)))
+                    self.assertEqual(EOPatch.load(tmp_dir_name), self.eopatch)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            codecs = {FeatureType.DATA_TIMELESS: 'lzma', 'timestamp': None}
+            self.eopatch.save(tmp_dir_name, codec=codecs, compress_level=1)
+            for filename in ['data_timeless/mask.npy.xz', 'timestamp.npy', 'meta_info.json.gz']:
+                self.assertTrue(os.path.exists(os.path.join(tmp_dir_name, filename)))
+
+            eopatch = EOPatch.load(tmp_dir_name, time_slice=slice(1, 2))
+            self.assertEqual(eopatch.timestamp, self.eopatch.timestamp[1:])
+            self.assertEqual(EOPatch.describe(tmp_dir_name).get_feature(FeatureType.DATA_TIMELESS, 'mask').shape,
+                             self.eopatch.data_timeless['mask'].shape)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            self.eopatch.save(tmp_dir_name, file_format=FileFormat.CHUNKED, codec='bz2')
+            with open(os.path.join(tmp_dir_name, 'data_timeless', 'mask.chunked', 'header.json')) as header_file:
+                self.assertEqual(json.load(header_file)['compression'], 'bz2')
+            self.assertEqual(EOPatch.load(tmp_dir_name), self.eopatch)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            with self.assertRaises(ValueError):
+                self.eopatch.save(tmp_dir_name, file_format='xz')
+            with self.assertRaises(ValueError):
+                self.eopatch.save(tmp_dir_name, codec='zlib')
+            with self.assertRaises(ValueError):
+                self.eopatch.save(tmp_dir_name, codec='non-existing-codec')
+
+    def test_quantization(self):
+        eopatch = EOPatch()
+        eopatch.data['bands'] = np.random.rand(3, 20, 30, 4).astype(np.float32)
+        eopatch.data['bands'][1, 5:10, ...] = np.nan
+        eopatch.data['ndvi'] = np.random.rand(3, 20, 30, 1).astype(np.float32)
+        eopatch.mask['mask'] = np.ones((3, 20, 30, 1), dtype=np.uint8)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            quantization = {FeatureType.DATA: Quantization(np.uint16, value_range=(0, 1)),
+                            (FeatureType.DATA, 'ndvi'): Quantization(np.uint8, value_range=(0, 1))}
+            eopatch.save(tmp_dir_name, file_format=FileFormat.CHUNKED, quantization=quantization, compress_level=1)
+
+            for lazy_loading in [True, False]:
+                loaded_eopatch = EOPatch.load(tmp_dir_name, lazy_loading=lazy_loading)
+                for feature_name, max_error in [('bands', 1e-4), ('ndvi', 1e-2)]:
+                    loaded_data = loaded_eopatch.data[feature_name]
+                    self.assertEqual(loaded_data.dtype, np.float32)
+                    self.assertTrue(np.array_equal(np.isnan(loaded_data), np.isnan(eopatch.data[feature_name])))
+                    self.assertTrue(np.nanmax(np.abs(loaded_data - eopatch.data[feature_name])) < max_error)
+                self.assertTrue(np.array_equal(loaded_eopatch.mask['mask'], eopatch.mask['mask']))
+
+            description = EOPatch.describe(tmp_dir_name).get_feature(FeatureType.DATA, 'bands')
+            self.assertEqual(description.dtype, np.float32)
+            self.assertTrue(os.path.getsize(os.path.join(tmp_dir_name, 'data', 'bands.chunked', '0_0_0_0.chunk')) <
+                            eopatch.data['bands'][0].nbytes)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            with self.assertRaises(ValueError):
+                eopatch.save(tmp_dir_name, quantization={FeatureType.DATA: Quantization()})
+            with self.assertRaises(ValueError):
+                eopatch.save(tmp_dir_name, file_format=FileFormat.CHUNKED,
+                             quantization={FeatureType.MASK: Quantization()})
+
+    def test_packed_masks(self):
+        eopatch = EOPatch()
+        eopatch.mask['IS_DATA'] = np.random.rand(5, 20, 30, 1) > 0.2
+        eopatch.mask['CLM'] = (np.random.rand(5, 20, 30, 1) > 0.5).astype(np.uint8)
+        eopatch.mask['LABELS'] = np.random.randint(0, 5, size=(5, 20, 30, 1), dtype=np.uint8)
+        eopatch.mask_timeless['VALID'] = PackedMask.from_array(np.random.rand(20, 30, 1) > 0.5)
+
+        for file_format, compress_level in [(FileFormat.NPY, 0), (FileFormat.NPY, 1), (FileFormat.CHUNKED, 1)]:
+            with tempfile.TemporaryDirectory() as tmp_dir_name:
+                eopatch.save(tmp_dir_name, file_format=file_format, compress_level=compress_level, pack_masks=True)
+
+                extension = FileFormat.PACKED_BITS.extension() + ('.gz' if compress_level else '')
+                for feature_type, feature_name in [(FeatureType.MASK, 'IS_DATA'), (FeatureType.MASK, 'CLM'),
+                                                   (FeatureType.MASK_TIMELESS, 'VALID')]:
+                    self.assertTrue(os.path.exists(os.path.join(tmp_dir_name, feature_type.value,
+                                                                feature_name + extension)))
+                self.assertFalse(os.path.exists(os.path.join(tmp_dir_name, 'mask', 'LABELS' + extension)))
+
+                loaded_eopatch = EOPatch.load(tmp_dir_name)
+                for feature_name in ['IS_DATA', 'CLM', 'LABELS']:
+                    self.assertEqual(loaded_eopatch.mask[feature_name].dtype, eopatch.mask[feature_name].dtype)
+                    self.assertTrue(np.array_equal(loaded_eopatch.mask[feature_name], eopatch.mask[feature_name]))
+                self.assertTrue(np.array_equal(loaded_eopatch.mask_timeless['VALID'],
+                                               eopatch.mask_timeless['VALID'].unpack()))
+
+                loaded_eopatch = EOPatch.load(tmp_dir_name, time_slice=slice(1, 3), pixel_window=(slice(2, 7),
+                                                                                                   slice(5, 9)))
+                self.assertTrue(np.array_equal(loaded_eopatch.mask['IS_DATA'], eopatch.mask['IS_DATA'][1:3, 2:7, 5:9]))
+
+                description = EOPatch.describe(tmp_dir_name, features=[FeatureType.MASK])
+                self.assertEqual(description.get_feature(FeatureType.MASK, 'CLM').dtype, np.uint8)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name)
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir_name, 'mask', 'IS_DATA.npy')))
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir_name, 'mask_timeless', 'VALID.bits')))
+
+        with self.assertRaises(ValueError):
+            eopatch.data['packed'] = PackedMask.from_array(np.zeros((5, 20, 30, 1), dtype=bool))
+
+    def test_memory_budget(self):
+        eopatch = EOPatch()
+        for feature_name in ['a', 'b', 'c']:
+            eopatch.data[feature_name] = np.random.rand(4, 16, 16, 4)
+        feature_size = eopatch.data['a'].nbytes
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name)
+            loaded_eopatch = EOPatch.load(tmp_dir_name, lazy_loading=True, memory_budget=int(2.5 * feature_size))
+            data = loaded_eopatch.data
+
+            def get_loaded_features():
+                return {name for name, value in dict.items(data) if isinstance(value, np.ndarray)}
+
+            for feature_name in ['a', 'b', 'a', 'c']:
+                self.assertTrue(np.array_equal(data[feature_name], eopatch.data[feature_name]))
+            self.assertEqual(get_loaded_features(), {'a', 'c'})
+
+            with self.assertRaises(ValueError):
+                data['a'][0, 0, 0, 0] = 1
+
+            modified_feature = data['a'] + 1
+            data['a'] = modified_feature
+            self.assertTrue(np.array_equal(data['b'], eopatch.data['b']))
+            self.assertTrue(np.array_equal(data['c'], eopatch.data['c']))
+            self.assertEqual(get_loaded_features(), {'a', 'b', 'c'})
+            self.assertTrue(data['a'] is modified_feature)
+
+            loaded_eopatch = EOPatch.load(tmp_dir_name, lazy_loading=True, memory_budget='1 kB')
+            self.assertEqual(loaded_eopatch, eopatch)
+
+            with self.assertRaises(ValueError):
+                EOPatch.load(tmp_dir_name, memory_budget='1GB')
+            with self.assertRaises(ValueError):
+                EOPatch.load(tmp_dir_name, lazy_loading=True, memory_budget='a lot')
+
+    def test_memory_report(self):
+        eopatch = EOPatch()
+        eopatch.data['bands'] = np.zeros((2, 10, 10, 3), dtype=np.float32)
+        eopatch.data['view'] = eopatch.data['bands'][:, :5]
+        eopatch.mask['packed'] = PackedMask.from_array(np.ones((2, 10, 10, 1), dtype=bool))
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name, features=[(FeatureType.DATA, 'bands')])
+            eopatch.data_timeless['mapped'] = EOPatch.load(tmp_dir_name, mmap=True).data['bands'][0]
+
+            report = eopatch.memory_report()
+            storage = dict(zip(report['feature_name'], report['storage']))
+            self.assertEqual(storage, {'bands': 'resident', 'view': 'view', 'packed': 'packed', 'mapped': 'memmap'})
+            self.assertEqual(list(report['feature_name'][:2]), ['bands', 'view'])
+            self.assertEqual(eopatch.nbytes, 2400 + 1200 + eopatch.mask['packed'].nbytes)
+
+            lazy_eopatch = EOPatch.load(tmp_dir_name, lazy_loading=True)
+            self.assertEqual(list(lazy_eopatch.memory_report()['storage']), ['not loaded'])
+            self.assertEqual(lazy_eopatch.nbytes, 0)
+
+    def test_dtype_policy(self):
+        dtype_policy = DtypePolicy(float_dtype=np.float32, downcast_discrete=True)
+        eopatch = EOPatch(dtype_policy=dtype_policy, data={'bands': np.random.rand(2, 3, 3, 1)})
+        eopatch.mask['mask'] = np.full((2, 3, 3, 1), 300, dtype=np.int64)
+        eopatch.mask_timeless['signed'] = np.full((3, 3, 1), -1, dtype=np.int32)
+        eopatch.scalar['values'] = np.array([[1.5]], dtype=np.float16)
+        eopatch.data_timeless['integers'] = np.ones((3, 3, 1), dtype=np.int64)
+
+        self.assertEqual(eopatch.data['bands'].dtype, np.float32)
+        self.assertEqual(eopatch.mask['mask'].dtype, np.uint16)
+        self.assertEqual(eopatch.mask_timeless['signed'].dtype, np.int8)
+        self.assertEqual(eopatch.scalar['values'].dtype, np.float16)
+        self.assertEqual(eopatch.data_timeless['integers'].dtype, np.int64)
+        self.assertEqual(copy.copy(eopatch).dtype_policy, dtype_policy)
+
+        eopatch = EOPatch(data={'bands': np.random.rand(2, 3, 3, 1)})
+        eopatch.dtype_policy = dtype_policy
+        self.assertEqual(eopatch.data['bands'].dtype, np.float32)
+        self.assertEqual(eopatch.get_changed_features(), [(FeatureType.DATA, 'bands')])
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            EOPatch(data={'bands': np.random.rand(2, 3, 3, 1)}).save(tmp_dir_name)
+            for lazy_loading in [True, False]:
+                loaded_eopatch = EOPatch.load(tmp_dir_name, lazy_loading=lazy_loading, dtype_policy=dtype_policy)
+                self.assertEqual(loaded_eopatch.data['bands'].dtype, np.float32)
+                self.assertEqual(loaded_eopatch.get_changed_features(), [])
+
+        with self.assertRaises(ValueError):
+            DtypePolicy(float_dtype=np.int32)
+
+    def test_save_only_changed(self):
+        eopatch = EOPatch(data={'a': np.zeros((2, 3, 3, 1)), 'b': np.ones((2, 3, 3, 1))}, meta_info={'x': 1},
+                          bbox=BBox((1, 2, 3, 4), CRS.WGS84))
+        self.assertEqual(set(eopatch.get_changed_features()), {(FeatureType.DATA, 'a'), (FeatureType.DATA, 'b'),
+                                                               (FeatureType.META_INFO, 'x'), FeatureType.BBOX})
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name)
+            self.assertEqual(eopatch.get_changed_features(), [])
+
+            loaded_eopatch = EOPatch.load(tmp_dir_name, lazy_loading=True)
+            self.assertEqual(loaded_eopatch.get_changed_features(), [])
+            self.assertEqual(loaded_eopatch.data['a'].shape, (2, 3, 3, 1))
+            self.assertEqual(loaded_eopatch.meta_info['x'], 1)
+            self.assertEqual(loaded_eopatch.get_changed_features(), [])
+
+            loaded_eopatch.data['a'] = np.full((2, 3, 3, 1), 5.0)
+            loaded_eopatch.mask_timeless['m'] = np.ones((3, 3, 1), dtype=np.uint8)
+            self.assertEqual(set(loaded_eopatch.get_changed_features()), {(FeatureType.DATA, 'a'),
+                                                                          (FeatureType.MASK_TIMELESS, 'm')})
+
+            b_file_path = loaded_eopatch.data.__getitem__('b', load=False).get_file_path()
+            b_modification_time = os.path.getmtime(b_file_path)
+
+            with self.assertRaises(ValueError):
+                loaded_eopatch.save(tmp_dir_name, only_changed=True)
+
+            loaded_eopatch.save(tmp_dir_name, overwrite_permission=OverwritePermission.OVERWRITE_FEATURES,
+                                only_changed=True)
+            self.assertEqual(loaded_eopatch.get_changed_features(), [])
+            self.assertEqual(os.path.getmtime(b_file_path), b_modification_time)
+
+            with self.assertRaises(ValueError):
+                loaded_eopatch.save(os.path.join(tmp_dir_name, 'other'), only_changed=True)
+            with self.assertRaises(ValueError):
+                loaded_eopatch.save(tmp_dir_name, overwrite_permission=OverwritePermission.OVERWRITE_PATCH,
+                                    only_changed=True)
+
+            result = EOPatch.load(tmp_dir_name)
+            self.assertTrue(np.array_equal(result.data['a'], loaded_eopatch.data['a']))
+            self.assertTrue(np.array_equal(result.data['b'], eopatch.data['b']))
+            self.assertTrue(np.array_equal(result.mask_timeless['m'], loaded_eopatch.mask_timeless['m']))
+            self.assertEqual(result.meta_info, eopatch.meta_info)
+            self.assertEqual(result.bbox, eopatch.bbox)
+
     def test_different_formats_equality(self):
         with tempfile.TemporaryDirectory() as tmp_dir_name:
             self.eopatch.save(tmp_dir_name, file_format=FileFormat.PICKLE, compress_level=4)
@@ -377,6 +848,412 @@ class TestSavingLoading(unittest.TestCase):
         for eopatch1, eopatch2 in itertools.combinations(patches, 2):
             self.assertEqual(eopatch1, eopatch2)
 
+    def test_concurrent_save_load(self):
+        features = [feature_type for feature_type in FeatureType if not feature_type.is_vector()]
+        eopatch = EOPatch.load(TestEOPatchFeatureTypes.PATCH_FILENAME, features=features)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name, compress_level=1, workers=4)
+            self.assertFalse([filename for filename in os.listdir(os.path.dirname(tmp_dir_name))
+                              if filename.startswith('{}_tmp_'.format(os.path.basename(tmp_dir_name)))],
+                             msg='Temporary folder should be removed after saving')
+
+            eopatch2 = EOPatch.load(tmp_dir_name, workers=4)
+            self.assertEqual(eopatch, eopatch2)
+
+            eopatch2 = EOPatch.load(tmp_dir_name, lazy_loading=True, workers=None)
+            self.assertEqual(eopatch, eopatch2)
+
+    def test_concurrent_save_failure(self):
+        eopatch = EOPatch()
+        eopatch.data_timeless['first'] = np.arange(3 * 3 * 2).reshape(3, 3, 2)
+        eopatch.data_timeless['second'] = np.arange(3 * 3 * 2).reshape(3, 3, 2)
+        eopatch.meta_info['something'] = lambda: None  # this can't be pickled
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            patch_path = os.path.join(tmp_dir_name, 'patch')
+            with self.assertRaises((pickle.PicklingError, AttributeError)):
+                eopatch.save(patch_path, workers=3)
+
+            self.assertEqual(os.listdir(tmp_dir_name), [], msg='Nothing should remain after a failed save')
+
+    def test_chunked_format(self):
+        eopatch = EOPatch()
+        eopatch.data['bands'] = np.random.rand(4, 300, 270, 2).astype(np.float32)
+        eopatch.mask_timeless['mask'] = np.random.randint(0, 5, (300, 270, 1), dtype=np.uint8)
+        eopatch.scalar['values'] = np.random.rand(4, 3)
+        eopatch.timestamp = [datetime.datetime(2017, 1, day) for day in range(1, 5)]
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name, file_format=FileFormat.CHUNKED, compress_level=1, workers=2)
+
+            bands_path = os.path.join(tmp_dir_name, 'data', 'bands.chunked')
+            self.assertTrue(os.path.isdir(bands_path))
+            self.assertEqual(len([filename for filename in os.listdir(bands_path) if filename.endswith('.chunk')]),
+                             4 * 2 * 2, msg='Each time frame should be split into spatial tiles')
+
+            for lazy_loading in [True, False]:
+                self.assertEqual(eopatch, EOPatch.load(tmp_dir_name, lazy_loading=lazy_loading))
+
+            eopatch.mask_timeless['mask'] = eopatch.mask_timeless['mask'] + 1
+            eopatch.save(tmp_dir_name, file_format=FileFormat.NPY, overwrite_permission=1)
+            self.assertEqual(eopatch, EOPatch.load(tmp_dir_name))
+            self.assertFalse(os.path.exists(bands_path), msg='Chunked feature should be replaced')
+
+
+
+    def test_append_frames(self):
+        eopatch = EOPatch(bbox=BBox((1, 2, 3, 4), CRS.WGS84))
+        eopatch.data['bands'] = np.random.rand(5, 20, 30, 2).astype(np.float32)
+        eopatch.mask['mask'] = np.random.randint(0, 5, (5, 20, 30, 1), dtype=np.uint8)
+        eopatch.scalar['values'] = np.random.rand(5, 3)
+        eopatch.data_timeless['dem'] = np.random.rand(20, 30, 1)
+        eopatch.timestamp = [datetime.datetime(2017, 1, day) for day in range(1, 6)]
+
+        old_eopatch = EOPatch(bbox=eopatch.bbox, timestamp=eopatch.timestamp[:3],
+                              data_timeless=eopatch.data_timeless)
+        new_eopatch = EOPatch(bbox=eopatch.bbox, timestamp=eopatch.timestamp[3:])
+        for feature_type in [FeatureType.DATA, FeatureType.MASK, FeatureType.SCALAR]:
+            for feature_name, value in eopatch[feature_type].items():
+                old_eopatch[feature_type][feature_name] = value[:3]
+                new_eopatch[feature_type][feature_name] = value[3:]
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            old_eopatch.save(tmp_dir_name, file_format=FileFormat.CHUNKED, compress_level=1)
+
+            first_frame_path = os.path.join(tmp_dir_name, 'data', 'bands.chunked', '0_0_0_0.chunk')
+            first_frame_time = os.path.getmtime(first_frame_path)
+
+            EOPatch.append_frames(tmp_dir_name, new_eopatch)
+
+            self.assertEqual(os.path.getmtime(first_frame_path), first_frame_time)
+            self.assertEqual(EOPatch.load(tmp_dir_name), eopatch)
+            self.assertEqual(EOPatch.load(tmp_dir_name, time_slice=slice(2, 4)).data['bands'].shape, (2, 20, 30, 2))
+
+            description = EOPatch.describe(tmp_dir_name)
+            self.assertEqual(description.get_feature(FeatureType.DATA, 'bands').shape, (5, 20, 30, 2))
+            self.assertEqual(description.timestamp_count, 5)
+
+            invalid_eopatch = new_eopatch.__copy__(features=[FeatureType.DATA, FeatureType.MASK, FeatureType.SCALAR])
+            with self.assertRaises(ValueError):
+                EOPatch.append_frames(tmp_dir_name, invalid_eopatch)
+
+            invalid_eopatch.timestamp = new_eopatch.timestamp
+            invalid_eopatch.data['bands'] = invalid_eopatch.data['bands'][:, :10]
+            with self.assertRaises(ValueError):
+                EOPatch.append_frames(tmp_dir_name, invalid_eopatch)
+
+            del invalid_eopatch.data['bands']
+            with self.assertRaises(ValueError):
+                EOPatch.append_frames(tmp_dir_name, invalid_eopatch)
+
+            self.assertEqual(EOPatch.load(tmp_dir_name), eopatch, msg='Failed appending should not change EOPatch')
+
+    def test_append_invalid_frames(self):
+        timestamps = [datetime.datetime(2017, 1, day) for day in range(1, 6)]
+        eopatch = EOPatch(timestamp=timestamps[:3])
+        eopatch.data['bands'] = np.random.rand(3, 4, 5, 2).astype(np.float32)
+        eopatch.scalar['values'] = np.random.rand(3, 2)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name, file_format=FileFormat.CHUNKED, summaries=True,
+                         quantization={(FeatureType.SCALAR, 'values'): Quantization(np.uint8, value_range=(0, 1))})
+            saved_files = sorted(os.listdir(os.path.join(tmp_dir_name, 'data', 'bands.chunked')))
+            loaded_eopatch = EOPatch.load(tmp_dir_name)
+            description = EOPatch.describe(tmp_dir_name)
+
+            for new_timestamps in [[timestamps[3], timestamps[3]], [timestamps[4], timestamps[3]], timestamps[2:4],
+                                   timestamps[:2]]:
+                new_eopatch = EOPatch(timestamp=new_timestamps, data={'bands': np.zeros((2, 4, 5, 2))},
+                                      scalar={'values': np.zeros((2, 2))})
+                with self.assertRaises(ValueError):
+                    EOPatch.append_frames(tmp_dir_name, new_eopatch)
+
+            new_eopatch = EOPatch(timestamp=timestamps[3:], data={'bands': np.zeros((2, 4, 5, 2))},
+                                  scalar={'values': np.full((2, 2), 5.0)})
+            with self.assertRaises(ValueError):
+                EOPatch.append_frames(tmp_dir_name, new_eopatch)
+
+            self.assertEqual(sorted(os.listdir(os.path.join(tmp_dir_name, 'data', 'bands.chunked'))), saved_files,
+                             msg='Chunks of a failed append should be removed')
+            self.assertEqual(EOPatch.load(tmp_dir_name), loaded_eopatch)
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                self.assertEqual(EOPatch.describe(tmp_dir_name), description)
+
+            new_eopatch.scalar['values'] = np.full((2, 2), 0.5)
+            EOPatch.append_frames(tmp_dir_name, new_eopatch)
+            appended_eopatch = EOPatch.load(tmp_dir_name)
+            self.assertEqual(appended_eopatch.timestamp, timestamps)
+            self.assertTrue(np.allclose(appended_eopatch.scalar['values'][3:], 0.5, atol=0.01))
+
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                description = EOPatch.describe(tmp_dir_name)
+            self.assertEqual(description.get_feature(FeatureType.DATA, 'bands').shape, (5, 4, 5, 2))
+            self.assertEqual(len(description.get_feature(FeatureType.DATA, 'bands').summary['frames']), 5)
+
+    def test_windowed_loading(self):
+        eopatch = EOPatch()
+        eopatch.data['bands'] = np.random.rand(6, 30, 40, 5).astype(np.float32)
+        eopatch.data_timeless['dem'] = np.random.rand(30, 40, 1)
+        eopatch.mask['mask'] = np.random.randint(0, 3, (6, 30, 40, 1), dtype=np.uint8)
+        eopatch.scalar['values'] = np.random.rand(6, 2)
+        eopatch.label_timeless['label'] = np.array([1, 2, 3])
+        eopatch.timestamp = [datetime.datetime(2018, 1, day) for day in range(1, 7)]
+        eopatch.bbox = BBox((100, 200, 500, 500), CRS.UTM_33N)
+
+        time_slice, pixel_window, bands = slice(-4, None, 2), (slice(10, 25), slice(0, 8)), [4, 0, 2]
+        expected_eopatch = EOPatch(
+            data={'bands': eopatch.data['bands'][-4::2, 10:25, 0:8, :][..., bands]},
+            data_timeless={'dem': eopatch.data_timeless['dem'][10:25, 0:8, :]},
+            mask={'mask': eopatch.mask['mask'][-4::2, 10:25, 0:8, :]},
+            scalar={'values': eopatch.scalar['values'][-4::2]},
+            label_timeless={'label': eopatch.label_timeless['label']},
+            timestamp=eopatch.timestamp[-4::2],
+            bbox=BBox((100, 200 + 5 * 10, 180, 200 + 20 * 10), CRS.UTM_33N)
+        )
+
+        for file_format, compress_level in [('npy', 0), ('npy', 1), ('pkl', 1), ('chunked', 1)]:
+            with tempfile.TemporaryDirectory() as tmp_dir_name:
+                eopatch.save(tmp_dir_name, file_format=file_format, compress_level=compress_level)
+
+                for lazy_loading in [False, True]:
+                    loaded_eopatch = EOPatch.load(tmp_dir_name, lazy_loading=lazy_loading, time_slice=time_slice,
+                                                  pixel_window=pixel_window, bands=bands)
+                    self.assertEqual(loaded_eopatch, expected_eopatch,
+                                     msg='Windowed loading failed for format {}'.format(file_format))
+
+                loaded_eopatch = EOPatch.load(tmp_dir_name, features=[(FeatureType.DATA, 'bands')], time_slice=3)
+                self.assertTrue(np.array_equal(loaded_eopatch.data['bands'], eopatch.data['bands'][3:4]))
+
+                with self.assertRaises(ValueError):
+                    EOPatch.load(tmp_dir_name, pixel_window=(slice(0, 10, 2), slice(0, 10)))
+
+    def test_container(self):
+        eopatch = EOPatch(bbox=BBox((100, 200, 500, 500), CRS.UTM_33N),
+                          timestamp=[datetime.datetime(2018, 1, day) for day in range(1, 4)])
+        eopatch.data['bands'] = np.random.rand(3, 10, 12, 2).astype(np.float32)
+        eopatch.mask_timeless['mask'] = np.random.randint(0, 2, (10, 12, 1), dtype=np.uint8)
+        eopatch.meta_info['index'] = 1
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            container_path = os.path.join(tmp_dir_name, 'eopatch.zip')
+            eopatch.save(container_path, container=True)
+            self.assertTrue(os.path.isfile(container_path))
+            self.assertEqual(os.listdir(tmp_dir_name), ['eopatch.zip'])
+
+            self.assertEqual(EOPatch.load(container_path), eopatch)
+            self.assertEqual(EOPatch.load(container_path, lazy_loading=True), eopatch)
+
+            mmap_eopatch = EOPatch.load(container_path, mmap=True, features=[(FeatureType.DATA, 'bands')])
+            self.assertIsInstance(mmap_eopatch.data['bands'], np.memmap)
+            self.assertEqual(mmap_eopatch.get_feature_list(), [(FeatureType.DATA, 'bands')])
+
+            windowed_eopatch = EOPatch.load(container_path, time_slice=[0, 2], pixel_window=(slice(2, 5), slice(0, 4)))
+            self.assertTrue(np.array_equal(windowed_eopatch.data['bands'], eopatch.data['bands'][[0, 2], 2:5, 0:4]))
+            self.assertEqual(windowed_eopatch.timestamp, eopatch.timestamp[::2])
+
+            lazy_eopatch = EOPatch.load(container_path, lazy_loading=True)
+            new_mask = np.zeros((10, 12, 1), dtype=np.uint8)
+            lazy_eopatch.mask_timeless['mask'] = new_mask
+            lazy_eopatch.save(container_path, container=True, compress_level=1, only_changed=True,
+                              overwrite_permission=OverwritePermission.OVERWRITE_FEATURES)
+            self.assertTrue(np.array_equal(lazy_eopatch.data['bands'], eopatch.data['bands']))
+
+            loaded_eopatch = EOPatch.load(container_path)
+            self.assertTrue(np.array_equal(loaded_eopatch.mask_timeless['mask'], new_mask))
+            self.assertEqual(loaded_eopatch.meta_info, eopatch.meta_info)
+            self.assertEqual(EOPatch.describe(container_path).get_feature(FeatureType.DATA, 'bands').shape,
+                             (3, 10, 12, 2))
+
+            with self.assertRaises(ValueError):
+                eopatch.save(container_path, container=True)
+            with self.assertRaises(NotADirectoryError):
+                eopatch.save(container_path)
+            with self.assertRaises(IsADirectoryError):
+                eopatch.save(tmp_dir_name, container=True)
+            with self.assertRaises(ValueError):
+                eopatch.save(os.path.join(tmp_dir_name, 'other.zip'), container=True, file_format=FileFormat.CHUNKED)
+
+    def test_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            self.eopatch.save(tmp_dir_name)
+
+            manifest_path = os.path.join(tmp_dir_name, 'manifest.json')
+            with open(manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+
+            entries = {(entry['feature_type'], entry['feature_name']): entry for entry in manifest['features']}
+            self.assertEqual(set(entries), {('data_timeless', 'mask'), ('scalar', 'my scalar with spaces'),
+                                            ('meta_info', None), ('timestamp', None)})
+            self.assertEqual(entries['data_timeless', 'mask']['shape'], [3, 3, 2])
+            self.assertEqual(entries['data_timeless', 'mask']['dtype'], np.dtype(np.int16).str)
+            self.assertEqual(entries['timestamp', None]['length'], 2)
+            for entry in entries.values():
+                self.assertEqual(entry['size'], os.path.getsize(os.path.join(tmp_dir_name, entry['filename'])))
+
+            add_eopatch = EOPatch(data={'new': np.zeros((2, 3, 3, 1))})
+            add_eopatch.save(tmp_dir_name, compress_level=1)
+            os.mkdir(os.path.join(tmp_dir_name, 'unknown_folder'))
+
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                eopatch = EOPatch.load(tmp_dir_name)
+            self.assertEqual(eopatch, self.eopatch + add_eopatch)
+
+            with self.assertRaises(ValueError):
+                add_eopatch.save(tmp_dir_name)
+
+            os.remove(os.path.join(tmp_dir_name, 'data_timeless', 'mask.npy'))
+            with self.assertWarns(UserWarning):
+                eopatch = EOPatch.load(tmp_dir_name, features=[FeatureType.DATA_TIMELESS, FeatureType.DATA])
+            self.assertEqual(eopatch.get_feature_list(), [(FeatureType.DATA, 'new')])
+
+            with open(manifest_path, 'w') as manifest_file:
+                manifest_file.write('{')
+            with self.assertWarns(UserWarning):
+                eopatch = EOPatch.load(tmp_dir_name)
+            self.assertTrue(np.array_equal(eopatch.data['new'], add_eopatch.data['new']))
+
+            self.eopatch.save(tmp_dir_name, overwrite_permission=OverwritePermission.OVERWRITE_FEATURES)
+            self.assertEqual(EOPatch.load(tmp_dir_name), self.eopatch + add_eopatch)
+
+    def test_outdated_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            self.eopatch.save(tmp_dir_name)
+            np.save(os.path.join(tmp_dir_name, 'data_timeless', 'added.npy'), np.ones((3, 3, 1)))
+            os.makedirs(os.path.join(tmp_dir_name, 'mask'))
+            np.save(os.path.join(tmp_dir_name, 'mask', 'other.npy'), np.zeros((2, 3, 3, 1), dtype=bool))
+
+            for lazy_loading in [False, True]:
+                with self.assertWarns(UserWarning):
+                    eopatch = EOPatch.load(tmp_dir_name, lazy_loading=lazy_loading)
+                self.assertTrue(np.array_equal(eopatch.data_timeless['added'], np.ones((3, 3, 1))))
+                self.assertEqual(eopatch.mask['other'].shape, (2, 3, 3, 1))
+
+            with self.assertWarns(UserWarning):
+                description = EOPatch.describe(tmp_dir_name)
+            self.assertEqual(description.get_feature(FeatureType.DATA_TIMELESS, 'added').shape, (3, 3, 1))
+
+            EOPatch(mask_timeless={'new': np.zeros((3, 3, 1), dtype=np.uint8)}).save(tmp_dir_name)
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                eopatch = EOPatch.load(tmp_dir_name, lazy_loading=True)
+            self.assertEqual(len(eopatch.get_feature_list()), 7)
+
+    def test_manifest_digests(self):
+        eopatch = EOPatch(timestamp=[datetime.datetime(2017, 1, 1)])
+        eopatch.data['bands'] = np.random.rand(1, 4, 4, 2)
+        eopatch.mask_timeless['mask'] = np.ones((4, 4, 1), dtype=np.uint8)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name)
+            with open(os.path.join(tmp_dir_name, 'manifest.json')) as manifest_file:
+                entries = {entry['feature_name']: entry for entry in json.load(manifest_file)['features']}
+            self.assertNotIn('digest', entries['mask'], msg='Digests should be computed only if requested')
+
+            eopatch.save(tmp_dir_name, digests=True, overwrite_permission=OverwritePermission.OVERWRITE_PATCH)
+            with open(os.path.join(tmp_dir_name, 'manifest.json')) as manifest_file:
+                entries = {entry['feature_name']: entry for entry in json.load(manifest_file)['features']}
+            self.assertEqual(entries['mask']['digest'], compute_array_digest(eopatch.mask_timeless['mask']))
+            self.assertNotIn('digest', entries[None])
+
+            eopatch1 = EOPatch.load(tmp_dir_name, mmap=True)
+            eopatch2 = EOPatch.load(tmp_dir_name, mmap=True)
+            self.assertEqual(get_array_digest(eopatch1.mask_timeless['mask'], compute=False),
+                             entries['mask']['digest'])
+            self.assertEqual(eopatch1, eopatch2)
+            self.assertEqual(EOPatch.concatenate(eopatch1, eopatch2), eopatch)
+
+            windowed_eopatch = EOPatch.load(tmp_dir_name, mmap=True, pixel_window=(slice(0, 2), slice(0, 2)))
+            self.assertIsNone(get_array_digest(windowed_eopatch.mask_timeless['mask'], compute=False))
+
+            with tempfile.TemporaryDirectory() as copy_dir_name:
+                eopatch1.save(copy_dir_name, overwrite_permission=OverwritePermission.OVERWRITE_PATCH)
+                with open(os.path.join(copy_dir_name, 'manifest.json')) as manifest_file:
+                    copy_entries = {entry['feature_name']: entry for entry in json.load(manifest_file)['features']}
+            self.assertEqual(copy_entries['mask']['digest'], entries['mask']['digest'],
+                             msg='Known digests of loaded arrays should be written without computing them')
+
+    def test_describe(self):
+        eopatch = EOPatch(bbox=BBox((1, 2, 3, 4), CRS.WGS84), timestamp=[datetime.datetime(2017, 1, 1)] * 3)
+        eopatch.data['bands'] = np.zeros((3, 4, 5, 2), dtype=np.float32)
+        eopatch.mask_timeless['mask'] = np.ones((4, 5, 1), dtype=np.uint8)
+        eopatch.data_timeless['pickled'] = np.zeros((4, 5, 3), dtype=np.int16)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name, features=[FeatureType.DATA, FeatureType.BBOX, FeatureType.TIMESTAMP])
+            eopatch.save(tmp_dir_name, features=[FeatureType.MASK_TIMELESS], compress_level=1)
+            eopatch.save(tmp_dir_name, features=[FeatureType.DATA_TIMELESS], file_format=FileFormat.PICKLE)
+
+            description_with_manifest = EOPatch.describe(tmp_dir_name)
+            os.remove(os.path.join(tmp_dir_name, 'manifest.json'))
+            description_from_headers = EOPatch.describe(tmp_dir_name)
+
+            for description in [description_with_manifest, description_from_headers]:
+                self.assertEqual(set(description.get_feature_list()), set(eopatch.get_feature_list()))
+                self.assertEqual(description.bbox, eopatch.bbox)
+                self.assertEqual(description.timestamp_count, 3)
+
+                bands = description.get_feature(FeatureType.DATA, 'bands')
+                self.assertEqual(bands.shape, (3, 4, 5, 2))
+                self.assertEqual(bands.dtype, np.float32)
+                self.assertEqual(bands.nbytes, eopatch.data['bands'].nbytes)
+
+                mask = description.get_feature(FeatureType.MASK_TIMELESS, 'mask')
+                self.assertEqual((mask.shape, mask.dtype), ((4, 5, 1), np.uint8))
+
+            self.assertEqual(description_with_manifest.nbytes, eopatch.data['bands'].nbytes +
+                             eopatch.mask_timeless['mask'].nbytes + eopatch.data_timeless['pickled'].nbytes)
+            self.assertIsNone(description_from_headers.get_feature(FeatureType.DATA_TIMELESS, 'pickled').shape)
+
+            partial_description = EOPatch.describe(tmp_dir_name, features=[(FeatureType.DATA, 'bands')])
+            self.assertEqual(partial_description.get_feature_list(), [(FeatureType.DATA, 'bands')])
+            self.assertIsNone(partial_description.bbox)
+            with self.assertRaises(KeyError):
+                partial_description.get_feature(FeatureType.MASK_TIMELESS, 'mask')
+
+        with self.assertRaises(ValueError):
+            EOPatch.describe('non_existing_path')
+
+    def test_summaries(self):
+        eopatch = EOPatch(timestamp=[datetime.datetime(2017, 1, day) for day in range(1, 4)])
+        eopatch.data['bands'] = np.arange(3 * 2 * 2 * 1, dtype=np.float32).reshape(3, 2, 2, 1)
+        eopatch.data['bands'][0, 0, 0, 0] = np.nan
+        eopatch.mask['CLM'] = np.zeros((3, 2, 2, 1), dtype=np.uint8)
+        eopatch.mask['CLM'][1, :, :1] = 1
+        eopatch.mask_timeless['mask'] = np.ones((2, 2, 1), dtype=bool)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name, summaries=True, file_format=FileFormat.CHUNKED)
+            description = EOPatch.describe(tmp_dir_name)
+
+            bands_summary = description.get_feature(FeatureType.DATA, 'bands').summary
+            self.assertEqual((bands_summary['count'], bands_summary['nan_count']), (12, 1))
+            self.assertEqual((bands_summary['min'], bands_summary['max']), (1, 11))
+            self.assertAlmostEqual(bands_summary['mean'], np.nanmean(eopatch.data['bands']))
+            self.assertEqual([frame['min'] for frame in bands_summary['frames']], [1, 4, 8])
+            self.assertNotIn('true_fraction', bands_summary)
+
+            clouds_summary = description.get_feature(FeatureType.MASK, 'CLM').summary
+            self.assertEqual([frame['true_fraction'] for frame in clouds_summary['frames']], [0, 0.5, 0])
+            self.assertEqual(description.get_feature(FeatureType.MASK_TIMELESS, 'mask').summary['true_fraction'], 1)
+            self.assertIsNone(description.get_feature(FeatureType.TIMESTAMP).summary)
+
+            new_eopatch = EOPatch(timestamp=[datetime.datetime(2017, 1, 4)])
+            new_eopatch.data['bands'] = np.full((1, 2, 2, 1), 20, dtype=np.float32)
+            new_eopatch.mask['CLM'] = np.ones((1, 2, 2, 1), dtype=np.uint8)
+            EOPatch.append_frames(tmp_dir_name, new_eopatch)
+
+            clouds_summary = EOPatch.describe(tmp_dir_name).get_feature(FeatureType.MASK, 'CLM').summary
+            self.assertEqual([frame['true_fraction'] for frame in clouds_summary['frames']], [0, 0.5, 0, 1])
+            self.assertEqual(clouds_summary['true_fraction'], 0.375)
+
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            eopatch.save(tmp_dir_name)
+            self.assertIsNone(EOPatch.describe(tmp_dir_name).get_feature(FeatureType.DATA, 'bands').summary)
+
     def test_feature_names_case_sensitivity(self):
         eopatch = EOPatch()
         mask = np.arange(3 * 3 * 2).reshape(3, 3, 2)
@@ -1,6 +1,7 @@
 import unittest
 import logging
 import functools
+import threading
 import concurrent.futures
 from io import StringIO
 
@@ -50,6 +51,12 @@ class DummyTask(EOTask):
         return 42
 
 
+class BarrierTask(EOTask):
+    def execute(self, x, *, barrier):
+        barrier.wait()
+        return x + 1
+
+
 class TestEOWorkflow(unittest.TestCase):
 
     def test_workflow_arguments(self):
@@ -111,6 +118,37 @@ class TestEOWorkflow(unittest.TestCase):
         })
         self.assertEqual(res[pow_task], (2+2)**3)
 
+    def test_concurrent_branches(self):
+        in_task = InputTask()
+        branch_task1 = BarrierTask()
+        branch_task2 = BarrierTask()
+        mul_task = MulTask()
+        inc_task = Inc()
+
+        workflow = EOWorkflow([
+            (in_task, []),
+            (branch_task1, [in_task]),
+            (branch_task2, [in_task]),
+            (mul_task, [branch_task1, branch_task2]),
+            (inc_task, [mul_task])
+        ])
+
+        def get_input_args(barrier):
+            return {
+                in_task: {'val': 2},
+                branch_task1: {'barrier': barrier},
+                branch_task2: {'barrier': barrier},
+                inc_task: {'d': 3}
+            }
+
+        for workers in [2, None]:
+            result = workflow.execute(get_input_args(threading.Barrier(2, timeout=10)), workers=workers)
+            self.assertEqual(len(result), 1)
+            self.assertEqual(result[inc_task], 12)
+
+        with self.assertRaises(threading.BrokenBarrierError):
+            workflow.execute(get_input_args(threading.Barrier(2, timeout=0.1)), workers=1)
+
     def test_get_tasks(self):
         in_task = InputTask()
         inc_task = Inc()
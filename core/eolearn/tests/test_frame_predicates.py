@@ -0,0 +1,92 @@
+import unittest
+import logging
+import os
+import datetime
+import tempfile
+
+import numpy as np
+
+from eolearn.core import EOPatch, FeatureType, FileFormat, LoadFromDisk, TimeIntervalPredicate, MaxFractionPredicate, \
+    ScalarThresholdPredicate
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestFramePredicates(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        eopatch = EOPatch(timestamp=[datetime.datetime(2018, month, 1) for month in range(3, 9)])
+        eopatch.data['bands'] = np.arange(6 * 4 * 4 * 2, dtype=np.float32).reshape(6, 4, 4, 2)
+        eopatch.mask['CLM'] = np.zeros((6, 4, 4, 1), dtype=np.uint8)
+        eopatch.mask['CLM'][1, :2] = 1
+        eopatch.mask['CLM'][4] = 1
+        eopatch.scalar['valid'] = np.array([[1.0], [0.9], [np.nan], [0.8], [0.2], [1.0]])
+
+        cls.eopatch = eopatch
+
+    def test_predicates(self):
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            for summaries in [False, True]:
+                path = os.path.join(tmp_dir_name, 'patch_{}'.format(summaries))
+                self.eopatch.save(path, summaries=summaries)
+                description = EOPatch.describe(path)
+
+                self.assertEqual(TimeIntervalPredicate('2018-04-01', '2018-06-01')(description),
+                                 [False, True, True, True, False, False])
+                self.assertEqual(TimeIntervalPredicate(end_time=datetime.datetime(2018, 3, 15))(description),
+                                 [True] + [False] * 5)
+                self.assertEqual(MaxFractionPredicate((FeatureType.MASK, 'CLM'), max_fraction=0.5)(description),
+                                 [True, True, True, True, False, True])
+                self.assertEqual(MaxFractionPredicate((FeatureType.MASK, 'CLM'), max_fraction=0.1)(description),
+                                 [True, False, True, True, False, True])
+                self.assertEqual(ScalarThresholdPredicate((FeatureType.SCALAR, 'valid'), min_value=0.85)(description),
+                                 [True, True, False, False, False, True])
+
+                predicate = TimeIntervalPredicate(start_time='2018-04-01') & \
+                    MaxFractionPredicate((FeatureType.MASK, 'CLM'), max_fraction=0.1)
+                self.assertEqual(predicate(description), [False, False, True, True, False, True])
+                predicate = ScalarThresholdPredicate((FeatureType.SCALAR, 'valid'), max_value=0.5) | \
+                    TimeIntervalPredicate(end_time='2018-03-01')
+                self.assertEqual(predicate(description), [True, False, False, False, True, False])
+
+        with self.assertRaises(ValueError):
+            MaxFractionPredicate((FeatureType.DATA, 'bands'), max_fraction=0.5)
+
+    def test_mask_read_in_blocks(self):
+        save_params = [{'file_format': FileFormat.NPY}, {'file_format': FileFormat.CHUNKED},
+                       {'file_format': FileFormat.NPY, 'compress_level': 1}, {'pack_masks': True}]
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            for index, params in enumerate(save_params):
+                path = os.path.join(tmp_dir_name, 'patch_{}'.format(index))
+                self.eopatch.save(path, **params)
+                description = EOPatch.describe(path)
+
+                for block_size in [1, 40, 10 ** 6]:
+                    predicate = MaxFractionPredicate((FeatureType.MASK, 'CLM'), max_fraction=0.1,
+                                                     block_size=block_size)
+                    self.assertEqual(predicate(description), [True, False, True, True, False, True],
+                                     msg='Failed for {} and block size {}'.format(params, block_size))
+
+    def test_load_selected_frames(self):
+        frame_filter = TimeIntervalPredicate(start_time='2018-04-01') & \
+            MaxFractionPredicate((FeatureType.MASK, 'CLM'), max_fraction=0.1)
+
+        for file_format in [FileFormat.NPY, FileFormat.CHUNKED]:
+            with tempfile.TemporaryDirectory() as tmp_dir_name:
+                self.eopatch.save(os.path.join(tmp_dir_name, 'patch'), file_format=file_format)
+                load_task = LoadFromDisk(tmp_dir_name, mmap=True, frame_filter=frame_filter)
+                eopatch = load_task.execute(eopatch_folder='patch')
+
+                self.assertEqual(eopatch.timestamp, [self.eopatch.timestamp[idx] for idx in [2, 3, 5]])
+                self.assertTrue(np.array_equal(eopatch.data['bands'], self.eopatch.data['bands'][[2, 3, 5]]))
+                self.assertTrue(np.array_equal(eopatch.mask['CLM'], self.eopatch.mask['CLM'][[2, 3, 5]]))
+
+                eopatch = LoadFromDisk(tmp_dir_name, frame_filter=MaxFractionPredicate(
+                    (FeatureType.MASK, 'CLM'), max_fraction=0
+                ) & TimeIntervalPredicate(end_time='2018-03-31')).execute(eopatch_folder='patch')
+                self.assertEqual(eopatch.timestamp, self.eopatch.timestamp[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
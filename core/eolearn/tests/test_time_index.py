@@ -0,0 +1,72 @@
+import unittest
+import logging
+import datetime
+
+import numpy as np
+
+from eolearn.core import TimeIndex, get_common_timestamps
+from eolearn.core.time_index import parse_timestamps, to_datetime64
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestTimeIndex(unittest.TestCase):
+
+    TIMESTAMPS = [datetime.datetime(2017, 1, day, 10, 30) for day in [5, 1, 3, 1, 7]]
+
+    def test_parsing(self):
+        timestamps = ['2018-01-01', '2018-01-02T10:03:04.5', '15.2.1992', datetime.date(2017, 1, 11),
+                      np.datetime64('2019-03-01T12:00')]
+        expected_timestamps = [datetime.datetime(2018, 1, 1), datetime.datetime(2018, 1, 2, 10, 3, 4, 500000),
+                               datetime.datetime(1992, 2, 15), datetime.date(2017, 1, 11),
+                               datetime.datetime(2019, 3, 1, 12)]
+        self.assertEqual(parse_timestamps(timestamps), expected_timestamps)
+
+        values = to_datetime64(timestamps)
+        self.assertEqual(values.dtype, np.dtype('datetime64[us]'))
+        self.assertEqual(parse_timestamps(values)[2], datetime.datetime(1992, 2, 15))
+
+        aware_timestamp = datetime.datetime(2018, 1, 1, 12, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+        self.assertEqual(TimeIndex([aware_timestamp]).to_datetimes(), [datetime.datetime(2018, 1, 1, 10)])
+
+        for invalid_timestamps in [[None], ['something']]:
+            with self.assertRaises((ValueError, TypeError)):
+                to_datetime64(invalid_timestamps)
+
+    def test_lookups(self):
+        time_index = TimeIndex(self.TIMESTAMPS)
+
+        self.assertEqual(len(time_index), 5)
+        self.assertEqual(time_index.to_datetimes(), self.TIMESTAMPS)
+        self.assertEqual(time_index, TimeIndex(to_datetime64(self.TIMESTAMPS)))
+        self.assertEqual(time_index.sort_order.tolist(), [1, 3, 2, 0, 4])
+
+        queried_timestamps = [self.TIMESTAMPS[4], datetime.datetime(2017, 1, 2), self.TIMESTAMPS[1],
+                              datetime.datetime(2018, 1, 1)]
+        self.assertEqual(time_index.get_indices(queried_timestamps).tolist(), [4, -1, 1, -1])
+        self.assertEqual(time_index.isin(queried_timestamps).tolist(), [False, True, False, True, True])
+
+    def test_set_operations(self):
+        time_index = TimeIndex(self.TIMESTAMPS)
+        other_timestamps = [self.TIMESTAMPS[0], datetime.datetime(2017, 1, 2), self.TIMESTAMPS[1]]
+
+        self.assertEqual(time_index.intersection(other_timestamps).to_datetimes(),
+                         [self.TIMESTAMPS[1], self.TIMESTAMPS[0]])
+        self.assertEqual(time_index.union(other_timestamps).to_datetimes(),
+                         sorted(set(self.TIMESTAMPS + other_timestamps)))
+        self.assertEqual(time_index.difference(other_timestamps).to_datetimes(),
+                         [self.TIMESTAMPS[2], self.TIMESTAMPS[4]])
+
+        self.assertEqual(get_common_timestamps(self.TIMESTAMPS, other_timestamps), [0, 1, 3])
+
+    def test_time_series(self):
+        time_index = TimeIndex(self.TIMESTAMPS)
+
+        self.assertEqual(time_index.time_series().tolist(), [0, -345600, -172800, -345600, 172800])
+        self.assertEqual(time_index.time_series(ref_date=datetime.datetime(2017, 1, 1), scale_time=3600).tolist(),
+                         [106, 10, 58, 10, 154])
+        self.assertEqual(TimeIndex().time_series().dtype, np.int64)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@ from .radiometric_normalization import ReferenceScenes, HistogramMatching, BlueC
 from .blob import BlobTask, DoGBlobTask, DoHBlobTask, LoGBlobTask
 from .hog import HOGTask
 from .local_binary_pattern import LocalBinaryPatternTask
+from .feature_statistics import FeatureStatistics, FeatureStatisticsTask, collect_feature_statistics
 
 
 __version__ = '0.4.2'
@@ -0,0 +1,302 @@
+"""
+Module for computing statistics of features over many EOPatches, e.g. for normalization of classifier inputs
+
+Statistics are accumulated in a `FeatureStatistics` object, which can be updated with one block of values at a time and
+merged with statistics of other EOPatches. Mean and variance are combined with the parallel variant of Welford's
+algorithm, while percentiles are approximated with a merging digest of weighted centroids, which keeps more centroids
+close to the tails of distributions.
+
+`FeatureStatisticsTask` computes statistics of a single EOPatch one time frame at a time, so that memory-mapped
+features of an EOPatch loaded with `mmap=True` are never read into memory as a whole, and stores them into the meta
+info of the EOPatch. Lazily loaded features which are not memory-mapped are still loaded entirely on first access. When
+the task runs in a workflow of `EOExecutor` the EOPatches have to be saved and statistics of the entire dataset are
+then obtained with `collect_feature_statistics`, which loads only meta info of saved EOPatches.
+"""
+
+import os
+
+import numpy as np
+
+from eolearn.core import EOTask, EOPatch, FeatureType
+from eolearn.core.utilities import map_concurrently
+
+
+class FeatureStatistics:
+    """ Mergeable statistics of values of each band (i.e. the last dimension) of a feature
+
+    :ivar count: Number of valid values of each band
+    :ivar mean: Mean of each band
+    :ivar min: Minimum of each band
+    :ivar max: Maximum of each band
+    """
+    def __init__(self, band_num, compression=200):
+        """
+        :param band_num: Number of bands
+        :type band_num: int
+        :param compression: A parameter of the percentile digest. The digest of each band keeps at most about
+            `compression / 2` centroids, a larger value gives more accurate percentiles.
+        :type compression: int
+        """
+        self.compression = compression
+        self.count = np.zeros(band_num, dtype=np.int64)
+        self.mean = np.zeros(band_num, dtype=np.float64)
+        self.min = np.full(band_num, np.inf)
+        self.max = np.full(band_num, -np.inf)
+        self._sum_squares = np.zeros(band_num, dtype=np.float64)
+        self._centroids = [(np.zeros(0), np.zeros(0)) for _ in range(band_num)]
+
+    def __repr__(self):
+        return '{}(count={}, mean={}, std={})'.format(self.__class__.__name__, self.count.tolist(), self.mean.tolist(),
+                                                      self.std.tolist())
+
+    @property
+    def band_num(self):
+        """ Number of bands
+        """
+        return self.count.size
+
+    @property
+    def sum_squares(self):
+        """ Sum of squared differences of values from the mean of each band
+        """
+        return self._sum_squares
+
+    @property
+    def centroids(self):
+        """ Centroids of the percentile digest of each band, given as a list of pairs of arrays of centroid means and
+        weights
+        """
+        return self._centroids
+
+    @property
+    def variance(self):
+        """ Population variance of each band, `nan` for bands without values
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 0, self._sum_squares / self.count, np.nan)
+
+    @property
+    def std(self):
+        """ Population standard deviation of each band, `nan` for bands without values
+        """
+        return np.sqrt(self.variance)
+
+    def update(self, values):
+        """ Adds values to the statistics. Values which are `nan` are ignored.
+
+        :param values: An array of values of shape `(n, band_num)`
+        :type values: numpy.ndarray
+        :return: Updated statistics
+        :rtype: FeatureStatistics
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1, self.band_num)
+
+        for band in range(self.band_num):
+            band_values = values[:, band]
+            band_values = band_values[~np.isnan(band_values)]
+            if not band_values.size:
+                continue
+
+            batch_mean = np.mean(band_values)
+            self._merge_band(band, band_values.size, batch_mean, np.sum((band_values - batch_mean) ** 2),
+                             np.min(band_values), np.max(band_values), (band_values, np.ones(band_values.size)))
+        return self
+
+    def merge(self, other):
+        """ Merges statistics of other values into these statistics
+
+        :param other: Statistics of the same number of bands
+        :type other: FeatureStatistics
+        :return: Merged statistics
+        :rtype: FeatureStatistics
+        """
+        if other.band_num != self.band_num:
+            raise ValueError('Statistics of {} bands cannot be merged with statistics of {} '
+                             'bands'.format(other.band_num, self.band_num))
+
+        for band in range(self.band_num):
+            if other.count[band]:
+                self._merge_band(band, other.count[band], other.mean[band], other.sum_squares[band], other.min[band],
+                                 other.max[band], other.centroids[band])
+        return self
+
+    def _merge_band(self, band, count, mean, sum_squares, min_value, max_value, centroids):
+        """ Merges statistics of a batch of values of a single band
+        """
+        total_count = self.count[band] + count
+        delta = mean - self.mean[band]
+
+        self._sum_squares[band] += sum_squares + delta ** 2 * self.count[band] * count / total_count
+        self.mean[band] += delta * count / total_count
+        self.count[band] = total_count
+        self.min[band] = min(self.min[band], min_value)
+        self.max[band] = max(self.max[band], max_value)
+
+        means = np.concatenate([self._centroids[band][0], centroids[0]])
+        weights = np.concatenate([self._centroids[band][1], centroids[1]])
+        self._centroids[band] = _compress_centroids(means, weights, self.compression)
+
+    @staticmethod
+    def merge_all(statistics_list):
+        """ Merges a collection of statistics into new statistics
+
+        :param statistics_list: A non-empty collection of statistics of the same number of bands
+        :type statistics_list: list(FeatureStatistics)
+        :rtype: FeatureStatistics
+        """
+        statistics_list = list(statistics_list)
+        if not statistics_list:
+            raise ValueError('At least one statistics object has to be given')
+
+        merged_statistics = FeatureStatistics(statistics_list[0].band_num, compression=statistics_list[0].compression)
+        for statistics in statistics_list:
+            merged_statistics.merge(statistics)
+        return merged_statistics
+
+    def percentile(self, percentiles):
+        """ Computes approximate percentiles of each band. Minimum and maximum are exact.
+
+        :param percentiles: A percentile or a list of percentiles between 0 and 100
+        :type percentiles: float or list(float)
+        :return: An array of shape `(band_num,)` for a single percentile or `(len(percentiles), band_num)`, with `nan`
+            for bands without values
+        :rtype: numpy.ndarray
+        """
+        quantiles = np.asarray(percentiles, dtype=np.float64) / 100
+        result = np.full((quantiles.size, self.band_num), np.nan)
+
+        for band, (means, weights) in enumerate(self._centroids):
+            if not self.count[band]:
+                continue
+
+            positions = (np.cumsum(weights) - weights / 2) / np.sum(weights)
+            result[:, band] = np.interp(quantiles.ravel(), np.concatenate([[0], positions, [1]]),
+                                        np.concatenate([[self.min[band]], means, [self.max[band]]]))
+
+        return result.reshape(quantiles.shape + (self.band_num,))
+
+    def to_dict(self):
+        """ Converts statistics into a dictionary, which can be serialized into JSON and e.g. stored in meta info of
+        an EOPatch
+
+        :rtype: dict
+        """
+        is_empty = self.count == 0
+        return {
+            'compression': self.compression,
+            'count': self.count.tolist(),
+            'mean': self.mean.tolist(),
+            'sum_squares': self._sum_squares.tolist(),
+            'min': np.where(is_empty, None, self.min).tolist(),
+            'max': np.where(is_empty, None, self.max).tolist(),
+            'centroids': [[means.tolist(), weights.tolist()] for means, weights in self._centroids]
+        }
+
+    @classmethod
+    def from_dict(cls, statistics_dict):
+        """ Creates statistics from a dictionary, which was obtained with `to_dict`
+
+        :param statistics_dict: A dictionary of statistics
+        :type statistics_dict: dict
+        :rtype: FeatureStatistics
+        """
+        statistics = cls(len(statistics_dict['count']), compression=statistics_dict['compression'])
+        statistics.count = np.array(statistics_dict['count'], dtype=np.int64)
+        statistics.mean = np.array(statistics_dict['mean'], dtype=np.float64)
+        statistics.min = np.array([np.inf if value is None else value for value in statistics_dict['min']])
+        statistics.max = np.array([-np.inf if value is None else value for value in statistics_dict['max']])
+        statistics._sum_squares = np.array(statistics_dict['sum_squares'], dtype=np.float64)
+        statistics._centroids = [(np.array(means, dtype=np.float64), np.array(weights, dtype=np.float64))
+                                 for means, weights in statistics_dict['centroids']]
+        return statistics
+
+
+class FeatureStatisticsTask(EOTask):
+    """ Computes statistics of values of each band of a feature and stores them into meta info of the EOPatch as a
+    dictionary, which can be converted back with `FeatureStatistics.from_dict`
+
+    Values of time-dependent features are processed one time frame at a time. If the EOPatch was loaded with
+    `mmap=True` from uncompressed npy files, only the frame which is being processed is read from disk. Features which
+    are lazily loaded without `mmap=True` are read into memory as a whole when they are first accessed.
+    """
+    def __init__(self, feature, mask_feature=None, statistics_name=None, compression=200):
+        """
+        :param feature: A raster feature of which statistics will be computed
+        :type feature: (FeatureType, str)
+        :param mask_feature: A mask feature with a single channel. Only values of pixels where the mask is non-zero
+            are used. For a time-dependent feature the mask can be either time-dependent or timeless.
+        :type mask_feature: (FeatureType, str) or None
+        :param statistics_name: A key of meta info under which statistics will be stored. By default it is
+            `'statistics_<feature name>'`.
+        :type statistics_name: str or None
+        :param compression: A parameter of the percentile digest, see `FeatureStatistics`
+        :type compression: int
+        """
+        self.feature = next(self._parse_features(feature)())
+        self.mask_feature = None if mask_feature is None else next(self._parse_features(mask_feature)())
+        self.statistics_name = statistics_name or 'statistics_{}'.format(self.feature[1])
+        self.compression = compression
+
+    def execute(self, eopatch):
+        """
+        :param eopatch: Input EOPatch
+        :type eopatch: EOPatch
+        :return: The same EOPatch with statistics in meta info
+        :rtype: EOPatch
+        """
+        feature_type, feature_name = self.feature
+        data = eopatch[feature_type][feature_name]
+        mask = None if self.mask_feature is None else eopatch[self.mask_feature[0]][self.mask_feature[1]]
+
+        statistics = FeatureStatistics(data.shape[-1], compression=self.compression)
+        frame_num = data.shape[0] if feature_type.is_time_dependent() else 1
+
+        for idx in range(frame_num):
+            frame = data[idx] if feature_type.is_time_dependent() else data
+            if mask is None:
+                statistics.update(frame)
+                continue
+
+            frame_mask = mask[idx] if self.mask_feature[0].is_time_dependent() else mask
+            statistics.update(np.asarray(frame)[np.asarray(frame_mask)[..., 0] != 0])
+
+        eopatch.meta_info[self.statistics_name] = statistics.to_dict()
+        return eopatch
+
+
+def collect_feature_statistics(folder, eopatch_folders, statistics_name, workers=1):
+    """ Merges statistics, which were computed by `FeatureStatisticsTask` and saved together with EOPatches. Only meta
+    info of EOPatches is loaded.
+
+    :param folder: A folder which contains saved EOPatches
+    :type folder: str
+    :param eopatch_folders: Names of EOPatch folders, e.g. obtained from `EOPatchCatalog`
+    :type eopatch_folders: list(str)
+    :param statistics_name: A key of meta info under which statistics are stored
+    :type statistics_name: str
+    :param workers: Number of threads used to load meta info of EOPatches
+    :type workers: int or None
+    :return: Statistics of all EOPatches
+    :rtype: FeatureStatistics
+    """
+    def load_statistics(eopatch_folder):
+        eopatch = EOPatch.load(os.path.join(folder, eopatch_folder), features=FeatureType.META_INFO)
+        return FeatureStatistics.from_dict(eopatch.meta_info[statistics_name])
+
+    return FeatureStatistics.merge_all(map_concurrently(load_statistics, list(eopatch_folders), workers))
+
+
+def _compress_centroids(means, weights, compression):
+    """ Merges centroids of a digest into at most about `compression / 2` centroids. Centroids are grouped by
+    a scale function of their quantile, which gives groups of smaller weight near both tails of the distribution.
+    """
+    order = np.argsort(means, kind='mergesort')
+    means, weights = means[order], weights[order]
+
+    quantiles = (np.cumsum(weights) - weights / 2) / np.sum(weights)
+    groups = np.floor(compression / (2 * np.pi) * np.arcsin(2 * quantiles - 1) + compression / 4).astype(np.int64)
+    groups = np.unique(groups, return_inverse=True)[1]
+
+    group_weights = np.bincount(groups, weights=weights)
+    group_means = np.bincount(groups, weights=means * weights) / group_weights
+    return group_means, group_weights
@@ -0,0 +1,79 @@
+import unittest
+import os
+import datetime
+import tempfile
+
+import numpy as np
+
+from eolearn.core import EOPatch, FeatureType
+from eolearn.features import FeatureStatistics, FeatureStatisticsTask, collect_feature_statistics
+
+
+class TestFeatureStatistics(unittest.TestCase):
+
+    def test_merged_statistics(self):
+        np.random.seed(0)
+        values = np.random.normal(loc=[0, 10], scale=[1, 5], size=(10000, 2))
+        values[:100, 1] = np.nan
+
+        statistics = FeatureStatistics.merge_all(FeatureStatistics(2).update(block)
+                                                 for block in np.array_split(values, 7))
+        valid_values = [values[:, 0], values[100:, 1]]
+
+        self.assertEqual(statistics.count.tolist(), [10000, 9900])
+        for band, band_values in enumerate(valid_values):
+            self.assertAlmostEqual(statistics.mean[band], np.mean(band_values))
+            self.assertAlmostEqual(statistics.std[band], np.std(band_values))
+            self.assertEqual(statistics.min[band], np.min(band_values))
+            self.assertEqual(statistics.max[band], np.max(band_values))
+
+            percentiles = statistics.percentile([1, 25, 50, 75, 99])[:, band]
+            exact_percentiles = np.percentile(band_values, [1, 25, 50, 75, 99])
+            self.assertTrue(np.allclose(percentiles, exact_percentiles, atol=0.05 * np.std(band_values)))
+
+        restored_statistics = FeatureStatistics.from_dict(statistics.to_dict())
+        self.assertTrue(np.array_equal(restored_statistics.percentile(50), statistics.percentile(50)))
+        self.assertTrue(np.array_equal(restored_statistics.std, statistics.std))
+
+        empty_statistics = FeatureStatistics(2).update(np.full((3, 2), np.nan))
+        self.assertTrue(np.isnan(empty_statistics.percentile(50)).all())
+        self.assertEqual(FeatureStatistics.from_dict(empty_statistics.to_dict()).count.tolist(), [0, 0])
+
+        with self.assertRaises(ValueError):
+            statistics.merge(FeatureStatistics(3))
+
+    def test_statistics_task(self):
+        timestamps = [datetime.datetime(2018, 1, day) for day in range(1, 4)]
+        eopatches = []
+        for index in range(2):
+            eopatch = EOPatch(timestamp=timestamps)
+            eopatch.data['bands'] = np.arange(3 * 4 * 5 * 2, dtype=np.float32).reshape(3, 4, 5, 2) + index
+            eopatch.mask['valid'] = np.zeros((3, 4, 5, 1), dtype=np.uint8)
+            eopatch.mask['valid'][:, :2] = 1
+            eopatches.append(eopatch)
+
+        task = FeatureStatisticsTask((FeatureType.DATA, 'bands'), mask_feature=(FeatureType.MASK, 'valid'))
+        with tempfile.TemporaryDirectory() as tmp_dir_name:
+            for index, eopatch in enumerate(eopatches):
+                eopatch.save(os.path.join(tmp_dir_name, 'patch_{}'.format(index)))
+                task.execute(EOPatch.load(os.path.join(tmp_dir_name, 'patch_{}'.format(index)), mmap=True)).save(
+                    os.path.join(tmp_dir_name, 'patch_{}'.format(index)), features=[FeatureType.META_INFO]
+                )
+
+            statistics = collect_feature_statistics(tmp_dir_name, ['patch_0', 'patch_1'], 'statistics_bands',
+                                                    workers=2)
+
+        valid_values = np.concatenate([eopatch.data['bands'][:, :2].reshape(-1, 2) for eopatch in eopatches])
+        self.assertEqual(statistics.count.tolist(), [valid_values.shape[0]] * 2)
+        self.assertTrue(np.allclose(statistics.mean, np.mean(valid_values, axis=0)))
+        self.assertTrue(np.allclose(statistics.std, np.std(valid_values, axis=0)))
+        self.assertTrue(np.array_equal(statistics.max, np.max(valid_values, axis=0)))
+
+        timeless_eopatch = FeatureStatisticsTask((FeatureType.DATA_TIMELESS, 'dem'), statistics_name='dem')(
+            EOPatch(data_timeless={'dem': np.ones((4, 5, 1))})
+        )
+        self.assertEqual(timeless_eopatch.meta_info['dem']['count'], [20])
+
+
+if __name__ == '__main__':
+    unittest.main()